@@ -6,13 +6,64 @@
 import os
 import hashlib
 import json
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Iterable, Tuple
 from pathlib import Path
 
-from diskcache import Cache
+from diskcache import Cache, FanoutCache, Disk
+from diskcache.core import MODE_BINARY, UNKNOWN
 
 from .utils import get_logger
 
+# 可选依赖：缺失时使用 diskcache 默认的 pickle 序列化
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class MsgpackDisk(Disk):
+    """
+    使用 msgpack 序列化容器类型缓存值的 diskcache 存储
+    
+    缓存值主要是由字符串、数字、字节和列表组成的字典，msgpack 比 pickle 更快、体积更小。
+    str/bytes/int/float 仍按 diskcache 原生方式存储；无法用 msgpack 表示的值回退到 pickle。
+    """
+    
+    # msgpack 数据前缀，用于和普通 bytes 值区分
+    MAGIC = b"\x00\xffMSGPACK\x00"
+    
+    def store(self, value, read, key=UNKNOWN):
+        if not read and type(value) in (dict, list, tuple):
+            try:
+                packed = msgpack.packb(value, use_bin_type=True)
+            except (TypeError, ValueError, OverflowError):
+                pass
+            else:
+                if len(self.MAGIC) + len(packed) >= self.min_file_size:
+                    return self._store_file(key, self.MAGIC, packed)
+                return super().store(self.MAGIC + packed, read, key=key)
+        if not read and type(value) is bytes and len(value) >= self.min_file_size:
+            return self._store_file(key, value)
+        return super().store(value, read, key=key)
+    
+    def _store_file(self, key, *chunks):
+        """
+        将大值按块直接写入缓存文件
+        
+        diskcache 默认把 bytes 包装成 BytesIO 逐行迭代写入，二进制数据会被切成大量小块；
+        这里整块写入，msgpack 前缀也单独写入而不与数据拼接，省去一次完整拷贝。
+        """
+        filename, full_path = self.filename(key, chunks[-1])
+        size = self._write(full_path, chunks, 'xb')
+        return size, MODE_BINARY, filename, None
+    
+    def fetch(self, mode, filename, value, read):
+        result = super().fetch(mode, filename, value, read)
+        if type(result) is bytes and result.startswith(self.MAGIC):
+            payload = memoryview(result)[len(self.MAGIC):]
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        return result
+
 
 class UnifiedCacheManager:
     """统一缓存管理器 - 使用单一Cache实例减少资源消耗"""
@@ -38,14 +89,24 @@ class UnifiedCacheManager:
             # 统一缓存大小限制（默认500MB，大幅减少）
             total_cache_size_mb = int(os.getenv("TOTAL_CACHE_SIZE_MB", "500"))
             cache_size_bytes = total_cache_size_mb * 1024 * 1024
+            self.size_limit = cache_size_bytes
+            
+            # 分片数：每个分片是独立的SQLite数据库，并发写入不再争用同一把锁
+            self.shards = int(os.getenv("CACHE_SHARDS", "8"))
             
-            # 创建单一缓存实例
-            self._cache = Cache(
+            # 创建单一缓存实例（有 msgpack 时用其序列化缓存值）
+            self._cache = FanoutCache(
                 cache_dir,
+                shards=self.shards,
+                timeout=1,
                 size_limit=cache_size_bytes,
-                eviction_policy='least-recently-used'  # LRU策略
+                eviction_policy='least-recently-used',  # LRU策略
+                disk=MsgpackDisk if msgpack is not None else Disk
             )
             
+            # 统计聚合等小型元数据单独存放在一个小数据库中，更新时只锁定该数据库，不影响数据分片的写入
+            self._meta = Cache(os.path.join(cache_root, "unified_meta"), timeout=1)
+            
             # 缓存有效期
             self.expire_days = int(os.getenv("CACHE_EXPIRE_DAYS", "30"))
             self.expire_seconds = self.expire_days * 24 * 3600
@@ -53,6 +114,7 @@ class UnifiedCacheManager:
             self.logger.info(
                 f"统一缓存初始化 - 目录: {cache_dir}, "
                 f"总大小: {total_cache_size_mb}MB, "
+                f"分片数: {self.shards}, "
                 f"有效期: {self.expire_days}天"
             )
     
@@ -60,6 +122,72 @@ class UnifiedCacheManager:
         """生成带命名空间的缓存键"""
         return f"{namespace}:{key}"
     
+    def meta_transact(self):
+        """
+        开启元数据事务，事务内的读改写不会与其他线程或进程交错
+        
+        Returns:
+            事务上下文管理器
+        """
+        return self._meta.transact(retry=True)
+    
+    def get_meta(self, key: str) -> Optional[Any]:
+        """
+        读取元数据
+        
+        Args:
+            key: 元数据键
+            
+        Returns:
+            元数据值，不存在返回None
+        """
+        try:
+            return self._meta.get(key)
+        except Exception as e:
+            self.logger.error(f"读取缓存元数据失败: {e}")
+            return None
+    
+    def set_meta(self, key: str, value: Any):
+        """
+        写入元数据（不过期、不参与缓存容量淘汰）
+        
+        Args:
+            key: 元数据键
+            value: 元数据值
+        """
+        try:
+            self._meta.set(key, value)
+        except Exception as e:
+            self.logger.error(f"写入缓存元数据失败: {e}")
+    
+    def delete_meta(self, key: str):
+        """
+        删除元数据
+        
+        Args:
+            key: 元数据键
+        """
+        try:
+            self._meta.delete(key)
+        except Exception as e:
+            self.logger.error(f"删除缓存元数据失败: {e}")
+    
+    def meta_keys(self, prefix: str) -> list:
+        """
+        查找以指定前缀开头的元数据键
+
+        Args:
+            prefix: 元数据键前缀
+
+        Returns:
+            匹配的元数据键列表
+        """
+        try:
+            return [key for key in self._meta.iterkeys() if isinstance(key, str) and key.startswith(prefix)]
+        except Exception as e:
+            self.logger.error(f"查找缓存元数据键失败: {e}")
+            return []
+
     def get(self, namespace: str, key: str) -> Optional[Any]:
         """
         获取缓存值
@@ -100,6 +228,60 @@ class UnifiedCacheManager:
         except Exception as e:
             self.logger.error(f"写入缓存失败: {e}")
     
+    def _group_by_shard(self, full_keys: Iterable[Tuple[str, Any]]) -> Dict[int, list]:
+        """按 FanoutCache 的分片规则将 (完整键, 值) 分组"""
+        groups: Dict[int, list] = {}
+        for full_key, value in full_keys:
+            index = self._cache._hash(full_key) % self._cache._count
+            groups.setdefault(index, []).append((full_key, value))
+        return groups
+    
+    def set_many(self, namespace: str, items: Iterable[Tuple[str, Any]], expire: Optional[int] = None) -> int:
+        """
+        批量设置缓存值
+        
+        按分片分组，每个分片在各自的事务中写入（每个分片一次SQLite提交），不会同时锁定所有分片
+        
+        Args:
+            namespace: 缓存命名空间
+            items: (缓存键, 值) 的可迭代对象
+            expire: 过期时间（秒），默认使用配置的过期时间
+            
+        Returns:
+            写入的条目数
+        """
+        expire = expire or self.expire_seconds
+        groups = self._group_by_shard((self._make_key(namespace, key), value) for key, value in items)
+        written = 0
+        for index, entries in groups.items():
+            shard = self._cache._shards[index]
+            try:
+                with shard.transact(retry=True):
+                    for full_key, value in entries:
+                        shard.set(full_key, value, expire=expire)
+                written += len(entries)
+            except Exception as e:
+                self.logger.error(f"批量写入缓存失败: {e}")
+        return written
+    
+    def exists(self, namespace: str, key: str) -> bool:
+        """
+        检查缓存项是否存在
+        
+        Args:
+            namespace: 缓存命名空间
+            key: 缓存键
+            
+        Returns:
+            是否存在
+        """
+        full_key = self._make_key(namespace, key)
+        try:
+            return full_key in self._cache
+        except Exception as e:
+            self.logger.error(f"检查缓存失败: {e}")
+            return False
+    
     def delete(self, namespace: str, key: str) -> bool:
         """
         删除缓存项
@@ -118,25 +300,84 @@ class UnifiedCacheManager:
             self.logger.error(f"删除缓存失败: {e}")
             return False
     
+    @staticmethod
+    def escape_like(text: str) -> str:
+        """转义 SQL LIKE 模式中的通配符（% 和 _），转义符为反斜杠"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    def keys(self, namespace: str, pattern: str = '%') -> list:
+        """
+        按 SQL LIKE 模式查找命名空间内的缓存键
+        
+        直接在各分片的SQLite中过滤键，不遍历、不反序列化缓存值
+        
+        Args:
+            namespace: 缓存命名空间
+            pattern: 缓存键的LIKE模式（不含命名空间前缀，字面量部分需用 escape_like 转义）
+            
+        Returns:
+            匹配的缓存键列表（不含命名空间前缀）
+        """
+        prefix = self._make_key(namespace, '')
+        like = self.escape_like(prefix) + pattern
+        keys = []
+        try:
+            for shard in self._cache._shards:
+                rows = shard._sql(
+                    "SELECT key FROM Cache WHERE raw = 1 AND key LIKE ? ESCAPE '\\'", (like,)
+                ).fetchall()
+                keys.extend(key[len(prefix):] for (key,) in rows)
+        except Exception as e:
+            self.logger.error(f"查找缓存键失败: {e}")
+        return keys
+    
+    def delete_many(self, namespace: str, keys) -> int:
+        """
+        批量删除缓存项，每个分片在各自的事务中删除
+        
+        Args:
+            namespace: 缓存命名空间
+            keys: 缓存键（不含命名空间前缀）
+            
+        Returns:
+            实际删除的条目数
+        """
+        deleted = 0
+        groups = self._group_by_shard((self._make_key(namespace, key), None) for key in keys)
+        for index, entries in groups.items():
+            shard = self._cache._shards[index]
+            with shard.transact(retry=True):
+                for full_key, _ in entries:
+                    if shard.delete(full_key, retry=True):
+                        deleted += 1
+        return deleted
+    
     def clear_namespace(self, namespace: str):
         """清空指定命名空间的所有缓存"""
-        prefix = f"{namespace}:"
         try:
-            for key in list(self._cache.iterkeys()):
-                if key.startswith(prefix):
-                    self._cache.delete(key)
+            self.delete_many(namespace, self.keys(namespace))
             self.logger.info(f"清空命名空间缓存: {namespace}")
         except Exception as e:
             self.logger.error(f"清空命名空间缓存失败: {e}")
     
+    def volume(self) -> int:
+        """获取缓存当前占用的磁盘空间（字节）"""
+        try:
+            return self._cache.volume()
+        except Exception as e:
+            self.logger.error(f"获取缓存占用失败: {e}")
+            return 0
+    
     def get_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
         try:
+            size = len(self._cache)
+            volume = self._cache.volume()
             return {
-                "size": len(self._cache),
-                "volume": self._cache.volume(),
-                "size_mb": self._cache.volume() / (1024 * 1024),
-                "hit_rate": getattr(self._cache, 'hit_rate', 0)
+                "size": size,
+                "volume": volume,
+                "size_mb": volume / (1024 * 1024),
+                "hit_rate": 0  # diskcache 不提供命中率统计
             }
         except Exception as e:
             self.logger.error(f"获取缓存统计失败: {e}")
@@ -146,6 +387,7 @@ class UnifiedCacheManager:
         """关闭缓存"""
         if self._cache:
             self._cache.close()
+            self._meta.close()
             self._cache = None
             self.logger.info("缓存已关闭")
 
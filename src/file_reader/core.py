@@ -4,6 +4,10 @@
 """
 
 import asyncio
+import functools
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from .models import ReadResponse, FailureType
@@ -47,6 +51,13 @@ class FileReader:
         # 初始化解析缓存
         self.parsed_cache = get_parsed_cache()
         
+        # 同步解析器在独立线程池中执行，避免阻塞事件循环，
+        # 并发请求的 pandoc/LibreOffice 子进程可以重叠执行
+        self.parse_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("PARSE_WORKERS", "4")),
+            thread_name_prefix="parser"
+        )
+        
         # 初始化解析器
         self.parsers = {
             'pdf': PDFParser(),
@@ -149,8 +160,15 @@ class FileReader:
                     response.add_failure(file_path, FailureType.INVALID_URL, error_message)
                     continue
         
+                # 每个文件只计算一次内容哈希，缓存检查与解析器共用
+                content_hash = None
+                if file_path in files_data:
+                    content_hash = await asyncio.get_running_loop().run_in_executor(
+                        None, self._hash_content, files_data[file_path]
+                    )
+                
                 # 检查解析缓存
-                cached_content = await self._check_parsed_cache(normalized_path, request)
+                cached_content = await self._check_parsed_cache(normalized_path, request, content_hash)
                 if cached_content is not None:
                     self.logger.info(f"解析缓存命中: {file_path}")
                     # 检查缓存内容的长度
@@ -177,7 +195,7 @@ class FileReader:
                 # 处理文件内容
                 max_size = getattr(request, 'max_size', 20 * 1024 * 1024)
                 success, content_or_error, error_type = await self._process_file_content(
-                    file_path, file_content, max_size
+                    file_path, file_content, max_size, content_hash
                 )
                 
                 if success:
@@ -191,7 +209,8 @@ class FileReader:
         
         return response
     
-    async def _process_file_content(self, resource_id: str, file_content: bytes, max_size: int) -> Optional[tuple]:
+    async def _process_file_content(self, resource_id: str, file_content: bytes, max_size: int,
+                                    content_hash: Optional[bytes] = None) -> Optional[tuple]:
         """
         异步处理已下载的文件内容
         
@@ -199,6 +218,7 @@ class FileReader:
             resource_id: 资源ID
             file_content: 文件内容字节数据
             max_size: 最大文件大小
+            content_hash: 已计算的内容哈希，传给解析器生成缓存键
             
         Returns:
             (成功标志, 内容或错误信息, 错误类型)
@@ -240,12 +260,16 @@ class FileReader:
             self.logger.debug(f"使用 {parser_type} 解析器解析文件: {resource_id}")
             
             # 检查解析器是否是异步的
-            if parser_type == 'image':
-                # 图像解析器是异步的，使用parse_async方法
-                parse_result = await parser.parse_async(file_content, file_extension)
+            if parser.is_async_only:
+                # 异步解析器（如图像解析器）使用parse_async方法
+                parse_result = await parser.parse_async(file_content, file_extension, content_hash=content_hash)
             else:
-                # 其他解析器是同步的
-                parse_result = parser.parse(file_content, file_extension)
+                # 其他解析器是同步的，在解析线程池中执行
+                loop = asyncio.get_running_loop()
+                parse_result = await loop.run_in_executor(
+                    self.parse_executor,
+                    functools.partial(parser.parse, file_content, file_extension, content_hash=content_hash)
+                )
             
             if not parse_result.success:
                 error_type = FailureType.OCR_ERROR if parser_type == 'image' else FailureType.PARSE_ERROR
@@ -278,6 +302,19 @@ class FileReader:
         with open(file_path, 'rb') as f:
             return f.read()
 
+    @staticmethod
+    def _hash_content(file_content: bytes) -> bytes:
+        """
+        计算文件内容哈希（供线程池调用）
+
+        Args:
+            file_content: 文件内容字节数据
+
+        Returns:
+            SHA-256 摘要字节
+        """
+        return hashlib.sha256(file_content).digest()
+
     def _detect_file_type(self, resource_id: str) -> Optional[str]:
         """
         简化的文件类型检测：仅从URL/resource_id提取扩展名
@@ -315,30 +352,39 @@ class FileReader:
         self.storage_client.clear_cache()
         self.logger.info("缓存已清空")
     
-    async def _check_parsed_cache(self, path: str, request) -> Optional[str]:
+    def close(self):
+        """关闭解析线程池，取消尚未开始的解析任务并等待正在执行的任务结束"""
+        self.parse_executor.shutdown(wait=True, cancel_futures=True)
+        self.logger.info("解析线程池已关闭")
+    
+    async def _check_parsed_cache(self, path: str, request,
+                                  content_hash: Optional[bytes] = None) -> Optional[str]:
         """
         检查文件路径对应的解析缓存
 
         Args:
             path: 文件路径
             request: 请求对象，用于生成缓存键
+            content_hash: 已计算的内容哈希，提供时不再读取文件
 
         Returns:
             缓存的解析内容，如果没有缓存则返回None
         """
         try:
-            # 异步获取文件内容用于生成解析缓存键
-            try:
-                loop = asyncio.get_event_loop()
-                file_content = await loop.run_in_executor(
-                    None,  # 使用默认线程池
-                    self._read_file_sync,
-                    path
-                )
-                self.logger.debug(f"直接读取本地文件内容: {path}")
-            except Exception as e:
-                self.logger.debug(f"直接读取本地文件失败: {path}, 错误: {e}")
-                return None
+            # 未提供内容哈希时，异步获取文件内容用于生成解析缓存键
+            file_content = b""
+            if content_hash is None:
+                try:
+                    loop = asyncio.get_running_loop()
+                    file_content = await loop.run_in_executor(
+                        None,  # 使用默认线程池
+                        self._read_file_sync,
+                        path
+                    )
+                    self.logger.debug(f"直接读取本地文件内容: {path}")
+                except Exception as e:
+                    self.logger.debug(f"直接读取本地文件失败: {path}, 错误: {e}")
+                    return None
 
             # 检测文件类型
             file_extension = self._detect_file_type(path)
@@ -362,7 +408,8 @@ class FileReader:
                 file_content, 
                 parser.parser_name, 
                 parser.parser_version,
-                None  # 暂时不包含额外参数
+                None,  # 暂时不包含额外参数
+                content_hash=content_hash
             )
 
             # 检查解析缓存
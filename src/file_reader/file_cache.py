@@ -4,12 +4,16 @@
 """
 
 import os
+import re
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 
 from .cache_manager import cache_manager
 from .utils import get_logger
 
+# Markdown中的文件引用：可选的 [标签] 后接 (目标)，目标中允许一层括号（如 "file (1).txt"）
+_RE_REFERENCE = re.compile(r'(\[[^\[\]\n]*\])?\(((?:[^()\n]|\([^()\n]*\))*)\)')
+
 
 class FileCacheManager:
     """压缩包文件缓存管理器"""
@@ -43,66 +47,78 @@ class FileCacheManager:
         temp_dir = doc_info.get('temp_dir', '')
         
         file_resources = []
-        processed_markdown = markdown_content
         
         # 本地文件模式：直接移除文件引用，不进行上传处理
         self.logger.info(f"本地文件模式：移除文档中的 {len(files)} 个文件引用")
-        
-        for file_path in files:
-            try:
-                # 移除Markdown中的文件引用
-                processed_markdown = self._remove_file_references(
-                    processed_markdown, file_path, temp_dir
-                )
-                self.logger.debug(f"移除文件引用: {file_path.name}")
-                
-            except Exception as e:
-                self.logger.warning(f"处理文件失败: {file_path.name}, 错误: {e}")
-                continue
+        processed_markdown = self._remove_file_references(markdown_content, files, temp_dir)
         
         return processed_markdown, file_resources
 
 
-    def _remove_file_references(self, markdown_content: str, file_path: Path, temp_dir: str) -> str:
+    def _remove_file_references(self, markdown_content: str, files: List[Path], temp_dir: str) -> str:
         """
         移除Markdown中的文件引用
         
+        先收集所有文件可能的引用形式，再对Markdown做一次扫描，
+        避免每个文件都对整篇Markdown执行多次replace
+        
         Args:
             markdown_content: 原始Markdown内容
-            file_path: 文件路径
+            files: 文件路径列表
             temp_dir: 临时目录
             
         Returns:
             处理后的Markdown内容
         """
-        # 获取可能的文件引用路径
-        absolute_path = str(file_path.absolute())
+        temp_path = Path(temp_dir) if temp_dir else None
+        
+        # 引用目标：(文件名)、(相对路径)、(绝对路径)；完整链接：[文件名](引用目标)
+        targets = set()
+        links = set()
+        for file_path in files:
+            try:
+                filename_only = file_path.name
+                for target in self._reference_targets(file_path, temp_path):
+                    targets.add(target)
+                    links.add(f"[{filename_only}]({target})")
+            except Exception as e:
+                self.logger.warning(f"处理文件失败: {file_path.name}, 错误: {e}")
+        
+        if not targets:
+            return markdown_content
+        
+        def replace(match):
+            label, target = match.group(1), match.group(2)
+            if target not in targets:
+                return match.group(0)
+            if label and f"{label}({target})" in links:
+                return ''
+            return label or ''
+        
+        return _RE_REFERENCE.sub(replace, markdown_content)
+
+    def _reference_targets(self, file_path: Path, temp_path: Optional[Path]) -> Tuple[str, ...]:
+        """
+        获取文件在Markdown中可能被引用的路径
+        
+        Args:
+            file_path: 文件路径
+            temp_path: 临时目录
+            
+        Returns:
+            (文件名, 相对路径, 绝对路径)
+        """
         filename_only = file_path.name
         
         # 如果有临时目录，计算相对路径
         relative_path = filename_only
-        if temp_dir:
+        if temp_path is not None:
             try:
-                temp_path = Path(temp_dir)
                 relative_path = str(file_path.relative_to(temp_path))
-            except:
+            except ValueError:
                 pass
         
-        # 定义所有可能的文件引用格式
-        possible_refs = [
-            f"[{filename_only}]({filename_only})",
-            f"[{filename_only}]({relative_path})", 
-            f"[{filename_only}]({absolute_path})",
-            f"({filename_only})",
-            f"({relative_path})",
-            f"({absolute_path})"
-        ]
-        
-        # 执行移除
-        for old_ref in possible_refs:
-            markdown_content = markdown_content.replace(old_ref, '')
-        
-        return markdown_content
+        return filename_only, relative_path, str(file_path.absolute())
 
     def _extract_file_info(self, file_path: Path, file_data: bytes) -> Dict[str, Any]:
         """
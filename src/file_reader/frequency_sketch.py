@@ -0,0 +1,83 @@
+"""
+访问频率估计
+TinyLFU 风格的 Count-Min Sketch，用于缓存准入判断
+"""
+
+import threading
+from typing import Hashable
+
+
+class FrequencySketch:
+    """
+    带门卫集合的 4 位 Count-Min Sketch
+
+    - 首次访问只记入门卫集合，一次性访问不会占用计数器
+    - 计数器在 15 饱和，累计记录 sample_size 次后所有计数减半、门卫清空，
+      使频率估计随时间衰减，适应访问模式变化
+    """
+
+    MAX_COUNT = 15
+
+    def __init__(self, width: int = 1024, depth: int = 4, sample_size: int = None):
+        """
+        初始化频率估计器
+
+        Args:
+            width: 每行计数器数量（向上取整为2的幂）
+            depth: 哈希行数
+            sample_size: 触发衰减的记录次数，默认 width 的 10 倍
+        """
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.depth = depth
+        self.sample_size = sample_size or self.width * 10
+
+        self._mask = self.width - 1
+        self._table = bytearray(self.width * self.depth)
+        self._doorkeeper = set()
+        self._additions = 0
+        self._lock = threading.Lock()
+
+    def _indexes(self, key: Hashable):
+        """计算 key 在每一行中的计数器下标"""
+        for row in range(self.depth):
+            yield row * self.width + (hash((row, key)) & self._mask)
+
+    def add(self, key: Hashable):
+        """
+        记录一次访问
+
+        Args:
+            key: 访问的键
+        """
+        with self._lock:
+            if key not in self._doorkeeper:
+                self._doorkeeper.add(key)
+            else:
+                table = self._table
+                for index in self._indexes(key):
+                    if table[index] < self.MAX_COUNT:
+                        table[index] += 1
+
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self._decay()
+
+    def estimate(self, key: Hashable) -> int:
+        """
+        估计访问次数
+
+        Args:
+            key: 要估计的键
+
+        Returns:
+            估计的访问次数（含门卫集合中的首次访问）
+        """
+        with self._lock:
+            count = min(self._table[index] for index in self._indexes(key))
+            return count + (1 if key in self._doorkeeper else 0)
+
+    def _decay(self):
+        """所有计数减半并清空门卫集合（需持有锁）"""
+        self._table = bytearray(count >> 1 for count in self._table)
+        self._doorkeeper.clear()
+        self._additions = 0
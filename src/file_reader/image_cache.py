@@ -4,6 +4,7 @@
 """
 
 import os
+import re
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
@@ -11,6 +12,11 @@ from typing import Dict, Any, Optional, List, Tuple
 from .cache_manager import cache_manager
 from .utils import get_logger
 
+# Markdown图片链接 ![alt](target)，分组为链接目标
+_RE_IMAGE_LINK = re.compile(r'!\[[^\]]*\]\(([^)]*)\)')
+# 3个及以上连续换行；写成字面前缀形式，正则引擎可按前缀快速定位，比 \n{3,} 快数倍
+_RE_EXTRA_BLANK_LINES = re.compile(r'\n\n\n+')
+
 
 class ImageCacheManager:
     """统一的文档图片缓存管理器"""
@@ -42,69 +48,50 @@ class ImageCacheManager:
         """
         markdown_content = doc_info.get('markdown_content', '')
         doc_type = doc_info.get('doc_type', 'unknown')
-        temp_image_dir = doc_info.get('temp_image_dir', '')
         
         image_resources = []
-        processed_markdown = markdown_content
         
         # 本地文件读取模式：直接移除图片引用，不进行上传处理
         self.logger.info(f"本地文件模式：移除文档中的 {len(image_files)} 个图片引用")
-        
-        for image_file in image_files:
-            try:
-                # 移除Markdown中的图片引用
-                processed_markdown = self._remove_image_references(
-                    processed_markdown, image_file, temp_image_dir
-                )
-                self.logger.debug(f"移除图片引用: {image_file.name}")
-                
-            except Exception as e:
-                self.logger.warning(f"处理图片失败: {image_file.name}, 错误: {e}")
-                continue
+        processed_markdown = self._remove_image_references(markdown_content, image_files)
         
         return processed_markdown, image_resources
     
-    def _remove_image_references(self, markdown_content: str, image_file: Path, temp_image_dir: str = '') -> str:
+    def _remove_image_references(self, markdown_content: str, image_files: List[Path]) -> str:
         """
         从Markdown内容中移除指定图片的引用
         
+        链接目标中包含任一图片文件名（或其URL编码形式）的图片链接都会被移除。
+        对Markdown只扫描一次，避免每张图片都对整篇内容执行多次正则替换
+        
         Args:
             markdown_content: 原始Markdown内容
-            image_file: 要移除的图片文件路径
-            temp_image_dir: 临时图片目录路径
+            image_files: 要移除的图片文件路径列表
             
         Returns:
             移除图片引用后的Markdown内容
         """
-        import re
-        
-        # 构建可能的图片引用模式
-        patterns_to_remove = []
+        filenames = set()
+        for image_file in image_files:
+            filenames.add(image_file.name)
+            filenames.add(image_file.name.replace(" ", "%20"))
         
-        # 基于文件名的模式
-        filename = image_file.name
-        patterns_to_remove.extend([
-            rf'!\[([^\]]*)\]\([^)]*{re.escape(filename)}[^)]*\)',  # ![alt](path/filename)
-            rf'!\[[^\]]*\]\([^)]*{re.escape(filename.replace(" ", "%20"))}[^)]*\)',  # URL编码的文件名
-        ])
+        if not filenames:
+            return markdown_content
         
-        # 基于临时目录的模式（如果提供了临时目录）
-        if temp_image_dir:
-            temp_dir_name = Path(temp_image_dir).name
-            patterns_to_remove.extend([
-                rf'!\[([^\]]*)\]\([^)]*{re.escape(temp_dir_name)}[^)]*{re.escape(filename)}[^)]*\)',
-                rf'!\[([^\]]*)\]\([^)]*/{re.escape(filename)}[^)]*\)',
-            ])
+        def references_image(target: str) -> bool:
+            # 常见情况下链接目标以文件名结尾，先按集合查找，再回退到子串匹配
+            if target.rpartition('/')[2] in filenames:
+                return True
+            return any(filename in target for filename in filenames)
         
-        # 应用所有模式移除图片引用
-        processed_content = markdown_content
-        for pattern in patterns_to_remove:
-            processed_content = re.sub(pattern, '', processed_content)
+        processed_content = _RE_IMAGE_LINK.sub(
+            lambda match: '' if references_image(match.group(1)) else match.group(0),
+            markdown_content
+        )
         
         # 清理多余的空行
-        processed_content = re.sub(r'\n{3,}', '\n\n', processed_content)
-        
-        return processed_content
+        return _RE_EXTRA_BLANK_LINES.sub('\n\n', processed_content)
 
     def _extract_image_info(self, image_file: Path, image_data: bytes) -> Dict[str, Any]:
         """
@@ -16,6 +16,11 @@ load_dotenv(override=True)
 
 logger = get_logger(__name__)
 
+# Markdown代码块（可选json标记）
+_RE_CODE_FENCE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+# JSON对象或数组的边界
+_RE_JSON_BOUNDS = re.compile(r'\{.*\}|\[.*\]', re.DOTALL)
+
 # 从环境变量获取默认配置
 LLM_BASE_URL = os.getenv("LLM_VISION_BASE_URL", "")
 LLM_API_KEY = os.getenv("LLM_VISION_API_KEY", "")
@@ -72,10 +77,10 @@ def parse_json(json_str: str) -> Union[Dict, List]:
             return json.loads(json_str)
         except json.JSONDecodeError:
             # 移除markdown代码块和多余空白
-            clean_str = re.sub(r'```(?:json)?\s*([\s\S]*?)\s*```', '\\1', json_str).strip()
+            clean_str = _RE_CODE_FENCE.sub('\\1', json_str).strip()
             
             # 查找JSON对象或数组的边界
-            obj_match = re.search(r'\{.*\}|\[.*\]', clean_str, re.DOTALL)
+            obj_match = _RE_JSON_BOUNDS.search(clean_str)
             if obj_match:
                 try:
                     return json.loads(obj_match.group(0))
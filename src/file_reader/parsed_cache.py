@@ -5,13 +5,80 @@
 
 import os
 import json
+import atexit
 import hashlib
 import time
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable, Tuple, Union
 
 from .cache_manager import cache_manager
+from .frequency_sketch import FrequencySketch
 from .utils import get_logger
 
+# 可选加速依赖：缺失时配置哈希回退到 md5(json)
+try:
+    import xxhash
+    import msgpack
+except ImportError:
+    xxhash = None
+    msgpack = None
+
+# 可选依赖：缺失时解析内容不压缩存储
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 小于该长度的内容压缩收益有限，直接存储
+COMPRESS_MIN_LENGTH = 512
+
+# zstd 压缩/解压器不能跨线程共享，按线程复用
+_zstd_local = threading.local()
+
+
+def _compress_content(content: str) -> bytes:
+    """使用 zstd（level 3）压缩解析内容"""
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+    return compressor.compress(content.encode("utf-8"))
+
+
+def _decompress_content(data: bytes) -> str:
+    """解压 zstd 压缩的解析内容"""
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(data).decode("utf-8")
+
+
+def _canon(obj: Any) -> Any:
+    """递归按键排序字典，得到可稳定序列化的结构（msgpack 不支持 sort_keys）"""
+    if isinstance(obj, dict):
+        return {key: _canon(obj[key]) for key in sorted(obj)}
+    if isinstance(obj, (list, tuple)):
+        return [_canon(item) for item in obj]
+    return obj
+
+
+def _hash_config(parse_config: Dict[str, Any]) -> str:
+    """
+    计算解析配置的哈希
+    
+    Args:
+        parse_config: 解析配置参数
+        
+    Returns:
+        配置哈希（8位十六进制）
+    """
+    if xxhash is not None and msgpack is not None:
+        packed = msgpack.packb(_canon(parse_config), use_bin_type=True)
+        return xxhash.xxh3_64(packed).hexdigest()[:8]
+    
+    config_str = json.dumps(parse_config, sort_keys=True)
+    return hashlib.md5(config_str.encode()).hexdigest()[:8]
+
 
 class ParsedContentCache:
     """解析结果缓存管理器 - 使用统一缓存系统"""
@@ -22,15 +89,48 @@ class ParsedContentCache:
         self.cache_mgr = cache_manager
         self.namespace = "parsed"
         
+        # 统计聚合数据（按解析器/文档类型的条目数和内容大小）存放在缓存元数据中，避免统计时扫描全部缓存值，
+        # 更新时也不锁定数据分片
+        self.stats_key = "parsed_stats:aggregates"
+        # 每个条目计入统计时的 (解析器, 文档类型, 内容长度)，覆盖写入和删除时据此扣减
+        self.stats_entry_prefix = "parsed_stats:entry:"
+        
         # 缓存有效期（天）
         self.expire_days = int(os.getenv("CACHE_EXPIRE_DAYS", "30"))
         self.expire_seconds = self.expire_days * 24 * 3600
         
+        # 进程内一级LRU缓存：缓存键 -> 解压后的缓存数据，热点文档无需访问磁盘缓存
+        self._l1: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._l1_size = int(os.getenv("PARSED_L1_SIZE", "128"))
+        # 按内容长度累计的容量上限，避免大文档占满内存；超过上限的单个条目不进入一级缓存
+        self._l1_max_bytes = int(os.getenv("PARSED_L1_MAX_BYTES", str(64 * 1024 * 1024)))
+        self._l1_bytes = 0
+        self._l1_lock = threading.Lock()
+        
+        # 准入过滤（TinyLFU）：缓存接近容量上限时，只接纳访问频率达到阈值的新条目，
+        # 避免一次性扫描的文档把热点文档挤出缓存
+        self._sketch = FrequencySketch()
+        self.admission_threshold = int(os.getenv("PARSED_ADMISSION_THRESHOLD", "2"))
+        self.admission_fill_ratio = 0.9
+        
+        # 写缓冲：新解析结果先暂存在内存，累计达到字节阈值或超过时间窗口后在同一事务中批量写入，
+        # 合并SQLite提交开销；阈值设为0时直接写入
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending_bytes = 0
+        # 正在写入磁盘的批次，写入完成前仍可读取，避免刷新期间的读请求未命中
+        self._flushing: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_threshold = int(os.getenv("PARSED_FLUSH_BYTES", str(8 * 1024 * 1024)))
+        self._flush_interval = float(os.getenv("PARSED_FLUSH_INTERVAL", "1.0"))
+        atexit.register(self.flush)
+        
         self.logger.info(f"解析结果缓存初始化完成 - 使用统一缓存系统, 有效期: {self.expire_days}天")
         
 
     def get_cache_key(self, file_content: bytes, parser_name: str, parser_version: str, 
-                     parse_config: Optional[Dict[str, Any]] = None) -> str:
+                     parse_config: Optional[Dict[str, Any]] = None,
+                     content_hash: Optional[Union[bytes, str]] = None) -> str:
         """
         生成解析结果缓存键
         
@@ -39,12 +139,18 @@ class ParsedContentCache:
             parser_name: 解析器名称
             parser_version: 解析器版本
             parse_config: 解析配置参数
+            content_hash: 调用方已知的内容哈希（摘要字节或十六进制串），提供时不再对内容重新计算哈希
             
         Returns:
             缓存键字符串
         """
         # 文件内容哈希
-        file_hash = hashlib.sha256(file_content).hexdigest()[:16]
+        if content_hash:
+            if isinstance(content_hash, (bytes, bytearray)):
+                content_hash = content_hash.hex()
+            file_hash = content_hash[:16]
+        else:
+            file_hash = self._content_hash(file_content)
         
         # 解析器版本
         parser_version_str = f"{parser_name}:v{parser_version}"
@@ -52,13 +158,56 @@ class ParsedContentCache:
         # 配置哈希（如果有配置参数）
         config_hash = ""
         if parse_config:
-            config_str = json.dumps(parse_config, sort_keys=True)
-            config_hash = f":{hashlib.md5(config_str.encode()).hexdigest()[:8]}"
+            config_hash = f":{_hash_config(parse_config)}"
         
         # 生成最终缓存键
         cache_key = f"parsed:{file_hash}:{parser_version_str}{config_hash}"
         return cache_key
 
+    def _content_hash(self, file_content: bytes) -> str:
+        """
+        计算文件内容哈希；调用方已知哈希时应通过 get_cache_key 的 content_hash 传入
+        
+        Args:
+            file_content: 文件内容字节数据
+            
+        Returns:
+            内容哈希（16位十六进制）
+        """
+        return hashlib.sha256(file_content).hexdigest()[:16]
+
+    def _l1_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """从一级缓存读取，命中时返回副本"""
+        with self._l1_lock:
+            cached_data = self._l1.get(cache_key)
+            if cached_data is None:
+                return None
+            self._l1.move_to_end(cache_key)
+            return dict(cached_data)
+
+    def _l1_put(self, cache_key: str, cache_data: Dict[str, Any]):
+        """写入一级缓存，超出容量时淘汰最久未使用的条目"""
+        if self._l1_size <= 0:
+            return
+        size = len(cache_data["content"])
+        with self._l1_lock:
+            previous = self._l1.pop(cache_key, None)
+            if previous is not None:
+                self._l1_bytes -= len(previous["content"])
+            if size > self._l1_max_bytes:
+                return
+            self._l1[cache_key] = cache_data
+            self._l1_bytes += size
+            while len(self._l1) > self._l1_size or self._l1_bytes > self._l1_max_bytes:
+                _, evicted = self._l1.popitem(last=False)
+                self._l1_bytes -= len(evicted["content"])
+
+    def _l1_clear(self):
+        """清空一级缓存"""
+        with self._l1_lock:
+            self._l1.clear()
+            self._l1_bytes = 0
+
     def get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """
         获取缓存的解析结果
@@ -69,11 +218,31 @@ class ParsedContentCache:
         Returns:
             缓存的解析结果，未找到返回None
         """
+        # 命中与未命中都计入访问频率
+        self._sketch.add(cache_key)
+        
+        cached_data = self._l1_get(cache_key)
+        if cached_data is not None:
+            self.logger.debug(f"解析结果一级缓存命中: {cache_key}")
+            return cached_data
+        
+        with self._pending_lock:
+            cached_data = self._pending.get(cache_key)
+            if cached_data is None:
+                cached_data = self._flushing.get(cache_key)
+        if cached_data is not None:
+            self.logger.debug(f"解析结果写缓冲命中: {cache_key}")
+            return dict(cached_data)
+        
         try:
             cached_data = self.cache_mgr.get(self.namespace, cache_key)
             if cached_data:
+                if cached_data.get("_compressed"):
+                    cached_data["content"] = _decompress_content(cached_data["content"])
+                    del cached_data["_compressed"]
+                self._l1_put(cache_key, cached_data)
                 self.logger.debug(f"解析结果缓存命中: {cache_key}")
-                return cached_data
+                return dict(cached_data)
             else:
                 self.logger.debug(f"解析结果缓存未命中: {cache_key}")
                 return None
@@ -81,6 +250,300 @@ class ParsedContentCache:
             self.logger.warning(f"获取缓存失败: {cache_key}, 错误: {e}")
             return None
 
+    def _should_admit(self, cache_key: str) -> bool:
+        """
+        判断新条目是否允许写入缓存
+        
+        Args:
+            cache_key: 缓存键
+            
+        Returns:
+            访问频率达到阈值，或缓存尚未接近容量上限时返回True
+        """
+        if self._sketch.estimate(cache_key) >= self.admission_threshold:
+            return True
+        return self.cache_mgr.volume() < self.cache_mgr.size_limit * self.admission_fill_ratio
+
+    def _build_cache_data(self, cache_key: str, parse_result: Dict[str, Any], 
+                          parser_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        构建缓存数据
+        
+        Args:
+            cache_key: 缓存键
+            parse_result: 解析结果数据
+            parser_info: 解析器信息（名称、版本等）
+            
+        Returns:
+            缓存数据
+        """
+        get = parse_result.get
+        content = get("content", "")
+        return {
+            "content": content,
+            "doc_type": get("doc_type", "unknown"),
+            "metadata": get("metadata", {}),
+            "image_resources": get("image_resources", []),
+            "parser_name": parser_info.get("name", "unknown"),
+            "parser_version": parser_info.get("version", "1.0"),
+            "parsing_time": get("parsing_time", 0),
+            "content_length": len(content),
+            "timestamp": int(time.time()),
+            "cache_key": cache_key
+        }
+
+    def _store(self, cache_key: str, cache_data: Dict[str, Any], check_admission: bool = True) -> bool:
+        """
+        将缓存数据写入磁盘缓存
+        
+        Args:
+            cache_key: 缓存键
+            cache_data: 缓存数据
+            check_admission: 新条目是否需要经过准入过滤
+            
+        Returns:
+            是否写入，未通过准入过滤时返回False
+        """
+        return self._store_many([(cache_key, cache_data)], check_admission) == 1
+
+    def _store_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]], check_admission: bool = True) -> int:
+        """
+        将多条缓存数据写入磁盘缓存
+        
+        按分片批量写入，不跨分片加锁；统计聚合数据随后在元数据事务中一次更新
+        
+        Args:
+            entries: (缓存键, 缓存数据) 的可迭代对象
+            check_admission: 新条目是否需要经过准入过滤
+            
+        Returns:
+            写入的条目数（不含未通过准入过滤的条目）
+        """
+        stored = []
+        for cache_key, cache_data in entries:
+            is_new = not self.cache_mgr.exists(self.namespace, cache_key)
+            if is_new and check_admission and not self._should_admit(cache_key):
+                continue
+            
+            # 较长的内容压缩后存储，减少缓存占用和磁盘读写
+            stored_data = cache_data
+            content = cache_data["content"]
+            if zstandard is not None and isinstance(content, str) and len(content) >= COMPRESS_MIN_LENGTH:
+                stored_data = {**cache_data, "content": _compress_content(content), "_compressed": True}
+            
+            stored.append((cache_key, cache_data, stored_data))
+        
+        if not stored:
+            return 0
+        self.cache_mgr.set_many(self.namespace, ((key, stored_data) for key, _, stored_data in stored),
+                                expire=self.expire_seconds)
+        self._update_aggregates((key, cache_data) for key, cache_data, _ in stored)
+        for cache_key, cache_data, _ in stored:
+            self._l1_put(cache_key, cache_data)
+        return len(stored)
+
+    def _write_one(self, cache_key: str, parse_result: Dict[str, Any], 
+                   parser_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        构建缓存数据并写入缓存
+        
+        Args:
+            cache_key: 缓存键
+            parse_result: 解析结果数据
+            parser_info: 解析器信息（名称、版本等）
+            
+        Returns:
+            写入的缓存数据，未通过准入过滤时返回None
+        """
+        cache_data = self._build_cache_data(cache_key, parse_result, parser_info)
+        if not self._store(cache_key, cache_data):
+            return None
+        return cache_data
+
+    def _enqueue(self, cache_key: str, parse_result: Dict[str, Any], 
+                 parser_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        将缓存数据放入写缓冲，达到字节阈值时立即批量写入
+        
+        准入过滤在入队时完成，保证返回值与直接写入一致
+        
+        Args:
+            cache_key: 缓存键
+            parse_result: 解析结果数据
+            parser_info: 解析器信息（名称、版本等）
+            
+        Returns:
+            入队的缓存数据，未通过准入过滤时返回None
+        """
+        with self._pending_lock:
+            pending = cache_key in self._pending
+        if not pending and not self.cache_mgr.exists(self.namespace, cache_key) \
+                and not self._should_admit(cache_key):
+            return None
+        
+        cache_data = self._build_cache_data(cache_key, parse_result, parser_info)
+        with self._pending_lock:
+            previous = self._pending.pop(cache_key, None)
+            if previous is not None:
+                self._pending_bytes -= previous["content_length"]
+            self._pending[cache_key] = cache_data
+            self._pending_bytes += cache_data["content_length"]
+            should_flush = self._pending_bytes >= self._flush_threshold
+            if not should_flush and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        self._l1_put(cache_key, cache_data)
+        if should_flush:
+            self.flush()
+        return cache_data
+
+    def flush(self) -> int:
+        """
+        将写缓冲中的解析结果批量写入磁盘缓存（每个分片一次提交）
+        
+        Returns:
+            写入的条目数
+        """
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, OrderedDict()
+            self._pending_bytes = 0
+            self._flushing.update(pending)
+        
+        try:
+            self._store_many(pending.items(), check_admission=False)
+            self.logger.debug(f"写缓冲已刷新: {len(pending)} 条")
+            return len(pending)
+        except Exception as e:
+            self.logger.warning(f"刷新写缓冲失败: {e}")
+            return 0
+        finally:
+            with self._pending_lock:
+                for cache_key, cache_data in pending.items():
+                    # 刷新期间同一键可能又被另一批次写入，只移除本批次放入的数据
+                    if self._flushing.get(cache_key) is cache_data:
+                        del self._flushing[cache_key]
+
+    @staticmethod
+    def _counted(cache_data: Dict[str, Any]) -> Tuple[str, str, int]:
+        """条目计入统计的 (解析器, 文档类型, 内容长度)"""
+        return (cache_data.get("parser_name", "unknown"), cache_data.get("doc_type", "unknown"),
+                cache_data.get("content_length", 0))
+
+    @staticmethod
+    def _apply_counted(aggregates: Dict[str, Any], counted: Tuple[str, str, int], sign: int):
+        """
+        将一个条目计入（sign=1）或移出（sign=-1）统计聚合数据，计数归零的分组直接移除
+        
+        Args:
+            aggregates: 统计聚合数据
+            counted: 条目计入统计的 (解析器, 文档类型, 内容长度)
+            sign: 1 表示计入，-1 表示移出
+        """
+        parser_name, doc_type, size = counted
+        for group, name in (("parser_stats", parser_name), ("doc_type_stats", doc_type)):
+            stats = aggregates[group]
+            entry = stats.setdefault(name, {"count": 0, "total_size": 0})
+            entry["count"] += sign
+            entry["total_size"] += sign * size
+            if entry["count"] <= 0:
+                del stats[name]
+
+    def _load_aggregates(self) -> Dict[str, Any]:
+        """读取统计聚合数据，不存在时返回空的聚合数据"""
+        return self.cache_mgr.get_meta(self.stats_key) or {"parser_stats": {}, "doc_type_stats": {}}
+
+    def _update_aggregates(self, entries: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        增量更新统计聚合数据（在元数据事务中读改写，不占用数据分片的锁）
+        
+        覆盖已计入统计的条目时先扣减旧值，再计入新值
+        
+        Args:
+            entries: 刚写入的 (缓存键, 缓存数据)
+        """
+        with self.cache_mgr.meta_transact():
+            aggregates = self._load_aggregates()
+            for cache_key, cache_data in entries:
+                entry_key = self.stats_entry_prefix + cache_key
+                previous = self.cache_mgr.get_meta(entry_key)
+                if previous is not None:
+                    self._apply_counted(aggregates, previous, -1)
+                counted = self._counted(cache_data)
+                self._apply_counted(aggregates, counted, 1)
+                self.cache_mgr.set_meta(entry_key, counted)
+            self.cache_mgr.set_meta(self.stats_key, aggregates)
+
+    def _forget_aggregates(self, keys: Iterable[str]):
+        """
+        从统计聚合数据中扣减已删除的条目（需在删除缓存数据之后调用）
+        
+        Args:
+            keys: 已删除的缓存键
+        """
+        with self.cache_mgr.meta_transact():
+            aggregates = self._load_aggregates()
+            for cache_key in keys:
+                entry_key = self.stats_entry_prefix + cache_key
+                previous = self.cache_mgr.get_meta(entry_key)
+                if previous is not None:
+                    self._apply_counted(aggregates, previous, -1)
+                    self.cache_mgr.delete_meta(entry_key)
+            self.cache_mgr.set_meta(self.stats_key, aggregates)
+
+    def _reconcile_aggregates(self) -> Dict[str, Any]:
+        """
+        按命名空间中现存的缓存键校正统计聚合数据
+        
+        被LRU淘汰、过期或直接删除的条目不会经过 _forget_aggregates，条目数与现存键数不一致时，
+        丢弃已不存在条目的统计记录，并为缺少记录的现存条目读取缓存值补记，然后重新汇总
+        
+        Returns:
+            校正后的统计聚合数据
+        """
+        with self.cache_mgr.meta_transact():
+            # 在元数据事务内取键快照：并发写入要么已补记统计，要么尚未写入数据，两种情况都不会重复计数
+            live_keys = set(self.cache_mgr.keys(self.namespace))
+            aggregates = self._load_aggregates()
+            counted_total = sum(entry["count"] for entry in aggregates["parser_stats"].values())
+            if counted_total == len(live_keys):
+                return aggregates
+            
+            aggregates = {"parser_stats": {}, "doc_type_stats": {}}
+            prefix_length = len(self.stats_entry_prefix)
+            for entry_key in self.cache_mgr.meta_keys(self.stats_entry_prefix):
+                cache_key = entry_key[prefix_length:]
+                if cache_key in live_keys:
+                    self._apply_counted(aggregates, self.cache_mgr.get_meta(entry_key), 1)
+                    live_keys.discard(cache_key)
+                else:
+                    self.cache_mgr.delete_meta(entry_key)
+            
+            for cache_key in live_keys:
+                cached_data = self.cache_mgr.get(self.namespace, cache_key)
+                if cached_data:
+                    counted = self._counted(cached_data)
+                    self._apply_counted(aggregates, counted, 1)
+                    self.cache_mgr.set_meta(self.stats_entry_prefix + cache_key, counted)
+            
+            self.cache_mgr.set_meta(self.stats_key, aggregates)
+            self.logger.info(f"统计聚合数据已按现存缓存校正: {counted_total} -> "
+                             f"{sum(entry['count'] for entry in aggregates['parser_stats'].values())} 条")
+            return aggregates
+
+    def _reset_aggregates(self):
+        """清空统计聚合数据及各条目的统计记录"""
+        with self.cache_mgr.meta_transact():
+            for entry_key in self.cache_mgr.meta_keys(self.stats_entry_prefix):
+                self.cache_mgr.delete_meta(entry_key)
+            self.cache_mgr.delete_meta(self.stats_key)
+
     def cache_parse_result(self, cache_key: str, parse_result: Dict[str, Any], 
                           parser_info: Dict[str, Any]) -> bool:
         """
@@ -95,22 +558,13 @@ class ParsedContentCache:
             是否成功缓存
         """
         try:
-            # 构建缓存数据
-            cache_data = {
-                "content": parse_result.get("content", ""),
-                "doc_type": parse_result.get("doc_type", "unknown"),
-                "metadata": parse_result.get("metadata", {}),
-                "image_resources": parse_result.get("image_resources", []),
-                "parser_name": parser_info.get("name", "unknown"),
-                "parser_version": parser_info.get("version", "1.0"),
-                "parsing_time": parse_result.get("parsing_time", 0),
-                "content_length": len(parse_result.get("content", "")),
-                "timestamp": int(time.time()),
-                "cache_key": cache_key
-            }
-            
-            # 保存到缓存
-            self.cache_mgr.set(self.namespace, cache_key, cache_data, expire=self.expire_seconds)
+            if self._flush_threshold > 0:
+                cache_data = self._enqueue(cache_key, parse_result, parser_info)
+            else:
+                cache_data = self._write_one(cache_key, parse_result, parser_info)
+            if cache_data is None:
+                self.logger.debug(f"解析结果访问频率不足，未写入缓存: {cache_key}")
+                return False
             
             self.logger.debug(f"解析结果已缓存: {cache_key}, 内容长度: {cache_data['content_length']}")
             return True
@@ -119,10 +573,48 @@ class ParsedContentCache:
             self.logger.warning(f"缓存解析结果失败: {cache_key}, 错误: {e}")
             return False
 
+    def cache_parse_results_bulk(self, items: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        批量缓存解析结果，按分片批量写入（每个分片一次提交）
+        
+        Args:
+            items: (缓存键, 解析结果数据, 解析器信息) 元组的可迭代对象
+            
+        Returns:
+            成功缓存的条目数（不含未通过准入过滤的条目）
+        """
+        count = 0
+        try:
+            # 先写入缓冲中的旧数据，避免之后刷新时覆盖本次写入
+            self.flush()
+            count = self._store_many(
+                (cache_key, self._build_cache_data(cache_key, parse_result, parser_info))
+                for cache_key, parse_result, parser_info in items
+            )
+            
+            self.logger.debug(f"批量缓存解析结果完成: {count} 条")
+            return count
+            
+        except Exception as e:
+            self.logger.warning(f"批量缓存解析结果失败: {e}")
+            return 0
+
+    def _discard_pending(self):
+        """丢弃写缓冲中尚未写入的数据"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending.clear()
+            self._pending_bytes = 0
+
     def clear_cache(self):
         """清理所有解析结果缓存"""
         try:
+            self._discard_pending()
             self.cache_mgr.clear_namespace(self.namespace)
+            self._reset_aggregates()
+            self._l1_clear()
             self.logger.info("解析结果缓存已清理")
         except Exception as e:
             self.logger.error(f"清理解析结果缓存失败: {e}")
@@ -131,14 +623,28 @@ class ParsedContentCache:
         """
         清理指定解析器的缓存
         
+        按缓存键中的解析器名称（parsed:<哈希>:<解析器>:v<版本>）在SQLite中过滤，
+        按各条目的统计记录扣减统计聚合数据，不读取缓存值
+        
         Args:
             parser_name: 解析器名称
         """
         try:
-            # 注：统一缓存不支持按模式删除，暂时清空整个命名空间
-            # 未来可以考虑在统一缓存中实现模式匹配删除
-            self.logger.warning(f"统一缓存暂不支持按解析器清理，将清空所有解析缓存")
-            self.cache_mgr.clear_namespace(self.namespace)
+            self.flush()
+            
+            pattern = f"parsed:%:{self.cache_mgr.escape_like(parser_name)}:v%"
+            keys = self.cache_mgr.keys(self.namespace, pattern)
+            
+            deleted = self.cache_mgr.delete_many(self.namespace, keys)
+            self._forget_aggregates(keys)
+            
+            with self._l1_lock:
+                for key in keys:
+                    removed = self._l1.pop(key, None)
+                    if removed is not None:
+                        self._l1_bytes -= len(removed["content"])
+            
+            self.logger.info(f"已清理解析器 {parser_name} 的缓存: {deleted} 条")
             
         except Exception as e:
             self.logger.error(f"清理解析器缓存失败: {parser_name}, 错误: {e}")
@@ -147,12 +653,18 @@ class ParsedContentCache:
         """
         获取缓存统计信息
         
+        按解析器/文档类型的统计来自写入和删除时维护的聚合数据，无需扫描缓存值；
+        条目数与命名空间现存键数不一致时（条目被LRU淘汰或过期）先校正聚合数据
+        
         Returns:
             包含缓存统计信息的字典
         """
         try:
+            self.flush()
+            
             # 获取底层缓存统计
             cache_stats = self.cache_mgr.get_stats()
+            aggregates = self._reconcile_aggregates()
             
             # 返回标准化的统计信息
             return {
@@ -163,7 +675,9 @@ class ParsedContentCache:
                 "cache_misses": 0,  # 统一缓存不提供此统计
                 "cache_writes": 0,  # 统一缓存不提供此统计
                 "cache_errors": 0,  # 统一缓存不提供此统计
-                "hit_rate": cache_stats.get("hit_rate", 0)
+                "hit_rate": 0,  # 统一缓存不提供此统计
+                "parser_stats": aggregates.get("parser_stats", {}),
+                "doc_type_stats": aggregates.get("doc_type_stats", {})
             }
         except Exception as e:
             self.logger.error(f"获取缓存统计失败: {e}")
@@ -175,7 +689,9 @@ class ParsedContentCache:
                 "cache_misses": 0,
                 "cache_writes": 0,
                 "cache_errors": 1,
-                "hit_rate": 0
+                "hit_rate": 0,
+                "parser_stats": {},
+                "doc_type_stats": {}
             }
 
 
@@ -4,9 +4,11 @@
 """
 
 import os
+import re
 import importlib
-from typing import Dict, Optional, Type
-from pathlib import Path
+import importlib.util
+import threading
+from typing import Dict, Optional, Tuple, Type, Union
 
 from .utils import get_logger
 from .parsers.base import BaseParser
@@ -121,53 +123,87 @@ class LazyParserLoader:
         # 检查哪些解析器可用（基于已安装的依赖）
         self.available_parsers = self._check_available_parsers()
         self.logger.info(f"可用解析器: {list(self.available_parsers)}")
+        
+        # 预计算扩展名集合，热路径上只做一次集合/字典查找
+        self._double_exts = frozenset(ext for ext in self.parser_mapping if ext.count('.') >= 2)
+        self._resolved: Dict[str, Tuple[str, str, bool]] = {
+            ext: (module_path, class_name, class_name in self.available_parsers)
+            for ext, (module_path, class_name) in self.parser_mapping.items()
+        }
+        self._supported_exts = frozenset(
+            ext for ext, (_, _, available) in self._resolved.items() if available
+        )
+        
+        # 所有支持扩展名的尾部交替正则，供 is_supported 一次匹配完成判断
+        # 扩展名前要求同一路径段内还有字符，与 _get_file_extension 对点开头文件名（如 .gitignore）的处理一致
+        ext_alternation = '|'.join(
+            re.escape(ext) for ext in sorted(self._supported_exts, key=len, reverse=True)
+        ) or r'(?!)'
+        separators = re.escape(os.sep + (os.altsep or ''))
+        self._ext_re = re.compile(rf'[^{separators}](?:{ext_alternation})$', re.IGNORECASE)
+        
+        # 每个解析器类一把加载锁，避免预热线程与请求线程重复加载
+        self._load_locks: Dict[str, threading.Lock] = {
+            class_name: threading.Lock() for _, class_name in self.parser_mapping.values()
+        }
+        
+        # 后台预热可用解析器，隐藏首次请求的导入延迟；FileReader 自行创建解析器实例，
+        # 只有直接使用 get_parser_for_file 时才有意义，默认关闭
+        self._warmup: Optional[threading.Thread] = None
+        if os.getenv("PARSER_PREWARM", "false").lower() in ("true", "1"):
+            self._warmup = threading.Thread(target=self._prewarm, name="parser-prewarm", daemon=True)
+            self._warmup.start()
     
     def _check_available_parsers(self) -> set:
-        """检查哪些解析器可用"""
+        """
+        检查哪些解析器可用
+        
+        只通过 importlib.util.find_spec 检查依赖是否已安装，不执行模块初始化代码，
+        真正的导入推迟到解析器首次加载时
+        """
+        def has(module_name: str) -> bool:
+            try:
+                return importlib.util.find_spec(module_name) is not None
+            except (ImportError, ValueError):
+                return False
+        
         available = set()
         
         # 始终可用的基础解析器
         available.add('TextParser')
         
         # 检查PDF支持
-        try:
-            import pymupdf4llm
+        if has('pymupdf4llm'):
             available.add('PDFParser')
-        except ImportError:
+        else:
             self.logger.debug("PDFParser不可用: 缺少pymupdf4llm")
         
-        # 检查Office支持
-        try:
-            import openpyxl
-            import odfpy
+        # 检查Office支持（odfpy 的导入名为 odf）
+        if has('openpyxl') and has('odf'):
             available.add('OfficeParser')
-        except ImportError:
+        else:
             self.logger.debug("OfficeParser部分功能不可用")
         
         # 检查图像OCR支持
-        try:
-            from PIL import Image
+        if has('PIL'):
             available.add('ImageParser')
             # 检查OCR支持
-            try:
-                import langchain_openai
+            if has('langchain_openai'):
                 self.logger.debug("ImageParser支持OCR功能")
-            except ImportError:
+            else:
                 self.logger.debug("ImageParser不支持OCR: 缺少langchain_openai")
-        except ImportError:
+        else:
             self.logger.debug("ImageParser不可用: 缺少Pillow")
         
         # 检查压缩文件支持
-        try:
-            import zipfile
-            import tarfile
+        if has('zipfile') and has('tarfile'):
             available.add('ArchiveParser')
-        except ImportError:
+        else:
             self.logger.debug("ArchiveParser不可用")
         
         return available
     
-    def get_parser_for_file(self, file_path: str) -> Optional[BaseParser]:
+    def get_parser_for_file(self, file_path: Union[str, os.PathLike]) -> Optional[BaseParser]:
         """
         根据文件路径获取合适的解析器
         
@@ -178,34 +214,64 @@ class LazyParserLoader:
             合适的解析器实例，如果没有找到返回None
         """
         # 获取文件扩展名
-        file_ext = self._get_file_extension(file_path).lower()
+        file_ext = self._get_file_extension(file_path)
         
-        # 查找对应的解析器配置
-        parser_config = self.parser_mapping.get(file_ext)
-        if not parser_config:
+        # 查找对应的解析器配置（含预先计算的可用性）
+        resolved = self._resolved.get(file_ext)
+        if not resolved:
             self.logger.debug(f"未找到扩展名 {file_ext} 的解析器")
             return None
         
-        module_path, class_name = parser_config
+        module_path, class_name, available = resolved
         
         # 检查解析器是否可用
-        if class_name not in self.available_parsers:
+        if not available:
             self.logger.warning(f"解析器 {class_name} 不可用（缺少依赖）")
             return None
         
-        # 检查是否已加载
-        if class_name in self._parsers:
-            return self._parsers[class_name]
-        
-        # 懒加载解析器
+        # 获取已加载的解析器或懒加载
         try:
-            parser = self._load_parser(module_path, class_name)
-            self._parsers[class_name] = parser
-            return parser
+            return self._get_or_load_parser(module_path, class_name)
         except Exception as e:
             self.logger.error(f"加载解析器 {class_name} 失败: {e}")
             return None
     
+    def _get_or_load_parser(self, module_path: str, class_name: str) -> BaseParser:
+        """
+        获取已加载的解析器，未加载时在该类的加载锁内加载
+        
+        Args:
+            module_path: 模块路径
+            class_name: 类名
+            
+        Returns:
+            解析器实例
+        """
+        parser = self._parsers.get(class_name)
+        if parser is not None:
+            return parser
+        
+        with self._load_locks[class_name]:
+            parser = self._parsers.get(class_name)
+            if parser is None:
+                parser = self._load_parser(module_path, class_name)
+                self._parsers[class_name] = parser
+            return parser
+    
+    def _prewarm(self):
+        """后台预加载所有可用的解析器"""
+        warmed = set()
+        for module_path, class_name in self.parser_mapping.values():
+            if class_name in warmed or class_name not in self.available_parsers:
+                continue
+            warmed.add(class_name)
+            try:
+                self._get_or_load_parser(module_path, class_name)
+            except Exception as e:
+                self.logger.warning(f"预热解析器 {class_name} 失败: {e}")
+        
+        self.logger.info(f"解析器预热完成: {sorted(warmed)}")
+    
     def _load_parser(self, module_path: str, class_name: str) -> BaseParser:
         """
         动态加载解析器
@@ -219,9 +285,8 @@ class LazyParserLoader:
         """
         self.logger.info(f"加载解析器: {class_name}")
         
-        # 动态导入模块
-        full_module_path = f"src.file_reader.{module_path}"
-        module = importlib.import_module(full_module_path)
+        # 动态导入模块（相对于当前包，兼容 file_reader 与 src.file_reader 两种导入方式）
+        module = importlib.import_module(f".{module_path}", package=__package__)
         
         # 获取解析器类
         parser_class = getattr(module, class_name)
@@ -232,47 +297,51 @@ class LazyParserLoader:
         self.logger.info(f"解析器 {class_name} 加载成功")
         return parser_instance
     
-    def _get_file_extension(self, file_path: str) -> str:
-        """获取文件扩展名"""
-        path = Path(file_path)
+    def _get_file_extension(self, file_path: Union[str, os.PathLike]) -> str:
+        """
+        获取小写的文件扩展名，语义与 Path.suffix/suffixes 一致，但不构造 Path 对象
+        
+        Args:
+            file_path: 文件路径（字符串或 PathLike）
+            
+        Returns:
+            扩展名（如 .pdf、.tar.gz），没有扩展名时返回空字符串
+        """
+        name = os.path.basename(os.fspath(file_path)).lower()
+        
+        # 以点开头且无其他点的文件名（如 .gitignore）没有扩展名
+        dot = name.rfind('.')
+        if dot <= 0 or dot == len(name) - 1:
+            return ''
         
         # 处理双扩展名（如 .tar.gz）
-        if path.suffixes and len(path.suffixes) >= 2:
-            double_ext = ''.join(path.suffixes[-2:])
-            if double_ext in self.parser_mapping:
+        prev_dot = name.rfind('.', 0, dot)
+        if prev_dot > 0 and name[:prev_dot].lstrip('.'):
+            double_ext = name[prev_dot:]
+            if double_ext in self._double_exts:
                 return double_ext
         
-        # 返回单扩展名
-        return path.suffix if path.suffix else ''
+        return name[dot:]
     
-    def is_supported(self, file_path: str) -> bool:
+    def is_supported(self, file_path: Union[str, os.PathLike]) -> bool:
         """
         检查文件是否支持解析
         
         Args:
-            file_path: 文件路径
+            file_path: 文件路径（字符串或 PathLike）
             
         Returns:
             是否支持
         """
-        file_ext = self._get_file_extension(file_path).lower()
-        if file_ext not in self.parser_mapping:
-            return False
-        
-        _, class_name = self.parser_mapping[file_ext]
-        return class_name in self.available_parsers
+        return self._ext_re.search(os.fspath(file_path)) is not None
     
     def get_supported_extensions(self) -> list:
         """获取所有支持的文件扩展名"""
-        supported = []
-        for ext, (_, class_name) in self.parser_mapping.items():
-            if class_name in self.available_parsers:
-                supported.append(ext)
-        return sorted(supported)
+        return sorted(self._supported_exts)
     
     def cleanup(self):
         """清理所有已加载的解析器"""
-        for parser_name, parser in self._parsers.items():
+        for parser_name, parser in list(self._parsers.items()):
             try:
                 # 如果解析器有清理方法，调用它
                 if hasattr(parser, 'cleanup'):
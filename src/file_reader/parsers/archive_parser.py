@@ -3,21 +3,52 @@
 支持ZIP、RAR、7Z、TAR等压缩格式的解析，提取文件并生成文件树Markdown
 """
 
+import io
 import tempfile
-import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from .base import BaseParser
 from .mixins.file_mixin import FileProcessingMixin
 from ..models import ParseResult
 from .utils.archive_utils import ArchiveExtractor
 
+# 文件大小显示单位：(单位名称, 除数)，下标为字节数位长减一后除以 10
+_SIZE_UNITS = (("B", 1), ("KB", 1 << 10), ("MB", 1 << 20), ("GB", 1 << 30))
+
+# 临时解压目录在后台线程中删除，解析结果无需等待删除完成（进程退出前会等待队列中的删除任务）
+_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive-cleanup")
+
+
+def _remove_tree_later(path: str):
+    """
+    提交临时目录删除任务
+    
+    POSIX 上 shutil.rmtree 已基于目录文件描述符逐项 unlinkat，开销主要在系统调用本身，
+    因此将删除移出解析路径而不是重新实现递归删除
+    
+    Args:
+        path: 要删除的目录路径
+    """
+    try:
+        _cleanup_executor.submit(shutil.rmtree, path, ignore_errors=True)
+    except RuntimeError:
+        # 解释器关闭后无法再提交任务，直接同步删除
+        shutil.rmtree(path, ignore_errors=True)
+
 
 class ArchiveParser(BaseParser, FileProcessingMixin):
     """压缩文件解析器，解包并输出文件树Markdown格式"""
 
+    # 支持的压缩文件格式
+    supported_formats = frozenset({
+        '.zip', '.rar', '.7z', '.tar', '.gz', 
+        '.tar.gz', '.tgz', '.tar.bz2', '.tbz2'
+    })
+
     def __init__(self):
         """初始化压缩文件解析器"""
         BaseParser.__init__(self)
@@ -26,12 +57,6 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
         
         # 初始化压缩文件提取器
         self.archive_extractor = ArchiveExtractor()
-        
-        # 支持的压缩文件格式
-        self.supported_formats = {
-            '.zip', '.rar', '.7z', '.tar', '.gz', 
-            '.tar.gz', '.tgz', '.tar.bz2', '.tbz2'
-        }
 
     def _parse_content(self, content: bytes, file_extension: str = None) -> ParseResult:
         """
@@ -53,29 +78,21 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
         if file_extension not in self.supported_formats:
             return self._create_error_result(f"不支持的压缩文件类型: {file_extension}")
         
-        temp_archive_file = None
         temp_extract_dir = None
         
         try:
             self.logger.info(f"开始解析压缩文件: {file_extension}")
             
-            # 保存压缩文件到临时位置
-            temp_archive_file = tempfile.NamedTemporaryFile(suffix=file_extension, delete=False)
-            # 确保临时文件权限为600（仅所有者可读写）
-            os.chmod(temp_archive_file.name, 0o600)
-            temp_archive_file.write(content)
-            temp_archive_file.close()
-            
-            # 创建临时解压目录
+            # 创建临时解压目录，mkdtemp 创建的目录权限即为700（仅所有者可读写执行）
             temp_extract_dir = tempfile.mkdtemp(prefix=f"archive_{file_extension[1:]}_extract_")
-            # 确保临时目录权限为700（仅所有者可读写执行）
-            os.chmod(temp_extract_dir, 0o700)
             
-            # 解压文件
-            extracted_files = self.archive_extractor.extract_archive(
-                temp_archive_file.name, 
+            # 直接从内存解压，压缩包本身不落盘（BytesIO 与 content 共享缓冲区，不复制数据）
+            file_sizes: Dict[Path, int] = {}
+            extracted_files = self.archive_extractor.extract_archive_stream(
+                io.BytesIO(content), 
                 temp_extract_dir, 
-                file_extension
+                file_extension,
+                sizes=file_sizes
             )
             
             if not extracted_files:
@@ -86,7 +103,8 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
                 extracted_files, 
                 temp_extract_dir, 
                 file_extension,
-                len(content)
+                len(content),
+                file_sizes
             )
             
             # 处理提取的文件（上传到存储服务）
@@ -94,12 +112,11 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
                 files=extracted_files,
                 markdown_content=markdown_content,
                 temp_dir=temp_extract_dir,
-                doc_type=file_extension[1:],  # 去掉点号
-                source_file_path=temp_archive_file.name
+                doc_type=file_extension[1:]  # 去掉点号
             )
             
             # 创建元数据
-            archive_stats = self.archive_extractor.get_archive_stats(extracted_files, len(content))
+            archive_stats = self.archive_extractor.get_archive_stats(extracted_files, len(content), file_sizes)
             metadata = {
                 "parser": "archive_extractor",
                 "original_format": file_extension,
@@ -116,14 +133,13 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
             self.logger.error(f"解析压缩文件失败: {e}")
             return self._create_error_result(f"解析压缩文件失败: {e}")
         finally:
-            # 清理临时文件
-            if temp_archive_file and os.path.exists(temp_archive_file.name):
-                os.unlink(temp_archive_file.name)
-            if temp_extract_dir and os.path.exists(temp_extract_dir):
-                shutil.rmtree(temp_extract_dir, ignore_errors=True)
+            # 清理临时目录（由 mkdtemp 创建，rmtree 忽略错误，无需先检查是否存在）
+            if temp_extract_dir:
+                _remove_tree_later(temp_extract_dir)
 
     def _generate_file_tree_markdown(self, files: List[Path], base_path: str, 
-                                    file_extension: str, archive_size: int) -> str:
+                                    file_extension: str, archive_size: int,
+                                    file_sizes: Optional[Dict[Path, int]] = None) -> str:
         """
         生成文件树的Markdown表示
         
@@ -132,137 +148,126 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
             base_path: 基础路径
             file_extension: 压缩文件扩展名
             archive_size: 压缩文件大小
+            file_sizes: 解压时已获取的文件大小，省略时重新stat
             
         Returns:
             文件树Markdown内容
         """
         try:
-            # 按路径排序文件
-            sorted_files = sorted(files, key=lambda x: str(x.relative_to(base_path)))
-            
-            # 构建目录结构字典
-            dir_structure = {}
-            file_structure = {}
-            
-            for file_path in sorted_files:
-                relative_path = file_path.relative_to(base_path)
-                parts = relative_path.parts
-                
-                # 构建目录结构
-                current_level = dir_structure
-                for part in parts[:-1]:  # 除了文件名本身
-                    if part not in current_level:
-                        current_level[part] = {}
-                    current_level = current_level[part]
-                
-                # 添加文件
-                if len(parts) > 0:
-                    filename = parts[-1]
-                    parent_path = parts[:-1] if len(parts) > 1 else ()
-                    
-                    if parent_path not in file_structure:
-                        file_structure[parent_path] = []
-                    file_structure[parent_path].append((filename, file_path))
-            
-            # 生成Markdown内容
-            markdown_parts = []
-            
-            # 添加标题
-            markdown_parts.append(f"# 压缩包内容: {file_extension} 文件")
-            markdown_parts.append("")
-            
-            # 添加统计信息
-            archive_stats = self.archive_extractor.get_archive_stats(sorted_files, archive_size)
-            markdown_parts.append("## 📊 压缩包信息")
-            markdown_parts.append("")
-            markdown_parts.append(f"- **文件数量**: {archive_stats['file_count']} 个")
-            markdown_parts.append(f"- **压缩包大小**: {self._format_size(archive_stats['archive_size'])}")
-            markdown_parts.append(f"- **解压后大小**: {self._format_size(archive_stats['total_extracted_size'])}")
-            markdown_parts.append(f"- **压缩率**: {archive_stats['compression_ratio']}%")
-            markdown_parts.append("")
-            
-            # 添加文件类型分布
-            if archive_stats['file_type_distribution']:
-                markdown_parts.append("### 📋 文件类型分布")
-                markdown_parts.append("")
-                for file_type, count in sorted(archive_stats['file_type_distribution'].items()):
-                    type_name = file_type if file_type else "无扩展名"
-                    markdown_parts.append(f"- **{type_name}**: {count} 个")
-                markdown_parts.append("")
-            
-            # 添加文件树
-            markdown_parts.append("## 📁 文件结构")
-            markdown_parts.append("")
-            markdown_parts.append("```")
-            
-            # 递归生成文件树
-            tree_lines = self._build_tree_lines(dir_structure, file_structure, (), 0)
-            markdown_parts.extend(tree_lines)
-            
-            markdown_parts.append("```")
-            markdown_parts.append("")
-            
-            # 添加文件列表（带下载链接）
-            markdown_parts.append("## 📄 文件列表")
-            markdown_parts.append("")
-            
-            for file_path in sorted_files:
-                relative_path = file_path.relative_to(base_path)
-                icon = self.archive_extractor.get_file_icon(file_path)
-                file_size = self._format_size(file_path.stat().st_size)
-                
-                # 这里的链接会被后续处理替换为真实的resource_id
-                markdown_parts.append(f"- {icon} **{relative_path}** ({file_size}) → [{relative_path}]({file_path.name})")
-            
-            return "\n".join(markdown_parts)
-            
+            return "\n".join(list(self._iter_markdown_lines(files, base_path, file_extension,
+                                                             archive_size, file_sizes)))
         except Exception as e:
             self.logger.error(f"生成文件树Markdown失败: {e}")
             return f"# 压缩包内容: {file_extension} 文件\n\n解析文件树时发生错误: {e}"
 
-    def _build_tree_lines(self, dir_structure: dict, file_structure: dict, 
-                         current_path: tuple, depth: int) -> List[str]:
+    def _iter_markdown_lines(self, files: List[Path], base_path: str, 
+                             file_extension: str, archive_size: int,
+                             file_sizes: Optional[Dict[Path, int]] = None) -> Iterator[str]:
         """
-        递归构建文件树行
+        逐行生成文件树Markdown内容
         
         Args:
-            dir_structure: 目录结构字典
-            file_structure: 文件结构字典
-            current_path: 当前路径
-            depth: 当前深度
+            files: 文件路径列表
+            base_path: 基础路径
+            file_extension: 压缩文件扩展名
+            archive_size: 压缩文件大小
+            file_sizes: 解压时已获取的文件大小，省略时重新stat
             
-        Returns:
-            文件树行列表
+        Yields:
+            Markdown行
         """
-        lines = []
-        prefix = "│   " * depth
+        if file_sizes is None:
+            file_sizes = self.archive_extractor.get_file_sizes(files)
         
-        # 处理当前路径下的目录
-        if current_path in dir_structure or (len(current_path) == 0 and dir_structure):
-            current_dirs = dir_structure if len(current_path) == 0 else dir_structure
-            for path_part in current_path:
-                if path_part in current_dirs:
-                    current_dirs = current_dirs[path_part]
-                else:
-                    current_dirs = {}
-                    break
+        # 每个文件的相对路径（字符串与分段）和图标只计算一次，按相对路径字符串排序
+        base = Path(base_path)
+        get_icon_by_name = self.archive_extractor.get_icon_by_name
+        entries = []
+        for file_path in files:
+            relative_path = file_path.relative_to(base)
+            parts = relative_path.parts
+            entries.append((str(relative_path), parts, get_icon_by_name(parts[-1]), file_path))
+        entries.sort(key=itemgetter(0))
+        sorted_files = [entry[3] for entry in entries]
+        
+        # 文件树顺序：每一层目录在前、文件在后，同类按名称排序
+        tree_entries = sorted(
+            ((parts, icon) for _, parts, icon, _ in entries),
+            key=lambda entry: [(0, part) for part in entry[0][:-1]] + [(1, entry[0][-1])]
+        )
+        
+        # 添加标题
+        yield f"# 压缩包内容: {file_extension} 文件"
+        yield ""
+        
+        # 添加统计信息
+        archive_stats = self.archive_extractor.get_archive_stats(sorted_files, archive_size, file_sizes)
+        yield "## 📊 压缩包信息"
+        yield ""
+        yield f"- **文件数量**: {archive_stats['file_count']} 个"
+        yield f"- **压缩包大小**: {self._format_size(archive_stats['archive_size'])}"
+        yield f"- **解压后大小**: {self._format_size(archive_stats['total_extracted_size'])}"
+        yield f"- **压缩率**: {archive_stats['compression_ratio']}%"
+        yield ""
+        
+        # 添加文件类型分布
+        if archive_stats['file_type_distribution']:
+            yield "### 📋 文件类型分布"
+            yield ""
+            for file_type, count in sorted(archive_stats['file_type_distribution'].items()):
+                type_name = file_type if file_type else "无扩展名"
+                yield f"- **{type_name}**: {count} 个"
+            yield ""
+        
+        # 添加文件树
+        yield "## 📁 文件结构"
+        yield ""
+        yield "```"
+        yield from self._iter_tree_lines(tree_entries)
+        yield "```"
+        yield ""
+        
+        # 添加文件列表（带下载链接）
+        yield "## 📄 文件列表"
+        yield ""
+        
+        format_size = self._format_size
+        for relative_path, _, icon, file_path in entries:
+            file_size = format_size(file_sizes.get(file_path, 0))
             
-            # 添加子目录
-            for dirname in sorted(current_dirs.keys()):
-                lines.append(f"{prefix}├── 📁 {dirname}/")
-                sub_lines = self._build_tree_lines(
-                    dir_structure, file_structure, 
-                    current_path + (dirname,), depth + 1
-                )
-                lines.extend(sub_lines)
+            # 这里的链接会被后续处理替换为真实的resource_id
+            yield f"- {icon} **{relative_path}** ({file_size}) → [{relative_path}]({file_path.name})"
+
+    def _iter_tree_lines(self, tree_entries: List[Tuple[tuple, str]]) -> Iterator[str]:
+        """
+        单次线性扫描生成文件树行
         
-        # 处理当前路径下的文件
-        if current_path in file_structure:
-            for filename, file_path in sorted(file_structure[current_path]):
-                icon = self.archive_extractor.get_file_icon(file_path)
-                lines.append(f"{prefix}├── {icon} {filename}")
+        与上一个文件比较目录分段，只为新出现的目录输出一行，无需构建嵌套目录字典
         
-        return lines
+        Args:
+            tree_entries: 按文件树顺序排序的 (相对路径分段, 文件图标) 列表
+            
+        Yields:
+            文件树行
+        """
+        prev_dirs = ()
+        
+        for parts, icon in tree_entries:
+            dirs = parts[:-1]
+            
+            # 与上一个文件共同的目录前缀长度
+            common = 0
+            for prev_part, part in zip(prev_dirs, dirs):
+                if prev_part != part:
+                    break
+                common += 1
+            
+            # 输出新进入的目录
+            for depth in range(common, len(dirs)):
+                yield f"{'│   ' * depth}├── 📁 {dirs[depth]}/"
+            
+            yield f"{'│   ' * len(dirs)}├── {icon} {parts[-1]}"
+            prev_dirs = dirs
 
     def _format_size(self, size_bytes: int) -> str:
         """
@@ -274,14 +279,12 @@ class ArchiveParser(BaseParser, FileProcessingMixin):
         Returns:
             格式化的大小字符串
         """
-        if size_bytes < 1024:
+        # 按位长确定单位：每 10 位对应一级（1024 倍），不再逐级比较
+        index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+        if index == 0:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        label, divisor = _SIZE_UNITS[index]
+        return f"{size_bytes / divisor:.1f} {label}"
 
     def get_archive_upload_stats(self) -> Dict[str, Any]:
         """
@@ -3,6 +3,7 @@
 定义所有文档解析器的基类接口
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -22,6 +23,9 @@ class BaseParser(ImageProcessingMixin, ABC):
     所有具体解析器都应继承此类并实现 parse 方法
     """
     
+    # 只实现 _parse_content_async 的解析器设为True，同步 parse 会转发到 parse_async
+    is_async_only = False
+    
     def __init__(self):
         """
         初始化解析器
@@ -39,24 +43,37 @@ class BaseParser(ImageProcessingMixin, ABC):
         self.parsed_cache = get_parsed_cache()
     
     
-    def parse(self, content: bytes, file_extension: str = None, **kwargs) -> ParseResult:
+    def parse(self, content: bytes, file_extension: str = None,
+              content_hash: Optional[bytes] = None, **kwargs) -> ParseResult:
         """
         解析文档方法，带缓存支持（同步版本）
         
         Args:
             content: 文件内容字节数据
             file_extension: 文件扩展名
+            content_hash: 调用方已知的内容哈希，提供时跳过对内容的哈希计算
             **kwargs: 其他解析参数
             
         Returns:
             解析结果对象
+            
+        Raises:
+            RuntimeError: 只支持异步解析的解析器在运行中的事件循环内被同步调用
         """
+        if self.is_async_only:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.parse_async(content, file_extension, content_hash=content_hash, **kwargs))
+            raise RuntimeError(f"{self.__class__.__name__} 只支持异步解析，在事件循环中请使用 parse_async")
+        
         # 生成缓存键（包含kwargs参数）
         cache_key = self.parsed_cache.get_cache_key(
             content, 
             self.parser_name, 
             self.parser_version,
-            kwargs if kwargs else None
+            kwargs if kwargs else None,
+            content_hash=content_hash
         )
         
         # 尝试从缓存获取结果
@@ -93,13 +110,15 @@ class BaseParser(ImageProcessingMixin, ABC):
         
         return parse_result
     
-    async def parse_async(self, content: bytes, file_extension: str = None, **kwargs) -> ParseResult:
+    async def parse_async(self, content: bytes, file_extension: str = None,
+                          content_hash: Optional[bytes] = None, **kwargs) -> ParseResult:
         """
         解析文档方法，带缓存支持（异步版本）
         
         Args:
             content: 文件内容字节数据
             file_extension: 文件扩展名
+            content_hash: 调用方已知的内容哈希，提供时跳过对内容的哈希计算
             **kwargs: 其他解析参数
             
         Returns:
@@ -110,7 +129,8 @@ class BaseParser(ImageProcessingMixin, ABC):
             content, 
             self.parser_name, 
             self.parser_version,
-            kwargs if kwargs else None
+            kwargs if kwargs else None,
+            content_hash=content_hash
         )
         
         # 尝试从缓存获取结果
@@ -239,17 +259,14 @@ class BaseParser(ImageProcessingMixin, ABC):
         Returns:
             临时文件路径
         """
+        # mkstemp 创建的文件权限即为600（仅所有者可读写）
         fd, temp_path = tempfile.mkstemp(suffix=suffix)
         try:
-            # 确保临时文件权限为600（仅所有者可读写）
-            os.chmod(temp_path, 0o600)
             with os.fdopen(fd, 'wb') as f:
                 f.write(content)
             return Path(temp_path)
         except Exception:
-            os.close(fd)
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+            os.unlink(temp_path)
             raise
     
     def _cleanup_temp_file(self, file_path: Path):
@@ -4,20 +4,86 @@
 """
 
 import os
-import base64
+import binascii
 import re
 
 from .base import BaseParser
 from ..models import ParseResult
 from ..llm_util import get_llm
 
+# Markdown 后处理使用的预编译正则
+_RE_HEADING = re.compile(r'#{1,6}\s')
+_RE_INLINE_HEADING = re.compile(r'\s+(?=#{1,6}\s)')
+_RE_TABLE_GLUE = re.compile(r'\|[ \t]*\|')
+_RE_TABLE_SEPARATOR = re.compile(r'\s*\|(?:[ \t]*:?-+:?[ \t]*\|)+\s*$')
+_RE_LIST_MARKER = re.compile(r'([-*+]|\d+\.)[ \t]+')
+_RE_INLINE_SPACES = re.compile(r'(?<=[^|\s])[ \t]{2,}(?=[^|\s])')
+
+# 表示图像中没有文字的响应片段
+NO_TEXT_PATTERNS = (
+    '无文字内容',
+    'no text found',
+    'no text',
+    '*此图像中未识别到文字内容*',
+    '未识别到文字',
+    'no content found',
+    'empty',
+    '空白',
+    '没有文字'
+)
+_NO_TEXT_RE = re.compile('|'.join(map(re.escape, NO_TEXT_PATTERNS)), re.IGNORECASE)
+
+# 支持的图像扩展名及其MIME类型
+_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp'
+}
+
+# base64 分块编码的输入块大小（3的倍数，各块编码结果可直接拼接）
+_B64_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def _build_data_url(content: bytes, mime_type: str) -> str:
+    """
+    构建图像的 base64 data URL
+    
+    分块编码写入预分配的 bytearray 后只解码一次，
+    不产生完整大小的中间 base64 bytes/str
+    
+    Args:
+        content: 图像字节数据
+        mime_type: 图像的MIME类型
+        
+    Returns:
+        data URL 字符串
+    """
+    prefix = f"data:{mime_type};base64,".encode('ascii')
+    buf = bytearray(len(prefix) + (len(content) + 2) // 3 * 4)
+    buf[:len(prefix)] = prefix
+    
+    pos = len(prefix)
+    view = memoryview(content)
+    for start in range(0, len(content), _B64_CHUNK_SIZE):
+        chunk = binascii.b2a_base64(view[start:start + _B64_CHUNK_SIZE], newline=False)
+        buf[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    
+    return buf.decode('ascii')
+
 
 class ImageParser(BaseParser):
     """图像文件解析器，使用多模态LLM进行OCR，输出Markdown格式"""
 
+    # 只实现异步解析，同步调用由 BaseParser.parse 转发到 parse_async
+    is_async_only = True
+
     def __init__(self):
         super().__init__()
-        self.parser_version = "1.3"  # 更新解析器版本：支持Markdown输出
+        self.parser_version = "1.4"  # 更新解析器版本：Markdown后处理改为单次按行扫描
         
         # 初始化LLM客户端
         self.llm = None
@@ -36,12 +102,12 @@ class ImageParser(BaseParser):
             self.logger.error(f"LLM客户端初始化失败: {e}")
             raise
 
-    def get_prompt(self, image_base64: str, mime_type: str) -> list:
+    def get_prompt(self, image_content: bytes, mime_type: str) -> list:
         """
         构建图像OCR识别的多模态请求消息
         
         Args:
-            image_base64: base64编码的图像数据
+            image_content: 图像字节数据（在此处直接编码为 data URL）
             mime_type: 图像的MIME类型
             
         Returns:
@@ -68,7 +134,7 @@ class ImageParser(BaseParser):
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:{mime_type};base64,{image_base64}",
+                            "url": _build_data_url(image_content, mime_type),
                             "detail": "high"
                         }
                     }
@@ -101,21 +167,17 @@ class ImageParser(BaseParser):
         file_extension = file_extension.lower()
         
         # 检查是否为支持的图像格式
-        supported_formats = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-        if file_extension not in supported_formats:
+        if file_extension not in _MIME_TYPES:
             return self._create_error_result(f"不支持的图像格式: {file_extension}")
         
         try:
             self.logger.info(f"开始使用多模态LLM识别图像文字并格式化为Markdown: {file_extension}")
             
-            # 将图像内容编码为base64
-            image_base64 = base64.b64encode(content).decode('utf-8')
-            
             # 确定MIME类型
             mime_type = self._get_mime_type(file_extension)
             
-            # 构建多模态请求消息
-            messages = self.get_prompt(image_base64, mime_type)
+            # 构建多模态请求消息（图像在其中编码为base64 data URL）
+            messages = self.get_prompt(content, mime_type)
 
             # 调用 LLM 进行 OCR 识别和Markdown格式化
             response = await self.llm.ainvoke(messages, temperature=temperature)
@@ -168,25 +230,16 @@ class ImageParser(BaseParser):
         Returns:
             是否为无文字响应
         """
-        content_lower = content.lower().strip()
-        no_text_patterns = [
-            '无文字内容',
-            'no text found',
-            'no text',
-            '*此图像中未识别到文字内容*',
-            '未识别到文字',
-            'no content found',
-            'empty',
-            '空白',
-            '没有文字'
-        ]
-        
-        return any(pattern in content_lower for pattern in no_text_patterns)
+        # 单个忽略大小写的交替正则，一次扫描完成所有片段匹配
+        return _NO_TEXT_RE.search(content) is not None
     
     def _post_process_markdown(self, content: str) -> str:
         """
         后处理Markdown内容，确保格式规范
         
+        按行单次扫描：拆分被连在一起的标题/表格行，清理行尾和行内多余空格，
+        保证标题和表格块前后各有一个空行，连续空行最多保留一个
+        
         Args:
             content: 原始Markdown内容
             
@@ -197,42 +250,101 @@ class ImageParser(BaseParser):
         if not content.startswith('#'):
             content = "# 图像内容识别\n\n" + content
         
-        # 修复表格行之间的连接问题（如果表格行被连在一起）
-        # 匹配形如 "| cell1 | cell2 | | cell3 | cell4 |" 的情况
-        content = re.sub(r'(\|[^|\n]*\|)\s*(\|[^|\n]*\|)', r'\1\n\2', content)
-        
-        # 修复标题之间的连接问题（如果标题被连在一起）
-        # 匹配形如 "# title1 ## title2" 或 "## title1 ### title2" 的情况
-        content = re.sub(r'(#+\s[^#\n]*?)\s+(#+\s)', r'\1\n\n\2', content)
-        
-        # 修复标题和表格混合的情况
-        # 匹配形如 "### title | table |" 的情况
-        content = re.sub(r'(#+\s[^#\n|]*?)\s*(\|[^|\n]*\|)', r'\1\n\n\2', content)
+        out = []
+        prev_kind = 'blank'
+        header_cells = 0  # 当前表格分隔行（|---|）的单元格数，分隔行之前为0
         
-        # 规范化空行：连续的空行最多保留两个
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        for raw_line in content.split('\n'):
+            for line in self._split_markdown_line(raw_line.rstrip(), header_cells):
+                kind = self._markdown_line_kind(line)
+                
+                if kind == 'blank':
+                    if prev_kind != 'blank':
+                        out.append('')
+                    prev_kind = kind
+                    header_cells = 0
+                    continue
+                
+                # 标题前后、表格块与其他内容之间需要空行
+                if prev_kind != 'blank' and (
+                    kind == 'heading' or prev_kind == 'heading'
+                    or (kind == 'table') != (prev_kind == 'table')
+                ):
+                    out.append('')
+                
+                # 分隔行只含短横线和冒号，不会被 "| |" 拆分，用它确定表格列数
+                if kind != 'table':
+                    header_cells = 0
+                elif _RE_TABLE_SEPARATOR.match(line):
+                    header_cells = line.count('|') - 1
+                
+                out.append(line)
+                prev_kind = kind
         
-        # 确保标题前后有适当的空行
-        content = re.sub(r'(\n|^)(#+\s)', r'\1\n\2', content)
-        content = re.sub(r'(#+\s.*?)\n([^#\n])', r'\1\n\n\2', content)
+        # 确保文档末尾只有一个换行
+        return '\n'.join(out).strip() + '\n'
+    
+    def _markdown_line_kind(self, line: str) -> str:
+        """判断行类型：blank、heading、table 或 text"""
+        stripped = line.lstrip()
+        if not stripped:
+            return 'blank'
+        if _RE_HEADING.match(line):
+            return 'heading'
+        if stripped.startswith('|'):
+            return 'table'
+        return 'text'
+    
+    def _split_markdown_line(self, line: str, header_cells: int) -> list:
+        """
+        拆分被连在一起的Markdown行并规范行内空格
         
-        # 确保列表项格式正确
-        content = re.sub(r'\n([-*+])\s', r'\n\1 ', content)
-        content = re.sub(r'\n(\d+\.)\s', r'\n\1 ', content)
+        - "# 标题1 ## 标题2" 拆为多个标题行
+        - "### 标题 | 单元格 |" 拆为标题行和表格行
+        - "| a | b | | c | d |" 在各行单元格数一致时拆为多个表格行
         
-        # 确保表格前后有空行
-        content = re.sub(r'(\n|^)(\|.*?\|)\n', r'\1\n\2\n', content)
+        Args:
+            line: 已去除行尾空白的行
+            header_cells: 当前表格分隔行的单元格数（不在表格中或尚未遇到分隔行时为0）
+            
+        Returns:
+            拆分后的行列表
+        """
+        if _RE_HEADING.match(line):
+            heading, sep, rest = line.partition('|')
+            lines = [_RE_INLINE_SPACES.sub(' ', part) for part in _RE_INLINE_HEADING.split(heading.rstrip())]
+            if sep and rest.endswith('|'):
+                lines.extend(self._split_table_row(sep + rest, 0))
+            elif sep:
+                lines = [_RE_INLINE_SPACES.sub(' ', line)]
+            return lines
         
-        # 移除行尾多余空格
-        content = re.sub(r'[ \t]+$', '', content, flags=re.MULTILINE)
+        stripped = line.lstrip()
+        if stripped.startswith('|'):
+            return self._split_table_row(line, header_cells)
         
-        # 移除行内多余空格（但保留单个空格和表格分隔符）
-        content = re.sub(r'(?<![\|\s])\s{2,}(?![\|\s])', ' ', content)
+        # 普通文本/列表行：保留缩进，列表标记后只保留一个空格，行内连续空格合并
+        indent = line[:len(line) - len(stripped)]
+        stripped = _RE_LIST_MARKER.sub(r'\1 ', stripped, count=1) if _RE_LIST_MARKER.match(stripped) else stripped
+        return [indent + _RE_INLINE_SPACES.sub(' ', stripped)]
+    
+    def _split_table_row(self, line: str, header_cells: int) -> list:
+        """
+        拆分被连在一起的表格行
         
-        # 确保文档末尾只有一个换行
-        content = content.strip() + '\n'
+        单元格数与分隔行一致的行视为完整行（可能含空单元格）；
+        否则在 "| |" 处拆分，拆出的各行单元格数一致，并且与分隔行列数相同、其中含分隔行或拆出两行以上时才采用，
+        避免把含空单元格的单行（如 "| a | | c |"）拆开
+        """
+        if header_cells and line.count('|') - 1 == header_cells:
+            return [line]
         
-        return content
+        rows = _RE_TABLE_GLUE.sub('|\n|', line).split('\n')
+        if len(rows) > 1 and len({row.count('|') for row in rows}) == 1:
+            if (rows[0].count('|') - 1 == header_cells or len(rows) > 2
+                    or any(_RE_TABLE_SEPARATOR.match(row) for row in rows)):
+                return rows
+        return [line]
     
     def _get_mime_type(self, file_extension: str) -> str:
         """
@@ -244,87 +356,4 @@ class ImageParser(BaseParser):
         Returns:
             MIME类型字符串
         """
-        mime_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.bmp': 'image/bmp',
-            '.webp': 'image/webp'
-        }
-        
-        return mime_types.get(file_extension, 'image/jpeg')
-
-    def _parse_content(self, content: bytes, file_extension: str = None, **kwargs) -> ParseResult:
-        """
-        同步解析图像文件，使用nest_asyncio避免事件循环冲突
-        
-        Args:
-            content: 图像文件内容字节数据
-            file_extension: 文件扩展名
-            **kwargs: 其他解析参数
-            
-        Returns:
-            解析结果对象，内容为Markdown格式
-        """
-        import asyncio
-        
-        try:
-            # 尝试安装并使用nest_asyncio来处理嵌套事件循环
-            try:
-                import nest_asyncio
-                nest_asyncio.apply()
-            except ImportError:
-                # 如果没有nest_asyncio，尝试创建新的事件循环
-                pass
-            
-            # 获取或创建事件循环
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # 如果当前循环正在运行，创建新的事件循环
-                    import concurrent.futures
-                    import threading
-                    
-                    # 在新线程中运行异步方法
-                    result = None
-                    exception = None
-                    
-                    def run_async():
-                        nonlocal result, exception
-                        try:
-                            new_loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(new_loop)
-                            result = new_loop.run_until_complete(
-                                self._parse_content_async(content, file_extension, **kwargs)
-                            )
-                            new_loop.close()
-                        except Exception as e:
-                            exception = e
-                    
-                    thread = threading.Thread(target=run_async)
-                    thread.start()
-                    thread.join()
-                    
-                    if exception:
-                        raise exception
-                    return result
-                else:
-                    # 当前循环未运行，直接使用
-                    return loop.run_until_complete(
-                        self._parse_content_async(content, file_extension, **kwargs)
-                    )
-            except RuntimeError:
-                # 没有事件循环，创建新的
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(
-                        self._parse_content_async(content, file_extension, **kwargs)
-                    )
-                finally:
-                    loop.close()
-                    
-        except Exception as e:
-            self.logger.error(f"同步图像解析失败: {e}")
-            return self._create_error_result(f"图像解析失败: {e}") 
\ No newline at end of file
+        return _MIME_TYPES.get(file_extension, 'image/jpeg')
@@ -3,11 +3,16 @@
 为解析器提供统一的图片处理能力
 """
 
+import os
+import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 
 from ...image_cache import ImageCacheManager
 
+# 作为文档图片处理的文件扩展名
+IMAGE_SUFFIXES = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'})
+
 
 class ImageProcessingMixin:
     """图片处理混入类，为解析器提供图片缓存和处理能力"""
@@ -23,7 +28,8 @@ class ImageProcessingMixin:
     
     
     def process_document_images(self, markdown_content: str, temp_image_dir: str, 
-                              doc_type: str, source_file_path: str = None) -> Tuple[str, List[Dict[str, Any]]]:
+                              doc_type: str, source_file_path: str = None,
+                              image_files: Optional[List[Path]] = None) -> Tuple[str, List[Dict[str, Any]]]:
         """
         处理文档中的图片，统一的图片处理接口
         
@@ -32,20 +38,13 @@ class ImageProcessingMixin:
             temp_image_dir: 临时图片目录
             doc_type: 文档类型 (pdf, docx, pptx, etc.)
             source_file_path: 原始文档文件路径（可选）
+            image_files: 提取器已知的图片文件列表（可选），提供时不再扫描临时目录，空列表表示没有图片
             
         Returns:
             (处理后的Markdown内容, 图片资源列表)
         """
-        # 扫描临时目录中的图片文件
-        temp_image_path = Path(temp_image_dir)
-        if not temp_image_path.exists():
-            return markdown_content, []
-        
-        # 收集图片文件
-        image_files = []
-        for image_file in temp_image_path.glob("*"):
-            if image_file.is_file() and image_file.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']:
-                image_files.append(image_file)
+        if image_files is None:
+            image_files = self.scan_image_files(temp_image_dir)
         
         if not image_files:
             return markdown_content, []
@@ -61,7 +60,54 @@ class ImageProcessingMixin:
         # 使用图片缓存管理器处理图片
         return self._image_cache_manager.cache_document_images(image_files, doc_info)
     
-
+    @staticmethod
+    def scan_image_files(temp_image_dir: str) -> List[Path]:
+        """
+        扫描临时目录中的图片文件
+        
+        Args:
+            temp_image_dir: 临时图片目录
+            
+        Returns:
+            图片文件路径列表，目录不存在时为空列表
+        """
+        # scandir 直接返回文件类型，无需逐个stat
+        try:
+            with os.scandir(temp_image_dir) as entries:
+                return [
+                    Path(entry.path) for entry in entries
+                    if entry.is_file(follow_symlinks=False)
+                    and os.path.splitext(entry.name)[1].lower() in IMAGE_SUFFIXES
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+    
+    @staticmethod
+    def remove_image_dir(temp_image_dir: str, image_files: Optional[List[Path]] = None):
+        """
+        删除临时图片目录
+        
+        已知目录内容时逐个删除图片后移除空目录，省去 rmtree 的再次遍历；
+        目录中还有其他文件或内容未知时退回 rmtree
+        
+        Args:
+            temp_image_dir: 临时图片目录
+            image_files: scan_image_files 得到的图片列表（可选）
+        """
+        if image_files is not None:
+            for image_file in image_files:
+                try:
+                    os.unlink(image_file)
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(temp_image_dir)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                pass
+        shutil.rmtree(temp_image_dir, ignore_errors=True)
     
     
     def clear_image_cache(self):
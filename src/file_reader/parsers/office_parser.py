@@ -8,10 +8,10 @@ Office文档解析器 - 混合策略版本
 - 旧格式: LibreOffice 转换后再处理
 """
 
+import io
 import tempfile
-import os
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from .base import BaseParser
 from .mixins.image_mixin import ImageProcessingMixin
@@ -19,6 +19,7 @@ from ..models import ParseResult
 from .utils.document_converter import DocumentConverter
 from .utils.pandoc_converter import PandocConverter
 from .utils.office_specific_parsers import ExcelParser, PowerPointParser
+from .utils.odf_reader import OdfStreamReader
 from .utils.file_utils import FileManager, FormatChecker, ResultBuilder
 
 
@@ -28,7 +29,7 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
     def __init__(self):
         """初始化Office解析器"""
         BaseParser.__init__(self)
-        self.parser_version = "2.0"  # 更新解析器版本
+        self.parser_version = "2.1"  # 更新解析器版本：ODS表格去掉行尾空白列
         
         # 初始化工具类
         self.document_converter = DocumentConverter()
@@ -38,6 +39,17 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
         self.file_manager = FileManager()
         self.format_checker = FormatChecker()
         self.result_builder = ResultBuilder()
+        
+        # 按扩展名分派解析策略：扩展名 -> (转换函数, 解析器信息)
+        self._converters = {ext: (self._convert_with_pandoc, "pandoc") for ext in FormatChecker.PANDOC_FORMATS}
+        self._converters['.xlsx'] = (self._convert_excel, "pandas+excel_parser")
+        self._converters['.pptx'] = (self._convert_powerpoint, "python-pptx+powerpoint_parser")
+        
+        # OpenDocument 电子表格和演示文稿直接流式解析原始内容
+        self._legacy_parsers = {
+            '.ods': self._parse_ods_legacy,
+            '.odp': self._parse_odp_legacy
+        }
 
     def _parse_content(self, content: bytes, file_extension: str = None) -> ParseResult:
         """
@@ -59,6 +71,10 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
         if not self.format_checker.is_supported_office_format(file_extension):
             return self.result_builder.create_error_result(f"不支持的Office文档类型: {file_extension}")
         
+        legacy_parser = self._legacy_parsers.get(file_extension)
+        if legacy_parser is not None:
+            return legacy_parser(content, file_extension)
+        
         temp_file = None
         converted_file = None
         temp_image_dir = None
@@ -81,33 +97,17 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
             else:
                 input_file = str(temp_file)
             
-            # 创建临时图片目录
+            # 根据文件类型选择最佳解析策略
+            converter = self._converters.get(file_extension)
+            if converter is None:
+                return self.result_builder.create_error_result(f"内部错误：未处理的文件类型 {file_extension}")
+            convert, parser_info = converter
+            
+            # 创建临时图片目录，mkdtemp 创建的目录权限即为700（仅所有者可读写执行）
             temp_image_dir = tempfile.mkdtemp(prefix=f"office_{file_extension[1:]}_images_")
-            # 确保临时目录权限为700（仅所有者可读写执行）
-            os.chmod(temp_image_dir, 0o700)
             
-            # 根据文件类型选择最佳解析策略，同时提取图片
-            if self.format_checker.needs_pandoc(file_extension):
-                # 使用 pandoc 解析（支持图片提取）
-                markdown_content = self.pandoc_converter.convert_to_markdown(input_file, file_extension, temp_image_dir)
-                parser_info = "pandoc"
-            elif file_extension == '.xlsx':
-                # 使用 Excel 专用解析器
-                markdown_content = self.excel_parser.parse_to_markdown(input_file)
-                self.excel_parser.extract_images(input_file, temp_image_dir)
-                parser_info = "pandas+excel_parser"
-            elif file_extension == '.pptx':
-                # 使用 PowerPoint 专用解析器
-                markdown_content = self.powerpoint_parser.parse_to_markdown(input_file, temp_image_dir)
-                parser_info = "python-pptx+powerpoint_parser"
-            elif file_extension in ['.ods', '.odp']:
-                # OpenDocument 电子表格和演示文稿，使用原有方法
-                if file_extension == '.ods':
-                    return self._parse_ods_legacy(content, file_extension)
-                else:  # .odp
-                    return self._parse_odp_legacy(content, file_extension)
-            else:
-                return self.result_builder.create_error_result(f"内部错误：未处理的文件类型 {file_extension}")
+            # 解析文档，同时提取图片
+            markdown_content, image_files = convert(input_file, file_extension, temp_image_dir)
             
             if not markdown_content:
                 return self.result_builder.create_error_result("文档解析失败，内容为空")
@@ -117,7 +117,8 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
                 markdown_content=markdown_content,
                 temp_image_dir=temp_image_dir,
                 doc_type=file_extension[1:],  # 去掉点号
-                source_file_path=input_file
+                source_file_path=input_file,
+                image_files=image_files
             )
             
             # 创建元数据
@@ -147,65 +148,52 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
 
 
 
+    def _convert_with_pandoc(self, input_file: str, file_extension: str,
+                             temp_image_dir: str) -> Tuple[str, Optional[List[Path]]]:
+        """使用 pandoc 转换为Markdown（支持图片提取），返回 (Markdown内容, None)，图片需扫描临时目录获得"""
+        return self.pandoc_converter.convert_to_markdown(input_file, file_extension, temp_image_dir), None
+
+    def _convert_excel(self, input_file: str, file_extension: str,
+                       temp_image_dir: str) -> Tuple[str, Optional[List[Path]]]:
+        """使用 Excel 专用解析器转换为Markdown，并提取图片，返回 (Markdown内容, 图片文件列表)"""
+        markdown_content = self.excel_parser.parse_to_markdown(input_file)
+        image_files = self.excel_parser.extract_images(input_file, temp_image_dir)
+        return markdown_content, image_files
+
+    def _convert_powerpoint(self, input_file: str, file_extension: str,
+                            temp_image_dir: str) -> Tuple[str, Optional[List[Path]]]:
+        """使用 PowerPoint 专用解析器转换为Markdown，同时提取图片，返回 (Markdown内容, 图片文件列表)"""
+        image_files = []
+        markdown_content = self.powerpoint_parser.parse_to_markdown(input_file, temp_image_dir, image_files)
+        return markdown_content, image_files
+
     def _parse_ods_legacy(self, content: bytes, file_extension: str) -> ParseResult:
-        """使用原有方法解析ODS文件"""
-        temp_file = None
+        """解析ODS文件：流式读取content.xml，失败时回退到odfpy"""
+        try:
+            self.logger.info("流式解析ODS文件")
+            markdown_content, sheet_count = self._ods_tables_to_markdown(OdfStreamReader.iter_ods_tables(content))
+            metadata = {"parser": "odf_stream+markdown", "sheets": sheet_count}
+            return self.result_builder.create_success_result(markdown_content, "ods", metadata)
+        except Exception as e:
+            self.logger.warning(f"ODS流式解析失败，回退到odfpy: {e}")
+        
         try:
             self.logger.info("使用odfpy解析ODS文件")
-            temp_file = self.file_manager.save_temp_file(content, file_extension)
             
             try:
                 from odf.opendocument import load
                 from odf.table import Table, TableRow, TableCell
                 from odf.teletype import extractText
                 
-                doc = load(str(temp_file))
-                tables = doc.getElementsByType(Table)
-                markdown_parts = []
-                
-                markdown_parts.append("# OpenDocument 电子表格")
-                markdown_parts.append("")
-                
-                for table_idx, table in enumerate(tables):
-                    sheet_name = table.getAttribute('name') or f"工作表{table_idx + 1}"
-                    markdown_parts.append(f"## {sheet_name}")
-                    markdown_parts.append("")
-                    
-                    # 提取表格数据
-                    rows = table.getElementsByType(TableRow)
-                    table_data = []
-                    
-                    for row in rows:
-                        cells = row.getElementsByType(TableCell)
-                        row_data = []
-                        
-                        for cell in cells:
-                            cell_text = extractText(cell).strip()
-                            row_data.append(cell_text or " ")
-                        
-                        if any(cell.strip() for cell in row_data):
-                            table_data.append(row_data)
-                    
-                    if table_data:
-                        # 转换为Markdown表格
-                        if len(table_data) > 0:
-                            # 表头
-                            header = "| " + " | ".join(table_data[0]) + " |"
-                            separator = "|" + "|".join([" --- " for _ in table_data[0]]) + "|"
-                            markdown_parts.append(header)
-                            markdown_parts.append(separator)
-                            
-                            # 数据行
-                            for row in table_data[1:]:
-                                row_md = "| " + " | ".join(row) + " |"
-                                markdown_parts.append(row_md)
-                    else:
-                        markdown_parts.append("*此工作表无数据*")
-                    
-                    markdown_parts.append("")
-                
-                markdown_content = "\n".join(markdown_parts)
-                metadata = {"parser": "odfpy+markdown", "sheets": len(tables)}
+                doc = load(io.BytesIO(content))
+                tables = (
+                    (table.getAttribute('name'),
+                     [[extractText(cell) for cell in row.getElementsByType(TableCell)]
+                      for row in table.getElementsByType(TableRow)])
+                    for table in doc.getElementsByType(Table)
+                )
+                markdown_content, sheet_count = self._ods_tables_to_markdown(tables)
+                metadata = {"parser": "odfpy+markdown", "sheets": sheet_count}
                 
                 return self.result_builder.create_success_result(markdown_content, "ods", metadata)
                 
@@ -216,16 +204,68 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
                 
         except Exception as e:
             return self.result_builder.create_error_result(f"解析ODS文档失败: {e}")
-        finally:
-            if temp_file:
-                self.file_manager.cleanup_temp_file(temp_file)
+
+    @staticmethod
+    def _ods_tables_to_markdown(tables: Iterable[Tuple[str, List[List[str]]]]) -> Tuple[str, int]:
+        """
+        将ODS工作表转换为Markdown
+        
+        Args:
+            tables: (工作表名称, 单元格文本行列表) 序列
+            
+        Returns:
+            (Markdown内容, 工作表数量)
+        """
+        markdown_parts = ["# OpenDocument 电子表格", ""]
+        sheet_count = 0
+        
+        for table_idx, (sheet_name, rows) in enumerate(tables):
+            sheet_count += 1
+            markdown_parts.append(f"## {sheet_name or f'工作表{table_idx + 1}'}")
+            markdown_parts.append("")
+            
+            # 提取表格数据，去掉行尾的空白单元格（ODS 常以带 number-columns-repeated 的空单元格填充到行尾）
+            table_data = []
+            for row in rows:
+                row_data = [text.strip() or " " for text in row]
+                while row_data and row_data[-1] == " ":
+                    row_data.pop()
+                if row_data:
+                    table_data.append(row_data)
+            
+            if table_data:
+                # 转换为Markdown表格，各行补齐到相同列数
+                width = max(len(row) for row in table_data)
+                for row in table_data:
+                    row.extend([" "] * (width - len(row)))
+                
+                join_cells = " | ".join
+                
+                # 表头
+                markdown_parts.append("| " + join_cells(table_data[0]) + " |")
+                markdown_parts.append("|" + " --- |" * width)
+                
+                # 数据行
+                markdown_parts.extend(["| " + join_cells(row) + " |" for row in table_data[1:]])
+            else:
+                markdown_parts.append("*此工作表无数据*")
+            
+            markdown_parts.append("")
+        
+        return "\n".join(markdown_parts), sheet_count
 
     def _parse_odp_legacy(self, content: bytes, file_extension: str) -> ParseResult:
-        """使用原有方法解析ODP文件"""
-        temp_file = None
+        """解析ODP文件：流式读取content.xml，失败时回退到odfpy"""
+        try:
+            self.logger.info("流式解析ODP文件")
+            markdown_content, slide_count = self._odp_pages_to_markdown(OdfStreamReader.iter_odp_pages(content))
+            metadata = {"parser": "odf_stream+markdown", "slides": slide_count}
+            return self.result_builder.create_success_result(markdown_content, "odp", metadata)
+        except Exception as e:
+            self.logger.warning(f"ODP流式解析失败，回退到odfpy: {e}")
+        
         try:
             self.logger.info("使用odfpy解析ODP文件")
-            temp_file = self.file_manager.save_temp_file(content, file_extension)
             
             try:
                 from odf.opendocument import load
@@ -233,34 +273,13 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
                 from odf.text import P
                 from odf.teletype import extractText
                 
-                doc = load(str(temp_file))
-                pages = doc.getElementsByType(Page)
-                markdown_parts = []
-                
-                markdown_parts.append("# OpenDocument 演示文稿")
-                markdown_parts.append("")
-                
-                for page_idx, page in enumerate(pages, 1):
-                    markdown_parts.append(f"## 幻灯片 {page_idx}")
-                    markdown_parts.append("")
-                    
-                    paragraphs = page.getElementsByType(P)
-                    slide_content = []
-                    
-                    for paragraph in paragraphs:
-                        text = extractText(paragraph).strip()
-                        if text:
-                            slide_content.append(f"- {text}")
-                    
-                    if slide_content:
-                        markdown_parts.extend(slide_content)
-                    else:
-                        markdown_parts.append("*此幻灯片无文本内容*")
-                    
-                    markdown_parts.append("")
-                
-                markdown_content = "\n".join(markdown_parts)
-                metadata = {"parser": "odfpy+markdown", "slides": len(pages)}
+                doc = load(io.BytesIO(content))
+                pages = (
+                    [extractText(paragraph) for paragraph in page.getElementsByType(P)]
+                    for page in doc.getElementsByType(Page)
+                )
+                markdown_content, slide_count = self._odp_pages_to_markdown(pages)
+                metadata = {"parser": "odfpy+markdown", "slides": slide_count}
                 
                 return self.result_builder.create_success_result(markdown_content, "odp", metadata)
                 
@@ -271,7 +290,32 @@ class OfficeParser(BaseParser, ImageProcessingMixin):
                 
         except Exception as e:
             return self.result_builder.create_error_result(f"解析ODP文档失败: {e}")
-        finally:
-            if temp_file:
-                self.file_manager.cleanup_temp_file(temp_file)
 
+    @staticmethod
+    def _odp_pages_to_markdown(pages: Iterable[List[str]]) -> Tuple[str, int]:
+        """
+        将ODP幻灯片转换为Markdown
+        
+        Args:
+            pages: 每张幻灯片的段落文本列表序列
+            
+        Returns:
+            (Markdown内容, 幻灯片数量)
+        """
+        markdown_parts = ["# OpenDocument 演示文稿", ""]
+        slide_count = 0
+        
+        for page_idx, paragraphs in enumerate(pages, 1):
+            slide_count += 1
+            markdown_parts.append(f"## 幻灯片 {page_idx}")
+            markdown_parts.append("")
+            
+            slide_content = [f"- {text}" for text in (paragraph.strip() for paragraph in paragraphs) if text]
+            if slide_content:
+                markdown_parts.extend(slide_content)
+            else:
+                markdown_parts.append("*此幻灯片无文本内容*")
+            
+            markdown_parts.append("")
+        
+        return "\n".join(markdown_parts), slide_count
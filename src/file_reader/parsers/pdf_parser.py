@@ -3,16 +3,95 @@ PDF文档解析器
 使用PyMuPDF4LLM进行PDF到Markdown的转换，并支持图片提取和缓存
 """
 
+import multiprocessing
 import os
+import statistics
 import tempfile
-import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, List, Optional
 
+import pymupdf
 import pymupdf4llm
 
 from .base import BaseParser
 from ..models import ParseResult
 
 
+# 默认图片提取分辨率
+DEFAULT_IMAGE_DPI = 150
+# 默认图片格式及可选格式（jpg 编码比 png 快，适合照片较多的文档）
+DEFAULT_IMAGE_FORMAT = "png"
+IMAGE_FORMATS = ("png", "jpg")
+# 自动分辨率时采样的页数
+DPI_SAMPLE_PAGES = 3
+# 文本型PDF判定：抽样页（首页、中间页、末页）均至少包含该数量的字符
+TEXT_PAGE_MIN_CHARS = 50
+
+# PyMuPDF 不支持多线程并发使用，同一进程内的PDF解析串行执行
+_pymupdf_lock = threading.Lock()
+
+# 分片并行解析的进程池：MuPDF 不支持多线程共享文档，各分片在独立进程中自行打开文档
+_shard_executor = None
+_shard_executor_lock = threading.Lock()
+
+
+def _get_shard_executor(workers: int) -> ProcessPoolExecutor:
+    """获取分片解析进程池（首次调用时创建，使用spawn避免在多线程服务进程中fork）"""
+    global _shard_executor
+    with _shard_executor_lock:
+        if _shard_executor is None:
+            _shard_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _shard_executor
+
+
+def _reset_shard_executor():
+    """丢弃已损坏的进程池，下次使用时重新创建"""
+    global _shard_executor
+    with _shard_executor_lock:
+        if _shard_executor is not None:
+            _shard_executor.shutdown(wait=False, cancel_futures=True)
+            _shard_executor = None
+
+
+def _to_markdown(pdf_doc, pages: Optional[List[int]], image_dir: Optional[str], dpi: int,
+                 use_ocr: bool = True, image_format: str = DEFAULT_IMAGE_FORMAT) -> List[Any]:
+    """
+    使用PyMuPDF4LLM解析指定页（None为全部页）为Markdown
+
+    image_dir 为None时不提取图片；use_ocr为False时不做逐页OCR判断
+    """
+    # use_ocr 仅布局解析模式使用，传统模式会忽略该参数
+    options = {} if use_ocr else {"use_ocr": False}
+    return pymupdf4llm.to_markdown(
+        doc=pdf_doc,
+        pages=pages,
+        filename="document.pdf",  # 内存文档没有文件名，用于命名提取的图片
+        page_chunks=True,  # 获取分页数据和元数据
+        write_images=image_dir is not None,  # 提取图片
+        image_path=image_dir or "",  # 图片保存路径
+        image_format=image_format,  # 图片格式
+        dpi=dpi,  # 图片分辨率
+        force_text=True,  # 图片中的文本也显示在Markdown中
+        show_progress=False,  # 禁用进度显示，避免MCP服务器通信干扰
+        **options
+    )
+
+
+def _convert_page_shard(content: bytes, pages: List[int], image_dir: Optional[str], dpi: int,
+                        use_ocr: bool, image_format: str) -> List[Any]:
+    """在子进程中打开文档并解析一个页分片"""
+    pdf_doc = pymupdf.open(stream=content, filetype="pdf")
+    try:
+        return _to_markdown(pdf_doc, pages, image_dir, dpi, use_ocr, image_format)
+    finally:
+        pdf_doc.close()
+
+
 class PDFParser(BaseParser):
     """PDF文档解析器，使用PyMuPDF4LLM解析为Markdown格式，支持图片提取和缓存"""
 
@@ -20,6 +99,19 @@ class PDFParser(BaseParser):
         """初始化PDF解析器"""
         super().__init__()
         self.parser_version = "2.1"  # 更新解析器版本
+        # 按文档内嵌图片的原始尺寸选择提取分辨率
+        self.auto_image_dpi = os.getenv("PDF_IMAGE_DPI_AUTO", "false").lower() == "true"
+        # 按页分片并行解析的进程数（1为串行）及启用并行的最少页数
+        self.parse_workers = int(os.getenv("PDF_PARSE_WORKERS", "1"))
+        self.parallel_min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+        # 文本型PDF跳过OCR判断（逐页版面分析）
+        self.text_routing = os.getenv("PDF_TEXT_ROUTING", "true").lower() == "true"
+        # 是否提取图片：本地读取模式下图片引用最终会被移除，关闭后不再渲染和写出图片
+        self.extract_images = os.getenv("PDF_EXTRACT_IMAGES", "true").lower() == "true"
+        self.image_format = os.getenv("PDF_IMAGE_FORMAT", DEFAULT_IMAGE_FORMAT).lower()
+        if self.image_format not in IMAGE_FORMATS:
+            self.logger.warning(f"不支持的PDF图片格式: {self.image_format}，使用 {DEFAULT_IMAGE_FORMAT}")
+            self.image_format = DEFAULT_IMAGE_FORMAT
 
     def _parse_content(self, content: bytes, file_extension: str = None) -> ParseResult:
         """
@@ -37,7 +129,8 @@ class PDFParser(BaseParser):
         
         try:
             self.logger.info("使用PyMuPDF4LLM解析PDF为Markdown")
-            return self._parse_with_pymupdf4llm(content)
+            with _pymupdf_lock:
+                return self._parse_with_pymupdf4llm(content)
                 
         except Exception as e:
             self.logger.error(f"解析PDF文档失败: {e}")
@@ -53,62 +146,62 @@ class PDFParser(BaseParser):
         Returns:
             解析结果对象
         """
-        temp_pdf_path = None
+        pdf_doc = None
         temp_image_dir = None
+        image_files = None
         
         try:
-            # 创建临时PDF文件
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
-                # 确保临时文件权限为600（仅所有者可读写）
-                os.chmod(temp_pdf.name, 0o600)
-                temp_pdf.write(content)
-                temp_pdf_path = temp_pdf.name
+            # 直接从内存打开PDF，无需先写入临时文件
+            pdf_doc = pymupdf.open(stream=content, filetype="pdf")
             
-            # 创建临时图片目录
-            temp_image_dir = tempfile.mkdtemp(prefix="pdf_images_")
-            # 确保临时目录权限为700（仅所有者可读写执行）
-            os.chmod(temp_image_dir, 0o700)
+            # 创建临时图片目录（不提取图片时无需创建），mkdtemp 创建的目录权限即为700（仅所有者可读写执行）
+            if self.extract_images:
+                temp_image_dir = tempfile.mkdtemp(prefix="pdf_images_")
             
-            self.logger.info(f"开始PyMuPDF4LLM解析: {temp_pdf_path}")
+            self.logger.info(f"开始PyMuPDF4LLM解析: {len(content)} 字节")
             
             # 使用PyMuPDF4LLM解析PDF为Markdown，并提取图片
-            markdown_data = pymupdf4llm.to_markdown(
-                doc=temp_pdf_path,
-                page_chunks=True,  # 获取分页数据和元数据
-                write_images=True,  # 提取图片
-                image_path=temp_image_dir,  # 图片保存路径
-                image_format="png",  # 图片格式
-                dpi=150,  # 图片分辨率
-                force_text=True,  # 图片中的文本也显示在Markdown中
-                show_progress=False  # 禁用进度显示，避免MCP服务器通信干扰
+            # 文本型PDF无需OCR；图片型和混合型保留OCR（如已安装OCR引擎）
+            pdf_kind = self._classify_pdf(pdf_doc)
+            markdown_data = self._convert_pages(
+                content, pdf_doc, temp_image_dir,
+                self._choose_image_dpi(pdf_doc) if temp_image_dir else DEFAULT_IMAGE_DPI,
+                use_ocr=not (self.text_routing and pdf_kind == "text")
             )
             
             if not markdown_data:
                 return self._create_error_result("PDF解析结果为空")
             
-            # 合并所有页面的Markdown内容
-            markdown_content = ""
+            # 合并所有页面的Markdown内容（收集后一次拼接，避免逐页 += 反复复制）
+            page_parts = []
             total_pages = len(markdown_data)
             
             for page_idx, page_data in enumerate(markdown_data):
                 if isinstance(page_data, dict) and 'text' in page_data:
                     page_text = page_data['text']
                     if page_text and page_text.strip():
-                        markdown_content += f"# 第 {page_idx + 1} 页\n\n{page_text}\n\n"
+                        page_parts.append(f"# 第 {page_idx + 1} 页\n\n{page_text}\n\n")
                 elif isinstance(page_data, str):
                     # 如果直接返回字符串而不是字典
-                    markdown_content += f"# 第 {page_idx + 1} 页\n\n{page_data}\n\n"
+                    page_parts.append(f"# 第 {page_idx + 1} 页\n\n{page_data}\n\n")
+            markdown_content = "".join(page_parts)
             
             if not markdown_content.strip():
                 return self._create_error_result("PDF文档无有效内容")
             
             # 使用基类的图片处理能力处理提取的图片
-            processed_markdown, image_resources = self.process_document_images(
-                markdown_content=markdown_content,
-                temp_image_dir=temp_image_dir,
-                doc_type="pdf",
-                source_file_path=temp_pdf_path
-            )
+            # PyMuPDF4LLM写出的每张图片都会以Markdown图片链接引用，没有链接即没有图片
+            # 扫描结果同时用于清理临时目录，避免 rmtree 再遍历一次
+            if temp_image_dir:
+                image_files = self.scan_image_files(temp_image_dir) if "![" in markdown_content else []
+                processed_markdown, image_resources = self.process_document_images(
+                    markdown_content=markdown_content,
+                    temp_image_dir=temp_image_dir,
+                    doc_type="pdf",
+                    image_files=image_files
+                )
+            else:
+                processed_markdown, image_resources = markdown_content, []
             
             # 创建元数据
             metadata = {
@@ -128,8 +221,108 @@ class PDFParser(BaseParser):
             return self._create_success_result(processed_markdown, "pdf_markdown", metadata)
             
         finally:
-            # 清理临时文件
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                os.unlink(temp_pdf_path)
-            if temp_image_dir and os.path.exists(temp_image_dir):
-                shutil.rmtree(temp_image_dir, ignore_errors=True) 
\ No newline at end of file
+            # 关闭文档并清理临时目录
+            if pdf_doc is not None:
+                pdf_doc.close()
+            if temp_image_dir:
+                self.remove_image_dir(temp_image_dir, image_files)
+
+    def _choose_image_dpi(self, pdf_doc) -> int:
+        """
+        选择图片提取分辨率
+
+        未启用 PDF_IMAGE_DPI_AUTO 时固定为150；启用后按前几页内嵌图片的宽度中位数选择：
+        低于800像素用100，高于2500像素用200，其余用150
+
+        Args:
+            pdf_doc: 已打开的PDF文档
+
+        Returns:
+            提取图片使用的DPI
+        """
+        if not self.auto_image_dpi:
+            return DEFAULT_IMAGE_DPI
+
+        widths = []
+        for page_index in range(min(DPI_SAMPLE_PAGES, pdf_doc.page_count)):
+            # get_images 返回 (xref, smask, width, height, ...)
+            widths.extend(image[2] for image in pdf_doc[page_index].get_images(full=True))
+        if not widths:
+            return DEFAULT_IMAGE_DPI
+
+        median_width = statistics.median(widths)
+        if median_width < 800:
+            dpi = 100
+        elif median_width > 2500:
+            dpi = 200
+        else:
+            dpi = DEFAULT_IMAGE_DPI
+        self.logger.debug(f"内嵌图片宽度中位数: {median_width}px, 提取分辨率: {dpi} DPI")
+        return dpi
+
+    def _convert_pages(self, content: bytes, pdf_doc, temp_image_dir: Optional[str], dpi: int,
+                       use_ocr: bool = True) -> List[Any]:
+        """
+        解析全部页面，页数较多且配置了多个进程时按连续页分片并行解析
+
+        Args:
+            content: PDF文件内容字节数据（子进程据此打开各自的文档）
+            pdf_doc: 已打开的PDF文档（串行解析使用）
+            temp_image_dir: 临时图片目录（图片文件名含页码，各分片不会冲突），None表示不提取图片
+            dpi: 图片提取分辨率
+            use_ocr: 是否允许PyMuPDF4LLM对需要的页面执行OCR
+
+        Returns:
+            按页顺序排列的分页解析结果
+        """
+        page_count = pdf_doc.page_count
+        if self.parse_workers > 1 and page_count >= max(self.parallel_min_pages, 2):
+            shard_count = min(self.parse_workers, page_count)
+            bounds = [page_count * index // shard_count for index in range(shard_count + 1)]
+            try:
+                executor = _get_shard_executor(self.parse_workers)
+                futures = [
+                    executor.submit(_convert_page_shard, content, list(range(start, end)), temp_image_dir, dpi,
+                                    use_ocr, self.image_format)
+                    for start, end in zip(bounds, bounds[1:])
+                ]
+                markdown_data = []
+                for future in futures:
+                    markdown_data.extend(future.result())
+                self.logger.info(f"PDF分片并行解析完成 - 页数: {page_count}, 分片: {shard_count}")
+                return markdown_data
+            except BrokenProcessPool as e:
+                _reset_shard_executor()
+                self.logger.warning(f"PDF分片解析进程池异常，改为串行解析: {e}")
+            except Exception as e:
+                self.logger.warning(f"PDF分片并行解析失败，改为串行解析: {e}")
+
+        return _to_markdown(pdf_doc, None, temp_image_dir, dpi, use_ocr, self.image_format)
+
+    def _classify_pdf(self, pdf_doc) -> str:
+        """
+        抽样首页、中间页和末页的文本量判断PDF类型
+
+        Args:
+            pdf_doc: 已打开的PDF文档
+
+        Returns:
+            "text"（抽样页均有文本层）、"image"（抽样页均无文本，如扫描件）或 "mixed"
+        """
+        page_count = pdf_doc.page_count
+        if page_count == 0:
+            return "mixed"
+
+        sample_pages = sorted({0, page_count // 2, page_count - 1})
+        text_pages = sum(
+            1 for page_index in sample_pages
+            if len(pdf_doc[page_index].get_text().strip()) >= TEXT_PAGE_MIN_CHARS
+        )
+        if text_pages == len(sample_pages):
+            kind = "text"
+        elif text_pages == 0:
+            kind = "image"
+        else:
+            kind = "mixed"
+        self.logger.debug(f"PDF类型判断: {kind}（抽样页: {sample_pages}）")
+        return kind
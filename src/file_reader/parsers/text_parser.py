@@ -4,8 +4,78 @@
 使用轻量级库，移除langchain_community依赖
 """
 
+import json
+import re
+
 from .base import BaseParser
 from ..models import ParseResult
+from ..utils import decode_text
+
+# 可选依赖：缺失时使用标准库 json 验证JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 行尾空白和3个及以上连续换行：一次扫描中分别删除、压缩为两个换行（未匹配的分组替换为空串）
+_RE_TRAILING_SPACE_OR_BLANK_LINES = re.compile(r'(\n\n)\n+|[ \t]+(?=\n)')
+# 仅行尾空白
+_RE_TRAILING_SPACE = re.compile(r'[ \t]+(?=\n)')
+# RTF控制序列、分组括号和连续空白
+_RE_RTF_CONTROL_WORD = re.compile(r'\\[a-zA-Z]+\d*\s?')
+_RE_RTF_BRACES = re.compile(r'[{}]')
+_RE_WHITESPACE_RUN = re.compile(r'\s+')
+
+
+def _normalize_text(text: str, collapse_blank_lines: bool = True) -> str:
+    """
+    文本基本清理：统一换行符、移除行尾空白，可选地最多保留两个连续换行，并去掉首尾空白
+    
+    不使用通用的normalize_content，因为它会破坏文本的换行格式
+    
+    Args:
+        text: 原始文本
+        collapse_blank_lines: 是否压缩多余空行
+        
+    Returns:
+        清理后的文本
+    """
+    # 大多数文件只用LF换行，先用一次字符查找确认有CR再替换，省去两次整篇复制扫描
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if collapse_blank_lines:
+        text = _RE_TRAILING_SPACE_OR_BLANK_LINES.sub(r'\1', text)
+    else:
+        text = _RE_TRAILING_SPACE.sub('', text)
+    # 末行的行尾空白由 strip 一并移除
+    return text.strip()
+
+
+def _load_json(content: bytes, text: str, encoding: str):
+    """
+    解析JSON，优先使用 orjson 直接解析UTF-8字节
+    
+    Args:
+        content: 原始字节数据
+        text: 解码后的文本
+        encoding: 解码使用的编码
+        
+    Returns:
+        解析后的JSON对象
+        
+    Raises:
+        json.JSONDecodeError: 内容不是有效JSON
+    """
+    if orjson is not None:
+        try:
+            parsed = orjson.loads(content if encoding == 'utf-8' else text)
+            # 元数据只取顶层结构；顶层为标量时交给标准库（orjson 将超过64位的整数解析为浮点数）
+            if isinstance(parsed, (dict, list)):
+                return parsed
+        except orjson.JSONDecodeError:
+            # orjson 不接受 NaN/Infinity、孤立代理项等，由标准库给出最终结论
+            pass
+    return json.loads(text)
 
 
 class TextParser(BaseParser):
@@ -88,40 +158,15 @@ class TextParser(BaseParser):
         try:
             self.logger.info("解析纯文本文件")
             
-            # 尝试多种编码解码
-            text_content = None
-            detected_encoding = 'unknown'
-            
-            # 按优先级尝试编码
-            encodings = ['utf-8', 'gbk', 'gb2312', 'utf-16', 'utf-16le', 'utf-16be', 'latin1', 'cp1252']
-            
-            for encoding in encodings:
-                try:
-                    text_content = content.decode(encoding)
-                    detected_encoding = encoding
-                    self.logger.info(f"成功使用编码 {encoding} 解码文本")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if text_content is None:
-                # 最后的备用方案：使用 errors='ignore' 强制解码
-                text_content = content.decode('utf-8', errors='ignore')
-                detected_encoding = 'utf-8-ignore'
-                self.logger.warning("使用 utf-8 强制解码，可能丢失部分字符")
+            # 检测编码并解码
+            text_content, detected_encoding = decode_text(content)
+            self.logger.info(f"成功使用编码 {detected_encoding} 解码文本")
             
             if not text_content or not text_content.strip():
                 return self._create_error_result("文本文档内容为空")
             
-            # 不使用通用的normalize_content，因为它会破坏文本的换行格式
-            # 只做基本的内容清理
-            import re
-            # 规范化行尾和多余空行
-            text_content = re.sub(r'\r\n', '\n', text_content)  # 统一换行符
-            text_content = re.sub(r'\r', '\n', text_content)    # 处理老式Mac换行符
-            text_content = re.sub(r'\n{3,}', '\n\n', text_content)  # 最多保留两个连续换行
-            text_content = re.sub(r'[ \t]+$', '', text_content, flags=re.MULTILINE)  # 移除行尾空白
-            text_content = text_content.strip()  # 移除首尾空白
+            # 只做基本的内容清理：规范化行尾和多余空行
+            text_content = _normalize_text(text_content)
             
             # 创建元数据
             metadata = {
@@ -151,41 +196,16 @@ class TextParser(BaseParser):
         try:
             self.logger.info(f"开始解析Markdown文档: {file_extension}")
             
-            # 尝试多种编码解码
-            markdown_content = None
-            detected_encoding = 'unknown'
-            
-            # 按优先级尝试编码
-            encodings = ['utf-8', 'gbk', 'gb2312', 'utf-16', 'utf-16le', 'utf-16be', 'latin1', 'cp1252']
-            
-            for encoding in encodings:
-                try:
-                    markdown_content = content.decode(encoding)
-                    detected_encoding = encoding
-                    self.logger.info(f"成功使用编码 {encoding} 解码Markdown")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if markdown_content is None:
-                # 最后的备用方案：使用 errors='ignore' 强制解码
-                markdown_content = content.decode('utf-8', errors='ignore')
-                detected_encoding = 'utf-8-ignore'
-                self.logger.warning("使用 utf-8 强制解码，可能丢失部分字符")
+            # 检测编码并解码
+            markdown_content, detected_encoding = decode_text(content)
+            self.logger.info(f"成功使用编码 {detected_encoding} 解码Markdown")
             
             if not markdown_content or not markdown_content.strip():
                 return self._create_error_result("Markdown文档内容为空")
             
             # 简单的内容规范化（保留Markdown语法）
             # 只做基本的空白字符规范化，不移除Markdown语法
-            import re
-            
-            # 规范化行尾和多余空行
-            markdown_content = re.sub(r'\r\n', '\n', markdown_content)  # 统一换行符
-            markdown_content = re.sub(r'\r', '\n', markdown_content)    # 处理老式Mac换行符
-            markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)  # 最多保留两个连续换行
-            markdown_content = re.sub(r'[ \t]+$', '', markdown_content, flags=re.MULTILINE)  # 移除行尾空白
-            markdown_content = markdown_content.strip()  # 移除首尾空白
+            markdown_content = _normalize_text(markdown_content)
             
             # 创建元数据
             metadata = {
@@ -216,48 +236,24 @@ class TextParser(BaseParser):
         try:
             self.logger.info("解析JSON文件")
             
-            # 尝试多种编码解码
-            json_content = None
-            detected_encoding = 'unknown'
-            
-            # 按优先级尝试编码
-            encodings = ['utf-8', 'gbk', 'gb2312', 'utf-16', 'utf-16le', 'utf-16be', 'latin1', 'cp1252']
-            
-            for encoding in encodings:
-                try:
-                    json_content = content.decode(encoding)
-                    detected_encoding = encoding
-                    self.logger.info(f"成功使用编码 {encoding} 解码JSON")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if json_content is None:
-                # 最后的备用方案：使用 errors='ignore' 强制解码
-                json_content = content.decode('utf-8', errors='ignore')
-                detected_encoding = 'utf-8-ignore'
-                self.logger.warning("使用 utf-8 强制解码，可能丢失部分字符")
+            # 检测编码并解码
+            json_content, detected_encoding = decode_text(content)
+            self.logger.info(f"成功使用编码 {detected_encoding} 解码JSON")
             
             if not json_content or not json_content.strip():
                 return self._create_error_result("JSON文档内容为空")
             
             # 验证JSON格式的有效性
-            import json
             try:
-                parsed_json = json.loads(json_content)
+                parsed_json = _load_json(content, json_content, detected_encoding)
                 self.logger.info("JSON格式验证成功")
             except json.JSONDecodeError as e:
                 self.logger.warning(f"JSON格式验证失败: {e}，将作为纯文本处理")
                 # 如果JSON格式无效，仍然返回原始内容，但在元数据中标记
                 parsed_json = None
             
-            # 简单的内容规范化
-            import re
-            # 规范化行尾和多余空行
-            json_content = re.sub(r'\r\n', '\n', json_content)  # 统一换行符
-            json_content = re.sub(r'\r', '\n', json_content)    # 处理老式Mac换行符
-            json_content = re.sub(r'[ \t]+$', '', json_content, flags=re.MULTILINE)  # 移除行尾空白
-            json_content = json_content.strip()  # 移除首尾空白
+            # 简单的内容规范化：统一换行符并移除行尾空白
+            json_content = _normalize_text(json_content, collapse_blank_lines=False)
             
             # 创建元数据
             metadata = {
@@ -315,7 +311,6 @@ class TextParser(BaseParser):
             
             # 简单的RTF文本提取
             # RTF格式： {\rtf1\ansi ... {text content} ...}
-            import re
             
             # 移除RTF控制字符和格式化代码
             # 保留大括号内的纯文本内容
@@ -323,13 +318,13 @@ class TextParser(BaseParser):
             
             # 基本的RTF解析：提取可读文本
             # 移除反斜杠开头的控制序列
-            rtf_cleaned = re.sub(r'\\[a-zA-Z]+\d*\s?', ' ', rtf_content)
+            rtf_cleaned = _RE_RTF_CONTROL_WORD.sub(' ', rtf_content)
             
             # 移除格式化字符
-            rtf_cleaned = re.sub(r'[{}]', ' ', rtf_cleaned)
+            rtf_cleaned = _RE_RTF_BRACES.sub(' ', rtf_cleaned)
             
             # 清理空白字符
-            rtf_cleaned = re.sub(r'\s+', ' ', rtf_cleaned).strip()
+            rtf_cleaned = _RE_WHITESPACE_RUN.sub(' ', rtf_cleaned).strip()
             
             if not rtf_cleaned:
                 return self._create_error_result("RTF文档中未找到可读文本")
@@ -5,11 +5,13 @@ Office解析器工具模块
 
 __all__ = [
     'DocumentConverter',
+    'PersistentLibreOfficeWorker',
     'PandocConverter', 
     'OfficeImageExtractor',
     'PowerPointTextAnalyzer',
     'ExcelParser',
     'PowerPointParser',
+    'OdfStreamReader',
     'FileManager',
     'FormatChecker',
     'ResultBuilder'
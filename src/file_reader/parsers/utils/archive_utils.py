@@ -3,17 +3,137 @@
 提供各种压缩格式的解包功能，支持安全检查和递归目录遍历
 """
 
+import io
 import os
+import contextlib
+import mmap
+import queue
 import shutil
+import stat
+import threading
 import zipfile
 import tarfile
 import gzip
-from pathlib import Path
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Callable, List, Optional, Dict, Any, BinaryIO, Union
 import tempfile
 
 from ...utils import get_logger
 
+# 可选依赖：isal 基于 ISA-L 的 SIMD 实现解压 gzip，缺失时使用标准库 gzip/zlib
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
+
+# 不小于该大小的成员通过 mmap 直接写入目标文件，小于该大小的TAR成员交给后台线程写出
+MMAP_EXTRACT_MIN_SIZE = 64 * 1024
+
+# 读取压缩数据的缓冲区大小（打开文件与 tarfile 流共用）
+READ_BUFFER_SIZE = 32 * 1024
+
+# 当前进程的有效用户ID（不支持的平台为 None），用于直接根据权限位判断文件可读
+_EUID = os.geteuid() if hasattr(os, 'geteuid') else None
+
+# 普通写出成员时每次读写的块大小：不超过该大小的成员一次写出，更大的成员按块流式写出
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+def _name_suffix(file_name: str) -> str:
+    """取文件名的小写扩展名，规则与 Path.suffix 一致（隐藏文件和以点结尾的名称无扩展名）"""
+    index = file_name.rfind('.')
+    if 0 < index < len(file_name) - 1:
+        return file_name[index:].lower()
+    return ''
+
+
+class _DirCache:
+    """
+    已创建目录缓存
+    
+    同一目录下的成员只在首次遇到时创建目录，之后仅做集合查找，不再发起 mkdir/stat 系统调用；
+    新建目录的各级上级目录一并记录。集合操作在GIL下是原子的，并发时最多重复一次 exist_ok 的 mkdir
+    """
+    
+    def __init__(self, root: Union[str, Path]):
+        self._root = Path(root)
+        self._created = {self._root}
+    
+    def ensure(self, directory: Path):
+        """确保目录存在"""
+        if directory in self._created:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        while directory not in self._created and directory != self._root.parent:
+            self._created.add(directory)
+            directory = directory.parent
+
+
+class _BackgroundWriter:
+    """
+    后台写出线程
+    
+    解压线程只负责读取成员数据，小文件的 open/write/close 交给后台线程，
+    使解压计算与磁盘写入重叠（两者都会释放GIL）；多个写出线程同时处理各自的队列，
+    在网络文件系统等单次文件操作延迟较高的存储上可并发多个写入。
+    同一目标路径总是交给同一个线程，按提交顺序写出，同名成员的较新内容不会被较旧的覆盖；
+    目标文件的父目录由提交方预先创建
+    """
+    
+    def __init__(self, max_pending: int = 64, workers: int = 1):
+        workers = max(1, workers)
+        self._queues: List["queue.Queue"] = [
+            queue.Queue(maxsize=max(1, max_pending // workers)) for _ in range(workers)
+        ]
+        self._error: Optional[BaseException] = None
+        self._threads = [
+            threading.Thread(target=self._run, args=(work_queue,), name=f"archive-writer-{index}", daemon=True)
+            for index, work_queue in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, target: Path, data: bytes):
+        """提交一个待写出的文件，对应线程的队列满时阻塞"""
+        if self._error is not None:
+            raise self._error
+        self._queues[hash(target) % len(self._queues)].put((target, data))
+    
+    def flush(self):
+        """等待已提交的文件全部写出，写出失败时抛出第一个错误"""
+        for work_queue in self._queues:
+            work_queue.join()
+        if self._error is not None:
+            raise self._error
+    
+    def close(self):
+        """等待所有文件写出完成，写出失败时抛出第一个错误"""
+        for work_queue in self._queues:
+            work_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+    
+    def _run(self, work_queue: "queue.Queue"):
+        while True:
+            item = work_queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is not None:
+                    continue
+                target, data = item
+                try:
+                    with open(target, 'wb') as out_file:
+                        out_file.write(data)
+                except BaseException as e:
+                    if self._error is None:
+                        self._error = e
+            finally:
+                work_queue.task_done()
+
 
 class ArchiveExtractor:
     """压缩文件提取器"""
@@ -28,6 +148,19 @@ class ArchiveExtractor:
         self.max_file_count = int(os.getenv("ARCHIVE_MAX_FILES_LIMIT", "1000"))  # 最大文件数
         self.extract_timeout = int(os.getenv("ARCHIVE_EXTRACT_TIMEOUT", "300"))  # 5分钟超时
         
+        # 较大成员使用 mmap 写出（仅 POSIX）
+        self.use_mmap_extract = (
+            os.name == 'posix'
+            and os.getenv("ARCHIVE_USE_MMAP_EXTRACT", "true").lower() in ("true", "1")
+        )
+        
+        # 顺序格式（TAR系列）的小文件交给后台线程写出
+        self.background_write = os.getenv("ARCHIVE_BACKGROUND_WRITE", "true").lower() in ("true", "1")
+        self.write_workers = int(os.getenv("ARCHIVE_WRITE_WORKERS", "4"))
+        
+        # 非固实压缩格式的成员并行解压线程数（zlib/lzma 解压时释放GIL），1 表示串行
+        self.extract_workers = int(os.getenv("ARCHIVE_EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1))))
+        
         # 支持的压缩格式映射
         self.extraction_methods = {
             '.zip': self._extract_zip,
@@ -70,8 +203,10 @@ class ArchiveExtractor:
             # 默认
             'default': '📄'
         }
+        self._default_icon = self.file_type_icons['default']
 
-    def extract_archive(self, archive_path: str, extract_path: str, file_extension: str) -> List[Path]:
+    def extract_archive(self, archive_path: str, extract_path: str, file_extension: str,
+                        sizes: Optional[Dict[Path, int]] = None) -> List[Path]:
         """
         根据文件扩展名提取压缩文件
         
@@ -79,17 +214,59 @@ class ArchiveExtractor:
             archive_path: 压缩文件路径
             extract_path: 解压目标路径
             file_extension: 文件扩展名
+            sizes: 可选，传入时填充每个提取文件的大小（字节），调用方无需再次stat
             
         Returns:
             提取的文件路径列表
         """
-        try:
-            self.logger.info(f"开始解压缩文件: {archive_path} -> {extract_path}")
+        self.logger.info(f"开始解压缩文件: {archive_path} -> {extract_path}")
+        
+        # 安全检查
+        if not self._check_archive_safety(archive_path):
+            raise Exception("压缩文件安全检查失败")
+        
+        return self._run_extraction(archive_path, extract_path, file_extension, sizes)
+
+    def extract_archive_stream(self, buf: BinaryIO, extract_path: str, file_extension: str,
+                               sizes: Optional[Dict[Path, int]] = None) -> List[Path]:
+        """
+        从可寻址的字节流（如 io.BytesIO）提取压缩文件，无需先写入临时文件
+        
+        Args:
+            buf: 压缩文件字节流
+            extract_path: 解压目标路径
+            file_extension: 文件扩展名
+            sizes: 可选，传入时填充每个提取文件的大小（字节），调用方无需再次stat
             
-            # 安全检查
-            if not self._check_archive_safety(archive_path):
-                raise Exception("压缩文件安全检查失败")
+        Returns:
+            提取的文件路径列表
+        """
+        self.logger.info(f"开始解压缩内存数据: {file_extension} -> {extract_path}")
+        
+        # 安全检查（流中只能检查大小）
+        size = buf.seek(0, os.SEEK_END)
+        buf.seek(0)
+        if size > self.max_file_size:
+            self.logger.warning(f"压缩文件过大: {size} > {self.max_file_size}")
+            raise Exception("压缩文件安全检查失败")
+        
+        return self._run_extraction(buf, extract_path, file_extension, sizes)
+
+    def _run_extraction(self, source: Union[str, BinaryIO], extract_path: str, 
+                        file_extension: str, sizes: Optional[Dict[Path, int]] = None) -> List[Path]:
+        """
+        执行解压并做解压后安全检查，失败时清理解压目录
+        
+        Args:
+            source: 压缩文件路径或字节流
+            extract_path: 解压目标路径
+            file_extension: 文件扩展名
+            sizes: 可选，传入时填充每个提取文件的大小
             
+        Returns:
+            提取的文件路径列表
+        """
+        try:
             # 创建解压目录
             os.makedirs(extract_path, exist_ok=True)
             
@@ -99,11 +276,14 @@ class ArchiveExtractor:
                 raise Exception(f"不支持的压缩格式: {file_extension}")
             
             # 执行解压
-            extracted_files = extraction_method(archive_path, extract_path)
+            extracted_files = extraction_method(source, extract_path)
             
-            # 后续安全检查
-            if not self._check_extracted_files_safety(extracted_files):
+            # 后续安全检查（每个文件只stat一次，结果供调用方复用）
+            file_sizes = self.get_file_sizes(extracted_files)
+            if not self._check_extracted_files_safety(extracted_files, file_sizes):
                 raise Exception("解压文件安全检查失败")
+            if sizes is not None:
+                sizes.update(file_sizes)
             
             self.logger.info(f"解压成功，提取了 {len(extracted_files)} 个文件")
             return extracted_files
@@ -115,28 +295,54 @@ class ArchiveExtractor:
                 shutil.rmtree(extract_path, ignore_errors=True)
             raise
 
-    def _extract_zip(self, archive_path: str, extract_path: str) -> List[Path]:
-        """提取ZIP文件"""
+    def _extract_zip(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
+        """提取ZIP文件（支持路径或字节流）"""
         extracted_files = []
         
         try:
-            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                # 检查ZIP文件信息
-                file_count = len(zip_ref.namelist())
+            with zipfile.ZipFile(source, 'r') as zip_ref:
+                # 检查ZIP文件信息（数量、总大小与安全成员在同一遍中得到）
+                infos = zip_ref.infolist()
+                file_count = len(infos)
                 if file_count > self.max_file_count:
                     raise Exception(f"ZIP文件包含过多文件: {file_count} > {self.max_file_count}")
                 
-                total_size = sum(info.file_size for info in zip_ref.filelist)
+                is_safe = self._make_safety_checker(extract_path)
+                total_size = 0
+                members = []
+                for info in infos:
+                    total_size += info.file_size
+                    if is_safe(info.filename):
+                        members.append(info)
                 if total_size > self.max_extracted_size:
                     raise Exception(f"ZIP解压后大小过大: {total_size} > {self.max_extracted_size}")
                 
+                # 同名成员只保留最后一个（与逐个解压时后者覆盖前者的结果一致），
+                # 保证并行解压时不会有两个线程同时写出（截断并 mmap）同一目标文件
+                members = list({os.path.normpath(info.filename): info for info in members}.values())
+                
+                dirs = _DirCache(extract_path)
+                serial_members = members
+                reopenable = isinstance(source, str) or hasattr(source, 'getvalue')
+                if reopenable and self.can_extract_parallel('.zip') and len(members) > 1:
+                    # 含 .. 或绝对路径的成员由 zipfile.extract 改写路径并自行创建目录，
+                    # 改写后可能与其他成员重名，并发执行时 makedirs 也会冲突，因此在并行部分完成后串行提取
+                    parallel_members = [info for info in members if self._is_plain_member_path(info.filename)]
+                    serial_members = [info for info in members if not self._is_plain_member_path(info.filename)]
+                    if parallel_members:
+                        self._extract_zip_parallel(source, parallel_members, extract_path, dirs)
+                
                 # 逐个提取文件
-                for member in zip_ref.namelist():
-                    if self._is_safe_path(member, extract_path):
-                        zip_ref.extract(member, extract_path)
-                        extracted_file = Path(extract_path) / member
-                        if extracted_file.is_file():
-                            extracted_files.append(extracted_file)
+                for info in serial_members:
+                    self._extract_zip_member(zip_ref, info, extract_path, dirs)
+                
+                # 普通路径的非目录成员已按原路径写出，直接收集无需stat；其余由 zipfile 改写过路径，需确认文件存在
+                for info in members:
+                    if info.is_dir():
+                        continue
+                    extracted_file = Path(extract_path) / info.filename
+                    if self._is_plain_member_path(info.filename) or extracted_file.is_file():
+                        extracted_files.append(extracted_file)
                 
         except zipfile.BadZipFile:
             raise Exception("损坏的ZIP文件")
@@ -145,8 +351,85 @@ class ArchiveExtractor:
         
         return extracted_files
 
-    def _extract_rar(self, archive_path: str, extract_path: str) -> List[Path]:
-        """提取RAR文件"""
+    def can_extract_parallel(self, file_extension: str) -> bool:
+        """
+        判断压缩格式是否可以按成员并行解压
+        
+        只有各成员独立压缩、可随机访问的格式（ZIP）才能并行；
+        TAR 系列是单一压缩流，7Z 通常为固实压缩，只能顺序解压
+        """
+        return self.extract_workers > 1 and file_extension.lower() == '.zip'
+
+    def _extract_zip_member(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, extract_path: str,
+                            dirs: _DirCache):
+        """
+        提取单个ZIP成员，较大的成员通过 mmap 写出
+        
+        普通相对路径的成员直接写到解压目录下，目录通过缓存只创建一次（ZipFile.extract 每个成员
+        都会检查并创建父目录）；含 .. 或绝对路径的成员交给库自带的 extract 规范化路径
+        """
+        if not self._is_plain_member_path(info.filename):
+            zip_ref.extract(info, extract_path)
+            return
+        
+        target = Path(extract_path) / info.filename
+        if info.is_dir():
+            dirs.ensure(target)
+            return
+        
+        dirs.ensure(target.parent)
+        with zip_ref.open(info) as src:
+            if self._can_mmap_extract(info.filename, info.file_size):
+                self._write_member_mmap(src, target, info.file_size)
+            else:
+                self._write_member(src, target)
+
+    def _extract_zip_parallel(self, source: Union[str, BinaryIO], members: List[zipfile.ZipInfo], 
+                              extract_path: str, dirs: _DirCache):
+        """
+        多线程并行提取ZIP成员
+        
+        每个工作线程打开各自的 ZipFile 句柄，避免共享文件位置；
+        字节流通过共享同一 bytes 对象的 BytesIO 复制句柄，不复制数据
+        """
+        # 先串行创建目录，避免并行 extract 创建同一父目录时冲突；共享同一父目录的成员只创建一次
+        for info in members:
+            target = Path(extract_path) / info.filename
+            dirs.ensure(target if info.is_dir() else target.parent)
+        
+        data = source if isinstance(source, str) else source.getvalue()
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+        
+        def extract(info: zipfile.ZipInfo):
+            zip_ref = getattr(local, 'zip_ref', None)
+            if zip_ref is None:
+                zip_ref = local.zip_ref = zipfile.ZipFile(data if isinstance(data, str) else io.BytesIO(data))
+                with handles_lock:
+                    handles.append(zip_ref)
+            self._extract_zip_member(zip_ref, info, extract_path, dirs)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.extract_workers, len(members))) as executor:
+                # 消费结果以便重新抛出工作线程中的异常
+                list(executor.map(extract, members))
+        finally:
+            for zip_ref in handles:
+                zip_ref.close()
+
+    def _extract_rar(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
+        """提取RAR文件（字节流会先写入临时文件，unrar 工具只能读取文件）"""
+        if not isinstance(source, str):
+            fd, temp_path = tempfile.mkstemp(suffix='.rar')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    shutil.copyfileobj(source, temp_file)
+                return self._extract_rar(temp_path, extract_path)
+            finally:
+                os.unlink(temp_path)
+        
+        archive_path = source
         extracted_files = []
         
         try:
@@ -162,8 +445,9 @@ class ArchiveExtractor:
                     raise Exception(f"RAR文件包含过多文件: {file_count} > {self.max_file_count}")
                 
                 # 逐个提取文件
+                is_safe = self._make_safety_checker(extract_path, follow_symlinks=True)
                 for member in rar_ref.namelist():
-                    if self._is_safe_path(member, extract_path):
+                    if is_safe(member):
                         rar_ref.extract(member, extract_path)
                         extracted_file = Path(extract_path) / member
                         if extracted_file.is_file():
@@ -176,8 +460,8 @@ class ArchiveExtractor:
         
         return extracted_files
 
-    def _extract_7z(self, archive_path: str, extract_path: str) -> List[Path]:
-        """提取7Z文件"""
+    def _extract_7z(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
+        """提取7Z文件（支持路径或字节流）"""
         extracted_files = []
         
         try:
@@ -186,20 +470,25 @@ class ArchiveExtractor:
             raise Exception("缺少py7zr库，请安装: pip install py7zr")
         
         try:
-            with py7zr.SevenZipFile(archive_path, mode='r') as archive:
-                # 检查7Z文件信息
-                file_count = len(archive.getnames())
+            with py7zr.SevenZipFile(source, mode='r') as archive:
+                # 检查7Z文件信息（成员列表只读取一次，数量、大小和类型均取自头部信息）
+                infos = archive.list()
+                file_count = len(infos)
                 if file_count > self.max_file_count:
                     raise Exception(f"7Z文件包含过多文件: {file_count} > {self.max_file_count}")
                 
+                total_size = sum(info.uncompressed or 0 for info in infos)
+                if total_size > self.max_extracted_size:
+                    raise Exception(f"7Z解压后大小过大: {total_size} > {self.max_extracted_size}")
+                
                 # 提取所有文件
                 archive.extractall(path=extract_path)
                 
-                # 收集提取的文件
-                for member in archive.getnames():
-                    extracted_file = Path(extract_path) / member
-                    if extracted_file.is_file() and self._is_safe_path(member, extract_path):
-                        extracted_files.append(extracted_file)
+                # 按头部信息收集提取的文件，无需逐个stat
+                is_safe = self._make_safety_checker(extract_path, follow_symlinks=True)
+                for info in infos:
+                    if not info.is_directory and is_safe(info.filename):
+                        extracted_files.append(Path(extract_path) / info.filename)
                 
         except py7zr.Bad7zFile:
             raise Exception("损坏的7Z文件")
@@ -208,55 +497,120 @@ class ArchiveExtractor:
         
         return extracted_files
 
-    def _extract_tar(self, archive_path: str, extract_path: str) -> List[Path]:
+    def _extract_tar(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
         """提取TAR文件"""
-        return self._extract_tar_generic(archive_path, extract_path, 'r')
+        return self._extract_tar_generic(source, extract_path, 'r')
 
-    def _extract_tar_gz(self, archive_path: str, extract_path: str) -> List[Path]:
+    def _extract_tar_gz(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
         """提取TAR.GZ文件"""
-        return self._extract_tar_generic(archive_path, extract_path, 'r:gz')
+        return self._extract_tar_generic(source, extract_path, 'r:gz')
 
-    def _extract_tar_bz2(self, archive_path: str, extract_path: str) -> List[Path]:
+    def _extract_tar_bz2(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
         """提取TAR.BZ2文件"""
-        return self._extract_tar_generic(archive_path, extract_path, 'r:bz2')
+        return self._extract_tar_generic(source, extract_path, 'r:bz2')
 
-    def _extract_tar_generic(self, archive_path: str, extract_path: str, mode: str) -> List[Path]:
-        """通用TAR文件提取方法"""
+    def _extract_tar_generic(self, source: Union[str, BinaryIO], extract_path: str, mode: str) -> List[Path]:
+        """
+        通用TAR文件提取方法
+        
+        以流式模式（r|gz 等）打开，边解压边提取，只顺序读取一遍；
+        成员数在遍历过程中检查，超限时中止（已提取的文件由调用方清理）
+        """
         extracted_files = []
         
         try:
-            with tarfile.open(archive_path, mode) as tar_ref:
-                # 检查TAR文件信息
-                file_count = len(tar_ref.getnames())
-                if file_count > self.max_file_count:
-                    raise Exception(f"TAR文件包含过多文件: {file_count} > {self.max_file_count}")
+            # 路径与内存字节流统一按流式模式（r|gz 等）顺序读取一遍
+            with contextlib.ExitStack() as stack:
+                fileobj = stack.enter_context(self._open_source(source))
+                compression = mode.partition(':')[2]
+                if compression == 'gz' and igzip is not None:
+                    # 由 ISA-L 解压，tarfile 只读取解压后的无压缩流
+                    fileobj = stack.enter_context(igzip.open(fileobj, 'rb'))
+                    compression = ''
+                tar_ref = tarfile.open(fileobj=fileobj, mode='r|' + compression,
+                                       bufsize=READ_BUFFER_SIZE)
                 
-                # 逐个提取文件
-                for member in tar_ref.getmembers():
-                    if member.isfile() and self._is_safe_path(member.name, extract_path):
-                        tar_ref.extract(member, extract_path)
-                        extracted_file = Path(extract_path) / member.name
-                        extracted_files.append(extracted_file)
+                writer = _BackgroundWriter(workers=self.write_workers) if self.background_write else None
+                dirs = _DirCache(extract_path)
+                is_safe = self._make_safety_checker(extract_path)
+                targets = set()
+                try:
+                    with tar_ref:
+                        file_count = 0
+                        for member in tar_ref:
+                            # 检查TAR文件信息
+                            file_count += 1
+                            if file_count > self.max_file_count:
+                                raise Exception(f"TAR文件包含过多文件: {file_count} > {self.max_file_count}")
+                        
+                            if member.isfile() and is_safe(member.name):
+                                target = Path(extract_path) / member.name
+                                use_mmap = self._can_mmap_extract(member.name, member.size)
+                                plain = self._is_plain_member_path(member.name)
+                                # 只有小文件整块读入内存交给后台写出，队列占用的内存不超过 64 × MMAP_EXTRACT_MIN_SIZE；
+                                # 未启用 mmap 时较大的成员在当前线程按块写出
+                                background = (writer is not None and plain and not use_mmap
+                                              and member.size < MMAP_EXTRACT_MIN_SIZE)
+                                
+                                # 同名成员以最后一个为准；目标已出现过且本次在当前线程写出时，先等后台写出完成，
+                                # 避免后台线程截断正在 mmap 写入的文件（SIGBUS）或覆盖较新的内容
+                                target_key = os.path.normpath(target)
+                                duplicate = target_key in targets
+                                if duplicate and writer is not None and not background:
+                                    writer.flush()
+                                targets.add(target_key)
+                                
+                                if use_mmap:
+                                    dirs.ensure(target.parent)
+                                    with tar_ref.extractfile(member) as src:
+                                        self._write_member_mmap(src, target, member.size)
+                                elif background:
+                                    dirs.ensure(target.parent)
+                                    with tar_ref.extractfile(member) as src:
+                                        writer.submit(target, src.read())
+                                elif plain:
+                                    dirs.ensure(target.parent)
+                                    with tar_ref.extractfile(member) as src:
+                                        # tarfile.extract 按16KB块复制，这里整块或按1MB块写出
+                                        self._write_member(src, target)
+                                else:
+                                    tar_ref.extract(member, extract_path)
+                                if not duplicate:
+                                    extracted_files.append(target)
+                except BaseException:
+                    # 已有异常（如文件数超限）在传播时，后台写出的错误只记录，不覆盖原异常
+                    if writer is not None:
+                        try:
+                            writer.close()
+                        except BaseException as e:
+                            self.logger.warning(f"后台写出失败: {e}")
+                    raise
+                else:
+                    if writer is not None:
+                        writer.close()
                 
-        except tarfile.TarError:
+        except (tarfile.TarError, gzip.BadGzipFile, EOFError):
             raise Exception("损坏的TAR文件")
         except Exception as e:
             raise Exception(f"TAR解压失败: {e}")
         
         return extracted_files
 
-    def _extract_gz(self, archive_path: str, extract_path: str) -> List[Path]:
+    def _extract_gz(self, source: Union[str, BinaryIO], extract_path: str) -> List[Path]:
         """提取GZ文件（单文件压缩）"""
         extracted_files = []
         
         try:
-            # GZ文件通常是单文件压缩
-            filename = Path(archive_path).stem  # 去掉.gz扩展名
+            # GZ文件通常是单文件压缩，输出文件名取自压缩文件名（去掉.gz扩展名）
+            if isinstance(source, str):
+                filename = Path(source).stem
+            else:
+                filename = Path(getattr(source, 'name', None) or 'archive.gz').stem
             output_path = Path(extract_path) / filename
             
-            with gzip.open(archive_path, 'rb') as gz_file:
-                with open(output_path, 'wb') as out_file:
-                    shutil.copyfileobj(gz_file, out_file)
+            gzip_module = igzip or gzip
+            with self._open_source(source) as fileobj, gzip_module.open(fileobj, 'rb') as gz_file:
+                self._write_member(gz_file, output_path)
             
             extracted_files.append(output_path)
             
@@ -265,40 +619,121 @@ class ArchiveExtractor:
         
         return extracted_files
 
-    def _is_safe_path(self, path: str, base_path: str) -> bool:
+    def _open_source(self, source: Union[str, BinaryIO]):
         """
-        检查路径是否安全（防止路径遍历攻击）
+        打开压缩数据源，返回上下文管理器
+        
+        路径按 READ_BUFFER_SIZE 缓冲打开，并提示内核将顺序读取以加大预读；内存字节流本身即可直接读取，
+        不再套一层缓冲，也不在退出时关闭调用方传入的对象
+        """
+        if isinstance(source, str):
+            fileobj = open(source, 'rb', buffering=READ_BUFFER_SIZE)
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(fileobj.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            return fileobj
+        return contextlib.nullcontext(source)
+
+    def _can_mmap_extract(self, member_name: str, size: int) -> bool:
+        """
+        判断成员是否使用 mmap 写出
+        
+        只处理足够大、且路径为普通相对路径的成员；含 .. 或绝对路径的成员
+        交给库自带的 extract 处理其路径规范化
+        """
+        if not self.use_mmap_extract or size < MMAP_EXTRACT_MIN_SIZE:
+            return False
+        return self._is_plain_member_path(member_name)
+
+    def _is_plain_member_path(self, member_name: str) -> bool:
+        """成员路径是否为普通相对路径（不含 .. 且非绝对路径），可直接拼接到解压目录下写出"""
+        member_path = PurePosixPath(member_name)
+        return not member_path.is_absolute() and '..' not in member_path.parts
+
+    def _write_member(self, src: BinaryIO, target: Path):
+        """
+        将成员数据写入目标文件
+        
+        按 WRITE_CHUNK_SIZE 读写，较小的成员只需一次 read 和一次 write
+        
+        Args:
+            src: 成员数据流
+            target: 目标文件路径（父目录由调用方创建）
+        """
+        with open(target, 'wb') as out_file:
+            shutil.copyfileobj(src, out_file, WRITE_CHUNK_SIZE)
+
+    def _write_member_mmap(self, src: BinaryIO, target: Path, size: int):
+        """
+        通过 mmap 将成员数据直接解压写入目标文件
+        
+        先按声明大小截断文件，再用 readinto 把解压数据读入映射区，省去 write 的用户态缓冲拷贝
+        
+        Args:
+            src: 成员数据流
+            target: 目标文件路径（父目录由调用方创建）
+            size: 成员声明的解压后大小
+        """
+        with open(target, 'w+b') as out:
+            out.truncate(size)
+            with mmap.mmap(out.fileno(), size) as mm:
+                offset = 0
+                while offset < size:
+                    with memoryview(mm)[offset:] as chunk:
+                        n = src.readinto(chunk)
+                    if not n:
+                        raise Exception(f"成员数据不完整: {target.name}")
+                    offset += n
+        
+        # 读到结尾以触发库的完整性校验（如ZIP的CRC），并拒绝超出声明大小的数据
+        if src.read(1):
+            raise Exception(f"成员数据超出声明大小: {target.name}")
+
+    def _make_safety_checker(self, base_path: str, follow_symlinks: bool = False) -> Callable[[str], bool]:
+        """
+        创建成员路径安全检查函数（防止路径遍历攻击）
+        
+        基础路径只解析一次，每个成员只做字符串规范化与前缀比较，不再逐个 resolve；
+        ZIP/TAR 提取不会创建符号链接，按字符串规范化即可，RAR/7Z 可能解出符号链接，需设置 follow_symlinks
         
         Args:
-            path: 要检查的路径
             base_path: 基础路径
+            follow_symlinks: 是否解析成员路径中的符号链接
             
         Returns:
-            是否安全
+            接受成员路径、返回是否安全的函数
         """
-        try:
-            # 规范化路径
-            full_path = Path(base_path) / path
-            resolved_path = full_path.resolve()
-            base_resolved = Path(base_path).resolve()
-            
-            # 检查是否在基础路径内
-            return str(resolved_path).startswith(str(base_resolved))
-            
-        except Exception:
-            return False
+        base_prefix = os.path.join(os.path.realpath(base_path), '')
+        normalize = os.path.realpath if follow_symlinks else os.path.normpath
+        
+        def is_safe(path: str) -> bool:
+            try:
+                return normalize(os.path.join(base_prefix, path)).startswith(base_prefix)
+            except Exception:
+                return False
+        
+        return is_safe
 
     def _check_archive_safety(self, archive_path: str) -> bool:
-        """检查压缩文件安全性"""
+        """检查压缩文件安全性（只stat一次，大小、类型与可读性均取自同一结果）"""
         try:
+            try:
+                st = os.stat(archive_path)
+            except FileNotFoundError:
+                self.logger.warning(f"压缩文件不存在或不可读: {archive_path}")
+                return False
+            
             # 检查文件大小
-            file_size = os.path.getsize(archive_path)
-            if file_size > self.max_file_size:
-                self.logger.warning(f"压缩文件过大: {file_size} > {self.max_file_size}")
+            if st.st_size > self.max_file_size:
+                self.logger.warning(f"压缩文件过大: {st.st_size} > {self.max_file_size}")
                 return False
             
-            # 检查文件是否存在且可读
-            if not os.path.exists(archive_path) or not os.access(archive_path, os.R_OK):
+            # 检查是否为可读的普通文件：属主为当前用户且有读权限时直接通过，其余情况交给 os.access 判断
+            readable = (_EUID is not None and st.st_uid == _EUID and st.st_mode & stat.S_IRUSR) \
+                or os.access(archive_path, os.R_OK)
+            if not stat.S_ISREG(st.st_mode) or not readable:
                 self.logger.warning(f"压缩文件不存在或不可读: {archive_path}")
                 return False
             
@@ -308,8 +743,27 @@ class ArchiveExtractor:
             self.logger.warning(f"压缩文件安全检查失败: {e}")
             return False
 
-    def _check_extracted_files_safety(self, extracted_files: List[Path]) -> bool:
-        """检查解压文件安全性"""
+    def get_file_sizes(self, files: List[Path]) -> Dict[Path, int]:
+        """
+        获取文件大小，每个文件只stat一次，不存在的文件跳过
+        
+        Args:
+            files: 文件列表
+            
+        Returns:
+            文件路径到大小（字节）的映射
+        """
+        sizes = {}
+        for file_path in files:
+            try:
+                sizes[file_path] = file_path.stat().st_size
+            except OSError:
+                continue
+        return sizes
+
+    def _check_extracted_files_safety(self, extracted_files: List[Path], 
+                                      sizes: Optional[Dict[Path, int]] = None) -> bool:
+        """检查解压文件安全性（sizes 为已获取的文件大小，省略时重新stat）"""
         try:
             # 检查文件数量
             if len(extracted_files) > self.max_file_count:
@@ -317,7 +771,9 @@ class ArchiveExtractor:
                 return False
             
             # 检查总大小
-            total_size = sum(f.stat().st_size for f in extracted_files if f.exists())
+            if sizes is None:
+                sizes = self.get_file_sizes(extracted_files)
+            total_size = sum(sizes.values())
             if total_size > self.max_extracted_size:
                 self.logger.warning(f"解压文件总大小过大: {total_size} > {self.max_extracted_size}")
                 return False
@@ -338,8 +794,19 @@ class ArchiveExtractor:
         Returns:
             文件图标字符串
         """
-        file_extension = file_path.suffix.lower()
-        return self.file_type_icons.get(file_extension, self.file_type_icons['default'])
+        return self.get_icon_by_name(file_path.name)
+
+    def get_icon_by_name(self, file_name: str) -> str:
+        """
+        根据文件名获取对应的图标（已有文件名字符串时使用，无需构造Path）
+        
+        Args:
+            file_name: 文件名
+            
+        Returns:
+            文件图标字符串
+        """
+        return self.file_type_icons.get(_name_suffix(file_name), self._default_icon)
 
     def generate_file_tree_text(self, files: List[Path], base_path: str) -> str:
         """
@@ -353,59 +820,65 @@ class ArchiveExtractor:
             文件树文本
         """
         try:
-            # 按路径排序文件
-            sorted_files = sorted(files, key=lambda x: str(x.relative_to(base_path)))
-            
-            # 构建目录结构
-            tree_lines = []
-            dirs_processed = set()
+            # 按相对路径字符串排序后构建目录树（嵌套字典，目录为dict、文件为Path），
+            # 同一目录下的路径在排序结果中相邻，按插入顺序输出即与逐个文件输出的顺序一致
+            base = Path(base_path)
+            entries = []
+            for file_path in files:
+                relative_path = file_path.relative_to(base)
+                entries.append((str(relative_path), relative_path.parts, file_path))
+            entries.sort(key=lambda entry: entry[0])
             
-            for file_path in sorted_files:
-                relative_path = file_path.relative_to(base_path)
-                parts = relative_path.parts
-                
-                # 处理目录层级
-                for i, part in enumerate(parts[:-1]):  # 除了文件名本身
-                    dir_path = Path(*parts[:i+1])
-                    if dir_path not in dirs_processed:
-                        indent = "│   " * i + "├── "
-                        tree_lines.append(f"{indent}📁 {part}/")
-                        dirs_processed.add(dir_path)
-                
-                # 处理文件
-                indent = "│   " * (len(parts) - 1) + "├── "
-                icon = self.get_file_icon(file_path)
-                file_name = parts[-1]
-                tree_lines.append(f"{indent}{icon} {file_name}")
+            root = {}
+            for _, parts, file_path in entries:
+                node = root
+                for part in parts[:-1]:
+                    node = node.setdefault(part, {})
+                node[parts[-1]] = file_path
             
+            tree_lines = []
+            self._render_file_tree(root, 0, tree_lines)
             return "\n".join(tree_lines)
             
         except Exception as e:
             self.logger.warning(f"生成文件树失败: {e}")
             return "无法生成文件树"
 
-    def get_archive_stats(self, files: List[Path], archive_size: int) -> Dict[str, Any]:
+    def _render_file_tree(self, node: Dict[str, Any], depth: int, tree_lines: List[str]):
+        """深度优先输出目录树节点"""
+        indent = "│   " * depth + "├── "
+        for name, child in node.items():
+            if isinstance(child, dict):
+                tree_lines.append(f"{indent}📁 {name}/")
+                self._render_file_tree(child, depth + 1, tree_lines)
+            else:
+                tree_lines.append(f"{indent}{self.get_icon_by_name(name)} {name}")
+
+    def get_archive_stats(self, files: List[Path], archive_size: int, 
+                          sizes: Optional[Dict[Path, int]] = None) -> Dict[str, Any]:
         """
         获取压缩包统计信息
         
         Args:
             files: 文件列表
             archive_size: 压缩包大小
+            sizes: 已获取的文件大小，省略时重新stat
             
         Returns:
             统计信息字典
         """
         try:
-            total_size = sum(f.stat().st_size for f in files if f.exists())
+            if sizes is None:
+                sizes = self.get_file_sizes(files)
             file_count = len(files)
             
-            # 按类型统计
+            # 总大小与按类型统计在同一遍中完成
+            total_size = 0
             type_stats = {}
             for file_path in files:
-                ext = file_path.suffix.lower()
-                if ext not in type_stats:
-                    type_stats[ext] = 0
-                type_stats[ext] += 1
+                total_size += sizes.get(file_path, 0)
+                ext = _name_suffix(file_path.name)
+                type_stats[ext] = type_stats.get(ext, 0) + 1
             
             return {
                 'file_count': file_count,
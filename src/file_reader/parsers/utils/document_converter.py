@@ -5,13 +5,36 @@
 
 import tempfile
 import subprocess
-import shlex
 import os
 from pathlib import Path
 from typing import Optional
 import shutil
 
 from ...utils import get_logger
+from .libreoffice_worker import get_libreoffice_worker
+
+# 依次尝试的LibreOffice命令名称
+LIBREOFFICE_COMMANDS = (
+    'libreoffice', 
+    'soffice', 
+    '/Applications/LibreOffice.app/Contents/MacOS/soffice'
+)
+
+# 已解析的LibreOffice可执行文件路径（None 表示尚未查找）
+_libreoffice_path: Optional[str] = None
+
+
+def find_libreoffice() -> Optional[str]:
+    """
+    按 LIBREOFFICE_COMMANDS 顺序查找可用的LibreOffice可执行文件，找到后缓存
+    
+    Returns:
+        可执行文件的绝对路径，未安装时返回None（下次调用重新查找）
+    """
+    global _libreoffice_path
+    if _libreoffice_path is None:
+        _libreoffice_path = next(filter(None, map(shutil.which, LIBREOFFICE_COMMANDS)), None)
+    return _libreoffice_path
 
 
 class DocumentConverter:
@@ -20,6 +43,10 @@ class DocumentConverter:
     def __init__(self):
         """初始化文档转换器"""
         self.logger = get_logger("document_converter")
+        
+        # 启用时复用常驻LibreOffice进程，首次转换时才启动
+        lo_cmd = find_libreoffice()
+        self.libreoffice_worker = get_libreoffice_worker((lo_cmd,) if lo_cmd else LIBREOFFICE_COMMANDS)
 
     def convert_old_format_with_libreoffice(self, file_path: str, file_extension: str) -> Optional[str]:
         """
@@ -46,60 +73,44 @@ class DocumentConverter:
             
             self.logger.info(f"使用LibreOffice转换 {file_extension} -> {target_format}")
             
+            if self.libreoffice_worker is not None:
+                converted_file = self._convert_with_worker(file_path, target_format)
+                if converted_file:
+                    return converted_file
+            
+            lo_cmd = find_libreoffice()
+            if lo_cmd is None:
+                raise Exception("未找到可用的LibreOffice命令")
+            
             # 创建临时输出目录
             with tempfile.TemporaryDirectory() as temp_dir:
-                # LibreOffice命令行转换，使用shlex.quote()防止命令注入
-                # 对文件路径和输出目录进行安全转义
-                safe_file_path = shlex.quote(os.path.abspath(file_path))
-                safe_temp_dir = shlex.quote(os.path.abspath(temp_dir))
-                
+                # LibreOffice命令行转换，参数列表直接传给进程，路径原样传入；
+                # 每次转换使用独立的用户配置目录，并发转换不会交给已运行的实例处理，可以同时执行
+                profile_dir = Path(os.path.abspath(temp_dir)) / 'profile'
                 cmd = [
-                    'libreoffice',
+                    lo_cmd,
                     '--headless',
+                    f'-env:UserInstallation={profile_dir.as_uri()}',
                     '--convert-to', target_format,
-                    '--outdir', safe_temp_dir,
-                    safe_file_path
+                    '--outdir', os.path.abspath(temp_dir),
+                    os.path.abspath(file_path)
                 ]
                 
-                # 尝试不同的LibreOffice命令名称
-                libreoffice_commands = [
-                    'libreoffice', 
-                    'soffice', 
-                    '/Applications/LibreOffice.app/Contents/MacOS/soffice'
-                ]
+                self.logger.debug(f"使用命令: {' '.join(cmd)}")
                 
-                conversion_success = False
-                for lo_cmd in libreoffice_commands:
-                    try:
-                        cmd[0] = lo_cmd
-                        self.logger.debug(f"尝试使用命令: {' '.join(cmd)}")
-                        
-                        result = subprocess.run(
-                            cmd,
-                            capture_output=True,
-                            text=True,
-                            timeout=120  # 2分钟超时
-                        )
-                        
-                        if result.returncode == 0:
-                            conversion_success = True
-                            self.logger.info(f"LibreOffice转换成功，使用命令: {lo_cmd}")
-                            break
-                        else:
-                            self.logger.debug(f"命令 {lo_cmd} 失败: {result.stderr}")
-                    
-                    except FileNotFoundError:
-                        self.logger.debug(f"命令 {lo_cmd} 未找到")
-                        continue
-                    except subprocess.TimeoutExpired:
-                        self.logger.warning(f"LibreOffice转换超时: {lo_cmd}")
-                        continue
-                    except Exception as e:
-                        self.logger.debug(f"命令 {lo_cmd} 执行异常: {e}")
-                        continue
+                try:
+                    result = subprocess.run(
+                        cmd,
+                        capture_output=True,
+                        text=True,
+                        timeout=120  # 2分钟超时
+                    )
+                except subprocess.TimeoutExpired:
+                    raise Exception(f"LibreOffice转换超时: {lo_cmd}")
                 
-                if not conversion_success:
-                    raise Exception("LibreOffice转换失败：未找到可用的LibreOffice命令或转换失败")
+                if result.returncode != 0:
+                    raise Exception(f"LibreOffice转换失败: {result.stderr}")
+                self.logger.info(f"LibreOffice转换成功，使用命令: {lo_cmd}")
                 
                 # 查找转换后的文件
                 original_filename = Path(file_path).stem
@@ -108,24 +119,43 @@ class DocumentConverter:
                 if not target_file.exists():
                     raise Exception(f"转换后的文件不存在: {target_file}")
                 
-                # 将文件复制到新的临时位置（因为temp_dir会被清理）
-                new_temp_file = tempfile.NamedTemporaryFile(
-                    suffix=f'.{target_format}', 
-                    delete=False
-                )
-                # 确保临时文件权限为600（仅所有者可读写）
-                os.chmod(new_temp_file.name, 0o600)
-                new_temp_file.close()
-                
-                shutil.copy2(str(target_file), new_temp_file.name)
+                # 将文件复制到新的临时位置（因为temp_dir会被清理）；
+                # mkstemp 创建时即为600权限（仅所有者可读写），只复制内容以保留该权限
+                fd, new_temp_file = tempfile.mkstemp(suffix=f'.{target_format}')
+                os.close(fd)
+                shutil.copyfile(target_file, new_temp_file)
                 
-                self.logger.info(f"成功转换 {file_extension} -> {target_format}: {new_temp_file.name}")
-                return new_temp_file.name
+                self.logger.info(f"成功转换 {file_extension} -> {target_format}: {new_temp_file}")
+                return new_temp_file
                 
         except Exception as e:
             self.logger.error(f"LibreOffice转换失败: {e}")
             return None
 
+    def _convert_with_worker(self, file_path: str, target_format: str) -> Optional[str]:
+        """
+        使用常驻LibreOffice进程转换
+        
+        Args:
+            file_path: 输入文件路径
+            target_format: 目标格式 (docx, xlsx, pptx)
+            
+        Returns:
+            转换后的文件路径，失败返回None（由调用方回退到命令行转换）
+        """
+        # mkstemp 创建时即为600权限（仅所有者可读写）
+        fd, output_file = tempfile.mkstemp(suffix=f'.{target_format}')
+        os.close(fd)
+        
+        if self.libreoffice_worker.convert(file_path, target_format, output_file) \
+                and os.path.getsize(output_file) > 0:
+            self.logger.info(f"常驻LibreOffice转换成功 -> {target_format}: {output_file}")
+            return output_file
+        
+        os.unlink(output_file)
+        self.logger.warning("常驻LibreOffice转换失败，回退到命令行转换")
+        return None
+
     def is_old_format(self, file_extension: str) -> bool:
         """
         判断是否为需要转换的旧格式
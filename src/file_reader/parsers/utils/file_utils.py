@@ -4,13 +4,20 @@
 """
 
 import os
+import shutil
 import tempfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, BinaryIO, Union
 
 from ...utils import get_logger
 from ...models import ParseResult
 
+# 内存文件系统（Linux tmpfs），临时文件放在这里不经过磁盘
+MEMORY_TEMP_DIR = "/dev/shm"
+
+# 从文件对象写出临时文件时每次复制的块大小
+COPY_CHUNK_SIZE = 1024 * 1024
+
 
 class FileManager:
     """文件管理工具类"""
@@ -18,28 +25,66 @@ class FileManager:
     def __init__(self):
         """初始化文件管理器"""
         self.logger = get_logger("file_manager")
+        # 临时文件优先写入内存文件系统，pandoc/LibreOffice 等外部程序仍可按路径读取
+        self.memory_temp_dir = (
+            MEMORY_TEMP_DIR
+            if os.getenv("TEMP_FILES_IN_MEMORY", "true").lower() == "true" and os.path.isdir(MEMORY_TEMP_DIR)
+            else None
+        )
 
-    def save_temp_file(self, content: bytes, file_extension: str) -> Path:
+    def save_temp_file(self, content: Union[bytes, BinaryIO], file_extension: str) -> Path:
         """
         保存内容到临时文件
+
+        启用内存临时目录且剩余空间足够时写入内存文件系统，否则写入系统临时目录；
+        传入文件对象时从当前位置按块复制，无需先把全部内容读入内存
         
         Args:
-            content: 文件内容字节数据
+            content: 文件内容字节数据，或可读的二进制文件对象
             file_extension: 文件扩展名
             
         Returns:
             临时文件路径
         """
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix=file_extension, 
-            delete=False
-        )
-        # 确保临时文件权限为600（仅所有者可读写）
-        os.chmod(temp_file.name, 0o600)
-        temp_file.write(content)
-        temp_file.close()
+        if self.memory_temp_dir:
+            try:
+                size = self._content_size(content)
+                # 预留一倍余量，避免占满共享内存影响其他进程；大小未知时不使用内存目录
+                if size is not None and shutil.disk_usage(self.memory_temp_dir).free > size * 2:
+                    return self._write_temp_file(content, file_extension, self.memory_temp_dir)
+            except OSError as e:
+                self.logger.debug(f"内存临时目录不可用，改用系统临时目录: {e}")
+
+        return self._write_temp_file(content, file_extension, None)
+
+    @staticmethod
+    def _content_size(content: Union[bytes, BinaryIO]) -> Optional[int]:
+        """待写出内容的剩余字节数，不可寻址的文件对象返回None"""
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return len(content)
+        if not content.seekable():
+            return None
+        position = content.tell()
+        size = content.seek(0, os.SEEK_END) - position
+        content.seek(position)
+        return size
+
+    @staticmethod
+    def _write_temp_file(content: Union[bytes, BinaryIO], file_extension: str, directory: Optional[str]) -> Path:
+        """在指定目录（None为系统临时目录）创建权限为600的临时文件并写入内容，失败时删除文件"""
+        # mkstemp 创建的文件权限为600（仅所有者可读写）
+        fd, temp_path = tempfile.mkstemp(suffix=file_extension, dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                if isinstance(content, (bytes, bytearray, memoryview)):
+                    temp_file.write(content)
+                else:
+                    shutil.copyfileobj(content, temp_file, COPY_CHUNK_SIZE)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
         
-        return Path(temp_file.name)
+        return Path(temp_path)
 
     def cleanup_temp_file(self, file_path: Path):
         """
@@ -49,9 +94,8 @@ class FileManager:
             file_path: 文件路径
         """
         try:
-            if file_path.exists():
-                file_path.unlink()
-                self.logger.debug(f"清理临时文件: {file_path}")
+            file_path.unlink(missing_ok=True)
+            self.logger.debug(f"清理临时文件: {file_path}")
         except Exception as e:
             self.logger.warning(f"清理临时文件失败: {file_path}, 错误: {e}")
 
@@ -63,8 +107,8 @@ class FileManager:
             dir_path: 目录路径
         """
         try:
-            if dir_path and Path(dir_path).exists():
-                import shutil
+            if dir_path:
+                # ignore_errors 已覆盖目录不存在的情况，无需先 stat
                 shutil.rmtree(dir_path, ignore_errors=True)
                 self.logger.debug(f"清理临时目录: {dir_path}")
         except Exception as e:
@@ -74,6 +118,14 @@ class FileManager:
 class FormatChecker:
     """文件格式检查工具"""
 
+    SUPPORTED_FORMATS = frozenset({
+        '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', 
+        '.odt', '.ods', '.odp', '.rtf', '.csv', '.epub'
+    })
+    OLD_FORMATS = frozenset({'.doc', '.xls', '.ppt'})
+    PANDOC_FORMATS = frozenset({'.docx', '.odt', '.rtf', '.csv', '.epub'})
+    SPECIAL_FORMATS = frozenset({'.xlsx', '.pptx', '.ods', '.odp'})
+
     @staticmethod
     def is_supported_office_format(file_extension: str) -> bool:
         """
@@ -85,11 +137,7 @@ class FormatChecker:
         Returns:
             是否支持
         """
-        supported_extensions = [
-            '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', 
-            '.odt', '.ods', '.odp', '.rtf', '.csv', '.epub'
-        ]
-        return file_extension.lower() in supported_extensions
+        return file_extension.lower() in FormatChecker.SUPPORTED_FORMATS
 
     @staticmethod
     def is_old_format(file_extension: str) -> bool:
@@ -102,7 +150,7 @@ class FormatChecker:
         Returns:
             是否为旧格式
         """
-        return file_extension.lower() in ['.doc', '.xls', '.ppt']
+        return file_extension.lower() in FormatChecker.OLD_FORMATS
 
     @staticmethod
     def needs_pandoc(file_extension: str) -> bool:
@@ -115,8 +163,7 @@ class FormatChecker:
         Returns:
             是否需要pandoc
         """
-        pandoc_formats = ['.docx', '.odt', '.rtf', '.csv', '.epub']
-        return file_extension.lower() in pandoc_formats
+        return file_extension.lower() in FormatChecker.PANDOC_FORMATS
 
     @staticmethod
     def needs_special_parser(file_extension: str) -> bool:
@@ -129,8 +176,7 @@ class FormatChecker:
         Returns:
             是否需要特殊解析器
         """
-        special_formats = ['.xlsx', '.pptx', '.ods', '.odp']
-        return file_extension.lower() in special_formats
+        return file_extension.lower() in FormatChecker.SPECIAL_FORMATS
 
 
 class ResultBuilder:
@@ -4,6 +4,7 @@ Office文档图片提取器
 """
 
 import os
+from pathlib import Path
 from typing import List, Optional
 
 from ...utils import get_logger
@@ -16,13 +17,16 @@ class OfficeImageExtractor:
         """初始化图片提取器"""
         self.logger = get_logger("image_extractor")
 
-    def extract_excel_images(self, file_path: str, temp_image_dir: str) -> None:
+    def extract_excel_images(self, file_path: str, temp_image_dir: str) -> Optional[List[Path]]:
         """
         提取Excel文件中的图片
         
         Args:
             file_path: Excel文件路径
             temp_image_dir: 临时图片保存目录
+            
+        Returns:
+            保存的图片文件列表，提取失败时返回None
         """
         try:
             self.logger.info(f"开始提取Excel图片: {file_path}")
@@ -32,11 +36,11 @@ class OfficeImageExtractor:
                 from openpyxl.drawing.image import Image as OpenpyxlImage
             except ImportError:
                 self.logger.warning("openpyxl库未安装，无法提取Excel图片")
-                return
+                return None
             
             try:
                 workbook = load_workbook(file_path, data_only=False)
-                image_count = 0
+                image_files = []
                 
                 for sheet_idx, sheet in enumerate(workbook.worksheets):
                     sheet_name = sheet.title or f"Sheet{sheet_idx + 1}"
@@ -62,25 +66,29 @@ class OfficeImageExtractor:
                                         self.logger.warning(f"无法获取图片数据: {img_filename}")
                                         continue
                                 
-                                image_count += 1
+                                image_files.append(Path(img_path))
                                 self.logger.debug(f"保存Excel图片: {img_filename}")
                                 
                             except Exception as e:
                                 self.logger.warning(f"保存Excel图片失败: sheet={sheet_name}, img={img_idx}, 错误: {e}")
                                 continue
                 
-                if image_count > 0:
-                    self.logger.info(f"成功提取Excel图片: {image_count} 个")
+                if image_files:
+                    self.logger.info(f"成功提取Excel图片: {len(image_files)} 个")
                 else:
                     self.logger.debug("Excel文件中未找到图片")
+                return image_files
                     
             except Exception as e:
                 self.logger.warning(f"Excel图片提取失败: {e}")
                 
         except Exception as e:
             self.logger.error(f"Excel图片提取异常: {e}")
+        
+        return None
 
-    def extract_pptx_image(self, shape, slide_idx: int, img_idx: int, temp_image_dir: str) -> Optional[str]:
+    def extract_pptx_image(self, shape, slide_idx: int, img_idx: int, temp_image_dir: str,
+                           image_files: Optional[List[Path]] = None) -> Optional[str]:
         """
         从PowerPoint形状中提取图片
         
@@ -89,6 +97,7 @@ class OfficeImageExtractor:
             slide_idx: 幻灯片索引（从0开始）
             img_idx: 图片索引（从0开始）
             temp_image_dir: 临时图片保存目录
+            image_files: 收集已保存图片路径的列表（可选）
             
         Returns:
             图片的Markdown引用字符串，失败返回None
@@ -105,6 +114,8 @@ class OfficeImageExtractor:
             # 保存图片文件
             with open(img_path, 'wb') as img_file:
                 img_file.write(image_bytes)
+            if image_files is not None:
+                image_files.append(Path(img_path))
             
             self.logger.debug(f"保存PowerPoint图片: {img_filename}")
             
@@ -115,7 +126,8 @@ class OfficeImageExtractor:
             self.logger.warning(f"提取PowerPoint图片失败: slide={slide_idx}, img={img_idx}, 错误: {e}")
             return None
 
-    def extract_pptx_images_from_slide(self, slide, slide_idx: int, temp_image_dir: str) -> List[str]:
+    def extract_pptx_images_from_slide(self, slide, slide_idx: int, temp_image_dir: str,
+                                       image_files: Optional[List[Path]] = None) -> List[str]:
         """
         从PowerPoint幻灯片中提取所有图片
         
@@ -123,6 +135,7 @@ class OfficeImageExtractor:
             slide: PowerPoint幻灯片对象
             slide_idx: 幻灯片索引
             temp_image_dir: 临时图片保存目录
+            image_files: 收集已保存图片路径的列表（可选）
             
         Returns:
             图片引用列表
@@ -137,7 +150,7 @@ class OfficeImageExtractor:
             
             for shape in slide.shapes:
                 if hasattr(shape, 'shape_type') and shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                    img_ref = self.extract_pptx_image(shape, slide_idx, len(slide_images), temp_image_dir)
+                    img_ref = self.extract_pptx_image(shape, slide_idx, len(slide_images), temp_image_dir, image_files)
                     if img_ref:
                         slide_images.append(img_ref)
                         
@@ -0,0 +1,237 @@
+"""
+常驻LibreOffice转换进程
+启动一个监听私有UNO管道的headless soffice进程，通过UNO接口完成格式转换，
+避免每次转换旧格式文档都重新启动LibreOffice
+"""
+
+import os
+import atexit
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ...utils import get_logger
+
+# 可选依赖：uno 随LibreOffice安装（如 python3-uno），缺失时只能逐次启动LibreOffice转换
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+    PropertyValue = None
+
+
+# 目标格式对应的LibreOffice导出过滤器
+EXPORT_FILTERS = {
+    'docx': 'MS Word 2007 XML',
+    'xlsx': 'Calc MS Excel 2007 XML',
+    'pptx': 'Impress MS PowerPoint 2007 XML'
+}
+
+
+def _property(name: str, value) -> "PropertyValue":
+    """构建UNO属性"""
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class PersistentLibreOfficeWorker:
+    """
+    常驻的headless LibreOffice进程
+
+    - 首次转换时启动进程并建立UNO连接，之后的转换复用同一进程
+    - 转换在锁内串行执行，超时会结束进程，进程退出或连接失效时自动重启一次
+    """
+
+    def __init__(self, commands: Sequence[str],
+                 startup_timeout: float = 30.0, convert_timeout: float = 120.0):
+        """
+        初始化常驻转换进程（不立即启动）
+
+        Args:
+            commands: 依次尝试的LibreOffice命令
+            startup_timeout: 等待进程接受连接的最长时间（秒）
+            convert_timeout: 单次转换的最长时间（秒），超时后结束进程
+        """
+        self.logger = get_logger("libreoffice_worker")
+        self.commands = list(commands)
+        self.startup_timeout = startup_timeout
+        self.convert_timeout = convert_timeout
+
+        self._process: Optional[subprocess.Popen] = None
+        self._desktop = None
+        self._profile_dir: Optional[str] = None
+        self._pipe_name: Optional[str] = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @staticmethod
+    def is_available() -> bool:
+        """当前Python环境能否通过UNO驱动LibreOffice"""
+        return uno is not None
+
+    def convert(self, file_path: str, target_format: str, output_path: str) -> bool:
+        """
+        将文件转换为目标格式
+
+        Args:
+            file_path: 输入文件路径
+            target_format: 目标格式 (docx, xlsx, pptx)
+            output_path: 输出文件路径
+
+        Returns:
+            是否转换成功
+        """
+        filter_name = EXPORT_FILTERS.get(target_format)
+        if filter_name is None or uno is None:
+            return False
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    desktop = self._ensure_started()
+                    self._convert(desktop, file_path, filter_name, output_path)
+                    return True
+                except Exception as e:
+                    self.logger.warning(f"常驻LibreOffice转换失败（第{attempt + 1}次）: {e}")
+                    self._stop()
+        return False
+
+    def _convert(self, desktop, file_path: str, filter_name: str, output_path: str):
+        """加载文档并导出，超时后结束进程使UNO调用中断"""
+        watchdog = threading.Timer(self.convert_timeout, self._kill)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            source_url = uno.systemPathToFileUrl(os.path.abspath(file_path))
+            document = desktop.loadComponentFromURL(source_url, "_blank", 0, (_property("Hidden", True),))
+            if document is None:
+                raise RuntimeError(f"LibreOffice无法加载文件: {file_path}")
+            try:
+                target_url = uno.systemPathToFileUrl(os.path.abspath(output_path))
+                document.storeToURL(target_url, (_property("FilterName", filter_name),
+                                                 _property("Overwrite", True)))
+            finally:
+                document.close(True)
+        finally:
+            watchdog.cancel()
+
+    def _ensure_started(self):
+        """启动进程并连接，已在运行时直接返回Desktop对象（需持有锁）"""
+        if self._desktop is not None and self._process is not None and self._process.poll() is None:
+            return self._desktop
+
+        self._stop()
+        self._profile_dir = tempfile.mkdtemp(prefix="libreoffice_profile_")
+        # 每次启动使用本进程独有的命名管道，不开放TCP端口，多个服务进程之间也不会冲突
+        self._pipe_name = f"file_reader_lo_{os.getpid()}_{uuid.uuid4().hex}"
+        accept = f"pipe,name={self._pipe_name};urp;StarOffice.ComponentContext"
+        args = [
+            '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+            f'--accept={accept}',
+            f'-env:UserInstallation={Path(self._profile_dir).as_uri()}'
+        ]
+
+        for command in self.commands:
+            try:
+                self._process = subprocess.Popen(
+                    [command, *args],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            raise RuntimeError("未找到可用的LibreOffice命令")
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{accept}")
+                break
+            except Exception:
+                if self._process.poll() is not None or time.monotonic() >= deadline:
+                    raise RuntimeError("LibreOffice进程启动失败或连接超时")
+                time.sleep(0.2)
+
+        self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+        self.logger.info(f"常驻LibreOffice进程已启动: pid={self._process.pid}, 管道: {self._pipe_name}")
+        return self._desktop
+
+    def _kill(self):
+        """强制结束进程（转换超时时由看门狗调用）"""
+        process = self._process
+        if process is not None and process.poll() is None:
+            self.logger.warning("常驻LibreOffice转换超时，结束进程")
+            process.kill()
+
+    def _stop(self):
+        """结束进程并清理用户配置目录（需持有锁）"""
+        if self._desktop is not None:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+            self._desktop = None
+
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+            self._process = None
+
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    def close(self):
+        """关闭常驻进程"""
+        with self._lock:
+            self._stop()
+
+
+# 全局常驻转换进程实例
+_global_worker = None
+_global_worker_lock = threading.Lock()
+
+def get_libreoffice_worker(commands: Sequence[str]) -> Optional[PersistentLibreOfficeWorker]:
+    """
+    获取全局常驻LibreOffice转换进程
+
+    需设置 LIBREOFFICE_PERSISTENT=true 且可导入 uno，否则返回None（逐次启动LibreOffice转换）
+
+    Args:
+        commands: 依次尝试的LibreOffice命令
+
+    Returns:
+        常驻转换进程，未启用或不可用时返回None
+    """
+    global _global_worker
+    if os.getenv("LIBREOFFICE_PERSISTENT", "false").lower() != "true":
+        return None
+    if not PersistentLibreOfficeWorker.is_available():
+        return None
+
+    with _global_worker_lock:
+        if _global_worker is None:
+            _global_worker = PersistentLibreOfficeWorker(
+                commands,
+                convert_timeout=float(os.getenv("LIBREOFFICE_CONVERT_TIMEOUT", "120"))
+            )
+        return _global_worker
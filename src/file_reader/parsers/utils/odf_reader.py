@@ -0,0 +1,123 @@
+"""
+OpenDocument流式读取器
+直接从ODS/ODP压缩包中的content.xml流式读取表格和幻灯片文本，
+每个工作表或幻灯片解析完成后即释放，无需构建完整的odfpy DOM
+"""
+
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Tuple
+
+# OpenDocument命名空间
+_TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+_DRAW_NS = "urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"
+
+_TABLE = f"{{{_TABLE_NS}}}table"
+_TABLE_NAME = f"{{{_TABLE_NS}}}name"
+_TABLE_ROW = f"{{{_TABLE_NS}}}table-row"
+_TABLE_CELL = f"{{{_TABLE_NS}}}table-cell"
+_TEXT_P = f"{{{_TEXT_NS}}}p"
+_TEXT_S = f"{{{_TEXT_NS}}}s"
+_TEXT_S_COUNT = f"{{{_TEXT_NS}}}c"
+_TEXT_TAB = f"{{{_TEXT_NS}}}tab"
+_TEXT_LINE_BREAK = f"{{{_TEXT_NS}}}line-break"
+_DRAW_PAGE = f"{{{_DRAW_NS}}}page"
+
+
+class OdfStreamReader:
+    """OpenDocument流式读取器"""
+
+    @staticmethod
+    def extract_text(element: ET.Element) -> str:
+        """
+        提取元素文本，与 odf.teletype.extractText 一致地展开空格、制表符和换行元素
+
+        Args:
+            element: XML元素
+
+        Returns:
+            元素的文本内容
+        """
+        parts = []
+        OdfStreamReader._collect_text(element, parts)
+        return "".join(parts)
+
+    @staticmethod
+    def _collect_text(element: ET.Element, parts: List[str]):
+        """递归收集元素文本"""
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            tag = child.tag
+            if tag == _TEXT_S:
+                parts.append(" " * int(child.get(_TEXT_S_COUNT) or 1))
+            elif tag == _TEXT_TAB:
+                parts.append("\t")
+            elif tag == _TEXT_LINE_BREAK:
+                parts.append("\n")
+            else:
+                OdfStreamReader._collect_text(child, parts)
+            if child.tail:
+                parts.append(child.tail)
+
+    @staticmethod
+    def _iter_elements(content: bytes, tag: str) -> Iterator[ET.Element]:
+        """
+        流式遍历content.xml中指定标签的最外层元素，元素处理完成后清空以释放内存
+
+        Args:
+            content: OpenDocument文件内容字节数据
+            tag: 要遍历的元素标签
+
+        Yields:
+            匹配的XML元素
+        """
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            with archive.open("content.xml") as xml_file:
+                depth = 0
+                for event, element in ET.iterparse(xml_file, events=("start", "end")):
+                    if element.tag != tag:
+                        continue
+                    if event == "start":
+                        depth += 1
+                        continue
+                    depth -= 1
+                    if depth == 0:
+                        yield element
+                        element.clear()
+
+    @staticmethod
+    def iter_ods_tables(content: bytes) -> Iterator[Tuple[str, List[List[str]]]]:
+        """
+        逐个读取ODS工作表
+
+        Args:
+            content: ODS文件内容字节数据
+
+        Yields:
+            (工作表名称, 单元格文本行列表)，空单元格为空字符串
+        """
+        extract_text = OdfStreamReader.extract_text
+        for table in OdfStreamReader._iter_elements(content, _TABLE):
+            rows = [
+                [extract_text(cell) for cell in row.iter(_TABLE_CELL)]
+                for row in table.iter(_TABLE_ROW)
+            ]
+            yield table.get(_TABLE_NAME, ""), rows
+
+    @staticmethod
+    def iter_odp_pages(content: bytes) -> Iterator[List[str]]:
+        """
+        逐页读取ODP幻灯片文本
+
+        Args:
+            content: ODP文件内容字节数据
+
+        Yields:
+            幻灯片中各段落的文本列表
+        """
+        extract_text = OdfStreamReader.extract_text
+        for page in OdfStreamReader._iter_elements(content, _DRAW_PAGE):
+            yield [extract_text(paragraph) for paragraph in page.iter(_TEXT_P)]
@@ -3,7 +3,8 @@ Office特定格式解析器
 提供Excel和PowerPoint的专门解析功能
 """
 
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
 from ...utils import get_logger
 from .image_extractor import OfficeImageExtractor, PowerPointTextAnalyzer
@@ -70,15 +71,18 @@ class ExcelParser:
             self.logger.error(f"Excel转Markdown失败: {e}")
             raise Exception(f"Excel解析失败: {e}")
 
-    def extract_images(self, file_path: str, temp_image_dir: str) -> None:
+    def extract_images(self, file_path: str, temp_image_dir: str) -> Optional[List[Path]]:
         """
         提取Excel文件中的图片
         
         Args:
             file_path: Excel文件路径
             temp_image_dir: 临时图片保存目录
+            
+        Returns:
+            保存的图片文件列表，提取失败时返回None
         """
-        self.image_extractor.extract_excel_images(file_path, temp_image_dir)
+        return self.image_extractor.extract_excel_images(file_path, temp_image_dir)
 
 
 class PowerPointParser:
@@ -90,13 +94,15 @@ class PowerPointParser:
         self.image_extractor = OfficeImageExtractor()
         self.text_analyzer = PowerPointTextAnalyzer()
 
-    def parse_to_markdown(self, file_path: str, temp_image_dir: str = None) -> str:
+    def parse_to_markdown(self, file_path: str, temp_image_dir: str = None,
+                          image_files: Optional[List[Path]] = None) -> str:
         """
         使用 python-pptx 将 PowerPoint 文件转换为 Markdown 格式，并提取图片
         
         Args:
             file_path: PowerPoint文件路径
             temp_image_dir: 临时图片保存目录
+            image_files: 收集已保存图片路径的列表（可选）
             
         Returns:
             Markdown格式的内容
@@ -150,7 +156,7 @@ class PowerPointParser:
                 # 提取图片
                 if temp_image_dir:
                     slide_images = self.image_extractor.extract_pptx_images_from_slide(
-                        slide, slide_idx - 1, temp_image_dir
+                        slide, slide_idx - 1, temp_image_dir, image_files
                     )
                 
                 # 添加文本内容
@@ -6,11 +6,10 @@ Pandoc转换工具
 import tempfile
 import subprocess
 import os
-import shlex
-from pathlib import Path
 from typing import Optional
 
 from ...utils import get_logger
+from ..mixins.image_mixin import IMAGE_SUFFIXES
 
 
 class PandocConverter:
@@ -45,16 +44,12 @@ class PandocConverter:
                 use_existing_dir = False
                 
             try:
-                # 构建pandoc命令，使用shlex.quote()防止命令注入
-                # 对文件路径和媒体目录进行安全转义
-                safe_file_path = shlex.quote(os.path.abspath(file_path))
-                safe_media_dir = shlex.quote(os.path.abspath(media_dir))
-                
+                # 构建pandoc命令（参数列表不经过shell，路径无需转义）
                 cmd = [
                     'pandoc',
-                    safe_file_path,
+                    os.path.abspath(file_path),
                     '--to', 'markdown',
-                    '--extract-media', safe_media_dir,
+                    '--extract-media', os.path.abspath(media_dir),
                     '--wrap', 'none',  # 不自动换行
                 ]
                 
@@ -88,12 +83,14 @@ class PandocConverter:
                         self.logger.info(f"pandoc转换成功，生成Markdown内容长度: {len(markdown_content)}")
                         
                         # 检查提取的媒体文件
-                        media_files = list(Path(media_dir).rglob('*'))
-                        image_files = [f for f in media_files if f.is_file() and 
-                                     f.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']]
+                        image_count = sum(
+                            1 for _, _, filenames in os.walk(media_dir)
+                            for filename in filenames
+                            if os.path.splitext(filename)[1].lower() in IMAGE_SUFFIXES
+                        )
                         
-                        if image_files:
-                            self.logger.info(f"pandoc提取了 {len(image_files)} 个图片文件")
+                        if image_count:
+                            self.logger.info(f"pandoc提取了 {image_count} 个图片文件")
                         
                         return markdown_content
                     else:
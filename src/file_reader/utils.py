@@ -3,13 +3,65 @@
 """
 
 import os
+import re
 import sys
+import codecs
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from urllib.parse import urlparse
 
+# 可选依赖：缺失时UTF-8和GBK之外的编码按固定顺序逐个尝试
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+
+# UTF-8和GBK都失败时的候选编码（charset_normalizer命名），及其在结果中使用的名称
+_FALLBACK_ENCODINGS = {'utf_16': 'utf-16', 'latin_1': 'latin1', 'cp1252': 'cp1252'}
+# 未安装charset_normalizer时依次尝试的编码，latin1可解码任意字节
+_FALLBACK_DECODE_ORDER = ('utf-16', 'utf-16le', 'utf-16be', 'latin1')
+# 字节顺序标记（BOM）唯一确定的编码，解码时去除BOM；UTF-32 LE 的BOM以 UTF-16 LE 的BOM开头，需先判断
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# normalize_content 替换为普通空格的Unicode空白字符：非断开空格、U+2000~U+200A（en quad至hair space）、全角空格
+_UNICODE_SPACES = '\u00a0' + ''.join(map(chr, range(0x2000, 0x200b))) + '\u3000'
+_UNICODE_SPACES_TO_SPACE = str.maketrans(dict.fromkeys(_UNICODE_SPACES, ' '))
+# 连续超过2个换行符（字面前缀形式，比 \n{3,} 查找更快）
+_RE_EXTRA_NEWLINES = re.compile(r'\n\n\n+')
+# 连续的空格和制表符
+_RE_SPACE_RUN = re.compile(r'[ \t]+')
+
+# 错误信息模式（中英文）及对应的错误类型，按顺序匹配
+_ERROR_PATTERNS = tuple((re.compile(pattern), error_type) for pattern, error_type in (
+    # 403 错误
+    (r'403|forbidden|禁止访问|访问被拒绝', 'FORBIDDEN'),
+    # 404 错误
+    (r'404|not found|文件不存在|资源未找到', 'NOT_FOUND'),
+    # 500 错误
+    (r'5\d\d|server error|服务器错误|内部错误', 'SERVER_ERROR'),
+    # 网络错误
+    (r'connection|network|网络|连接', 'NETWORK_ERROR'),
+    # 超时错误
+    (r'timeout|超时', 'TIMEOUT'),
+    # SSL错误
+    (r'ssl|tls|证书', 'SSL_ERROR'),
+    # 文件过大
+    (r'too large|文件过大|大小超限|size exceeded', 'SIZE_EXCEEDED'),
+    # 不支持的类型
+    (r'unsupported|不支持|invalid format', 'UNSUPPORTED_TYPE'),
+    # 解析错误
+    (r'parse|解析|格式错误', 'PARSE_ERROR'),
+))
+
 
 def get_logger(name: str, level: str = None) -> logging.Logger:
     """
@@ -84,28 +136,16 @@ def normalize_content(content: str) -> str:
     if not content:
         return ""
     
-    # 替换常见的Unicode空白字符
-    content = content.replace('\u00a0', ' ')  # 非断开空格
-    content = content.replace('\u2000', ' ')  # en quad
-    content = content.replace('\u2001', ' ')  # em quad
-    content = content.replace('\u2002', ' ')  # en space
-    content = content.replace('\u2003', ' ')  # em space
-    content = content.replace('\u2004', ' ')  # three-per-em space
-    content = content.replace('\u2005', ' ')  # four-per-em space
-    content = content.replace('\u2006', ' ')  # six-per-em space
-    content = content.replace('\u2007', ' ')  # figure space
-    content = content.replace('\u2008', ' ')  # punctuation space
-    content = content.replace('\u2009', ' ')  # thin space
-    content = content.replace('\u200a', ' ')  # hair space
-    content = content.replace('\u3000', ' ')  # ideographic space
-    
-    # 规范化换行符
-    content = content.replace('\r\n', '\n')
-    content = content.replace('\r', '\n')
+    # 替换常见的Unicode空白字符（一次遍历完成）
+    content = content.translate(_UNICODE_SPACES_TO_SPACE)
+    
+    # 规范化换行符（没有CR时跳过替换）
+    if '\r' in content:
+        content = content.replace('\r\n', '\n')
+        content = content.replace('\r', '\n')
     
     # 删除多余的空白行（连续超过2个换行符的情况）
-    import re
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    content = _RE_EXTRA_NEWLINES.sub('\n\n', content)
     
     # 删除行尾空白
     lines = content.split('\n')
@@ -113,7 +153,7 @@ def normalize_content(content: str) -> str:
     content = '\n'.join(lines)
     
     # 规范化连续的空白字符为单个空格
-    content = re.sub(r'[ \t]+', ' ', content)
+    content = _RE_SPACE_RUN.sub(' ', content)
     
     # 删除首尾空白
     content = content.strip()
@@ -121,6 +161,45 @@ def normalize_content(content: str) -> str:
     return content
 
 
+def decode_text(content: bytes) -> Tuple[str, str]:
+    """
+    检测文本编码并解码
+    
+    以BOM开头时直接按BOM对应的编码解码；否则依次尝试UTF-8和GBK（GB2312是GBK的子集，无需单独尝试），
+    都失败时由charset_normalizer在UTF-16、Latin-1、CP1252中一次性选出最可能的编码，避免逐个编码整篇解码
+    
+    Args:
+        content: 文本字节数据
+        
+    Returns:
+        (解码后的文本, 使用的编码)
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if content.startswith(bom):
+            try:
+                return content.decode(encoding), encoding
+            except UnicodeDecodeError:
+                break
+    
+    for encoding in ('utf-8', 'gbk'):
+        try:
+            return content.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    
+    if charset_normalizer is not None:
+        best = charset_normalizer.from_bytes(content, cp_isolation=list(_FALLBACK_ENCODINGS)).best()
+        if best is not None:
+            return str(best), _FALLBACK_ENCODINGS.get(best.encoding, best.encoding)
+        return content.decode('latin1'), 'latin1'
+    
+    for encoding in _FALLBACK_DECODE_ORDER:
+        try:
+            return content.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+
+
 def extract_base_domain(url: str) -> Optional[str]:
     """
     从URL中提取基础域名
@@ -184,33 +263,10 @@ def extract_error_details(error_message: str) -> tuple[str, str]:
     Returns:
         (错误类型, 详细信息) 的元组
     """
-    # 常见错误模式匹配（中英文）
-    error_patterns = [
-        # 403 错误
-        (r'403|forbidden|禁止访问|访问被拒绝', 'FORBIDDEN'),
-        # 404 错误  
-        (r'404|not found|文件不存在|资源未找到', 'NOT_FOUND'),
-        # 500 错误
-        (r'5\d\d|server error|服务器错误|内部错误', 'SERVER_ERROR'),
-        # 网络错误
-        (r'connection|network|网络|连接', 'NETWORK_ERROR'),
-        # 超时错误
-        (r'timeout|超时', 'TIMEOUT'),
-        # SSL错误
-        (r'ssl|tls|证书', 'SSL_ERROR'),
-        # 文件过大
-        (r'too large|文件过大|大小超限|size exceeded', 'SIZE_EXCEEDED'),
-        # 不支持的类型
-        (r'unsupported|不支持|invalid format', 'UNSUPPORTED_TYPE'),
-        # 解析错误
-        (r'parse|解析|格式错误', 'PARSE_ERROR')
-    ]
-    
-    import re
     error_message_lower = error_message.lower()
     
-    for pattern, error_type in error_patterns:
-        if re.search(pattern, error_message_lower):
+    for pattern, error_type in _ERROR_PATTERNS:
+        if pattern.search(error_message_lower):
             return error_type, error_message
     
     # 默认返回OTHER类型
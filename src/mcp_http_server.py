@@ -357,6 +357,7 @@ def run_http_server():
         # 清理资源
         global local_file_reader
         if local_file_reader:
+            local_file_reader.close()
             local_file_reader = None
 
 if __name__ == "__main__":
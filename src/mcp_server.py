@@ -341,5 +341,5 @@ def run_server():
         # 清理资源
         global local_file_reader
         if local_file_reader:
-            # FileReader没有close方法，这里重置为None
+            local_file_reader.close()
             local_file_reader = None 
\ No newline at end of file
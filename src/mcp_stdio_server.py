@@ -315,6 +315,12 @@ async def main():
         else:
             # 其他异常继续抛出
             raise
+    finally:
+        # 清理资源
+        global local_file_reader
+        if local_file_reader:
+            local_file_reader.close()
+            local_file_reader = None
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
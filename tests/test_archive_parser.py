@@ -5,8 +5,10 @@
 """
 
 import asyncio
+import io
 import os
 import sys
+import tarfile
 import tempfile
 import zipfile
 from pathlib import Path
@@ -169,11 +171,216 @@ async def test_empty_content():
         print("❌ 应该拒绝空内容")
 
 
+@pytest.mark.asyncio
+async def test_tar_gz_from_memory():
+    """测试TAR.GZ直接从内存流式解压"""
+    print("\n" + "=" * 60)
+    print("🧪 测试TAR.GZ内存解压")
+    
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        for name, data in (('README.md', b'# readme'), ('src/main.py', b'print("hi")'),
+                           ('docs/file (1).txt', b'copy')):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    
+    parser = ArchiveParser()
+    result = parser._parse_content(buf.getvalue(), '.tar.gz')
+    
+    assert result.success, result.error
+    assert result.metadata['file_count'] == 3
+    # 本地文件模式下文件链接目标被移除，只保留链接文字
+    assert '→ [src/main.py]' in result.content
+    assert '→ [docs/file (1).txt]' in result.content
+    assert '(main.py)' not in result.content
+    assert '(file (1).txt)' not in result.content
+    print("✅ TAR.GZ内存解压成功")
+
+
+@pytest.mark.asyncio
+async def test_zip_extract_creates_each_dir_once():
+    """测试ZIP串行和并行解压时共享父目录的成员只创建一次目录"""
+    from unittest.mock import patch
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor
+    
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('docs/', b'')
+        for index in range(20):
+            zipf.writestr(f'docs/part/{index}.txt', f'part {index}')
+        zipf.writestr('README.md', b'# readme')
+    
+    for workers in (1, 4):
+        extractor = ArchiveExtractor()
+        extractor.extract_workers = workers
+        with tempfile.TemporaryDirectory() as extract_path:
+            original_mkdir = Path.mkdir
+            with patch.object(Path, 'mkdir', autospec=True, side_effect=original_mkdir) as mock_mkdir:
+                files = extractor.extract_archive_stream(io.BytesIO(buf.getvalue()), extract_path, '.zip')
+            
+            assert len(files) == 21
+            assert (Path(extract_path) / 'docs/part/7.txt').read_text() == 'part 7'
+            assert mock_mkdir.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_zip_extract_skips_traversal_members():
+    """测试ZIP中指向解压目录之外（含同名前缀的兄弟目录）的成员被跳过"""
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        extract_path = Path(temp_dir) / 'out'
+        extract_path.mkdir()
+        
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w') as zipf:
+            zipf.writestr('safe/a.txt', b'a')
+            zipf.writestr('../escape.txt', b'x')
+            zipf.writestr('../out2/sibling.txt', b'x')
+        
+        files = ArchiveExtractor().extract_archive_stream(io.BytesIO(buf.getvalue()), str(extract_path), '.zip')
+        
+        assert [f.relative_to(extract_path).as_posix() for f in files] == ['safe/a.txt']
+        assert not (Path(temp_dir) / 'out2').exists()
+
+
+@pytest.mark.asyncio
+async def test_tar_duplicate_members_last_wins():
+    """测试TAR中大小不同的同名成员交替出现时以最后一个为准，且不会与后台写出冲突"""
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor, MMAP_EXTRACT_MIN_SIZE
+    
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
+        for index in range(40):
+            size = MMAP_EXTRACT_MIN_SIZE * 4 if index % 2 else 16
+            data = bytes([index]) * size
+            info = tarfile.TarInfo('dup/data.bin')
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo('dup/other.txt')
+        info.size = 5
+        tar.addfile(info, io.BytesIO(b'other'))
+    
+    with tempfile.TemporaryDirectory() as extract_path:
+        files = ArchiveExtractor().extract_archive_stream(io.BytesIO(buf.getvalue()), extract_path, '.tar')
+        
+        assert sorted(f.name for f in files) == ['data.bin', 'other.txt']
+        assert (Path(extract_path) / 'dup/data.bin').read_bytes() == bytes([39]) * (MMAP_EXTRACT_MIN_SIZE * 4)
+
+
+@pytest.mark.asyncio
+async def test_tar_duplicate_small_members_keep_order():
+    """测试多个后台写出线程时同名小成员按提交顺序写出，最后一个成员的内容保留"""
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor
+    
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
+        for index in range(200):
+            name = 'same.txt' if index % 2 else f'file{index}.txt'
+            data = str(index).encode() * 100
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    
+    extractor = ArchiveExtractor()
+    extractor.write_workers = 4
+    with tempfile.TemporaryDirectory() as extract_path:
+        files = extractor.extract_archive_stream(io.BytesIO(buf.getvalue()), extract_path, '.tar')
+        
+        assert len(files) == 101
+        assert (Path(extract_path) / 'same.txt').read_bytes() == b'199' * 100
+
+
+@pytest.mark.asyncio
+async def test_zip_duplicate_members_last_wins():
+    """测试ZIP并行解压时同名成员以最后一个为准"""
+    import warnings
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor, MMAP_EXTRACT_MIN_SIZE
+    
+    buf = io.BytesIO()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # zipfile 对重名成员发出 UserWarning
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for index in range(32):
+                size = MMAP_EXTRACT_MIN_SIZE * 4 if index % 2 else 16
+                zipf.writestr('dup/data.bin', bytes([index]) * size)
+            zipf.writestr('dup/../other.txt', b'other')
+    
+    extractor = ArchiveExtractor()
+    extractor.extract_workers = 8
+    with tempfile.TemporaryDirectory() as extract_path:
+        files = extractor.extract_archive_stream(io.BytesIO(buf.getvalue()), extract_path, '.zip')
+        
+        assert [f.name for f in files] == ['data.bin']
+        assert (Path(extract_path) / 'dup/data.bin').read_bytes() == bytes([31]) * (MMAP_EXTRACT_MIN_SIZE * 4)
+        # 含 .. 的成员由 zipfile.extract 去掉 .. 后串行写出
+        assert (Path(extract_path) / 'dup/other.txt').read_bytes() == b'other'
+
+
+@pytest.mark.asyncio
+async def test_tar_large_members_bypass_background_writer():
+    """测试未启用mmap时只有小成员整块读入内存交给后台写出，大成员在当前线程写出"""
+    from unittest.mock import patch
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor, MMAP_EXTRACT_MIN_SIZE, _BackgroundWriter
+    
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
+        for name, size in (('small.txt', 10), ('large.bin', MMAP_EXTRACT_MIN_SIZE * 2)):
+            info = tarfile.TarInfo(name)
+            info.size = size
+            tar.addfile(info, io.BytesIO(b'x' * size))
+    
+    extractor = ArchiveExtractor()
+    extractor.use_mmap_extract = False
+    with tempfile.TemporaryDirectory() as extract_path:
+        original_submit = _BackgroundWriter.submit
+        with patch.object(_BackgroundWriter, 'submit', autospec=True, side_effect=original_submit) as mock_submit:
+            files = extractor.extract_archive_stream(io.BytesIO(buf.getvalue()), extract_path, '.tar')
+        
+        assert [call.args[1].name for call in mock_submit.call_args_list] == ['small.txt']
+        assert sorted(f.stat().st_size for f in files) == [10, MMAP_EXTRACT_MIN_SIZE * 2]
+
+
+@pytest.mark.asyncio
+async def test_tar_limit_error_not_masked_by_writer_error():
+    """测试已有异常传播时，后台写出的错误不会覆盖原异常"""
+    from unittest.mock import patch
+    from file_reader.parsers.utils.archive_utils import ArchiveExtractor, _BackgroundWriter
+    
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
+        for index in range(3):
+            info = tarfile.TarInfo(f'file{index}.txt')
+            info.size = 1
+            tar.addfile(info, io.BytesIO(b'x'))
+    
+    extractor = ArchiveExtractor()
+    extractor.background_write = True
+    extractor.max_file_count = 2
+    with tempfile.TemporaryDirectory() as extract_path:
+        with patch.object(_BackgroundWriter, 'close', side_effect=OSError("后台写出失败")):
+            try:
+                extractor.extract_archive_stream(io.BytesIO(buf.getvalue()), extract_path, '.tar')
+            except Exception as e:
+                assert "TAR文件包含过多文件" in str(e), f"应该保留文件数超限的异常: {e}"
+            else:
+                raise AssertionError("文件数超限时应该抛出异常")
+
+
 async def main():
     """主函数"""
     await test_archive_parser()
     await test_unsupported_format()
     await test_empty_content()
+    await test_tar_gz_from_memory()
+    await test_zip_extract_creates_each_dir_once()
+    await test_zip_extract_skips_traversal_members()
+    await test_tar_duplicate_members_last_wins()
+    await test_tar_duplicate_small_members_keep_order()
+    await test_zip_duplicate_members_last_wins()
+    await test_tar_large_members_bypass_background_writer()
+    await test_tar_limit_error_not_masked_by_writer_error()
     
     print("\n" + "=" * 60)
     print("🎉 压缩文件解析器测试完成")
@@ -154,6 +154,32 @@ class TestFileReader:
         assert response.contents[0].resource_id == "success.txt"
         assert response.failed[0].resource_id == "failed.txt"
     
+    @pytest.mark.asyncio
+    async def test_sync_parser_runs_in_parse_executor(self, file_reader):
+        """测试同步解析器在解析线程池中执行，不阻塞事件循环"""
+        import threading
+        from file_reader.models import ParseResult
+        
+        parse_threads = []
+        
+        def fake_parse(content, file_extension, content_hash=None):
+            parse_threads.append(threading.current_thread().name)
+            return ParseResult(success=True, content="parsed in worker thread", doc_type="txt")
+        
+        with patch.object(file_reader.parsers['text'], 'parse', side_effect=fake_parse):
+            success, content, _ = await file_reader._process_file_content("test.txt", b"content", 1024)
+        
+        assert success is True
+        assert content == "parsed in worker thread"
+        assert parse_threads[0].startswith("parser")
+    
+    def test_close_shuts_down_parse_executor(self, file_reader):
+        """测试关闭文件读取器时关闭解析线程池"""
+        file_reader.close()
+        
+        with pytest.raises(RuntimeError):
+            file_reader.parse_executor.submit(lambda: None)
+    
     def test_clear_cache(self, file_reader, mock_storage_client):
         """测试清理缓存"""
         file_reader.clear_cache()
@@ -7,7 +7,9 @@
 import time
 import os
 import sys
+import hashlib
 from pathlib import Path
+from unittest.mock import patch
 
 # 添加src路径到系统路径
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -84,6 +86,26 @@ def test_cache_key_generation():
     assert key1 != key4, "不同版本应该生成不同的缓存键"
 
 
+def test_cache_key_content_hash():
+    """测试调用方传入内容哈希生成缓存键"""
+    print("\n🧠 测试内容哈希复用...")
+    
+    cache = get_parsed_cache()
+    content = "哈希复用测试内容".encode('utf-8')
+    
+    key1 = cache.get_cache_key(content, "text", "1.0")
+    key2 = cache.get_cache_key(content, "text", "1.1")
+    assert key1.split(":")[1] == key2.split(":")[1], "同一内容的哈希部分应该一致"
+    
+    # 内容相同但对象不同时，缓存键仍然一致
+    copy = bytes(bytearray(content))
+    assert cache.get_cache_key(copy, "text", "1.0") == key1, "相同内容应该生成相同的缓存键"
+    
+    # 调用方提供内容哈希时直接使用，不再计算内容哈希
+    digest = hashlib.sha256(content).digest()
+    assert cache.get_cache_key(b"", "text", "1.0", content_hash=digest) == key1, "已知哈希应该生成相同的缓存键"
+
+
 def test_cache_with_config():
     """测试带配置参数的缓存功能"""
     print("\n⚙️ 测试带配置参数的缓存功能...")
@@ -110,11 +132,219 @@ def test_cache_with_config():
     assert key1 == key3, "相同配置应该生成相同的缓存键"
 
 
+def test_cache_parse_results_bulk():
+    """测试批量缓存解析结果"""
+    print("\n📦 测试批量缓存解析结果...")
+    
+    cache = get_parsed_cache()
+    parser_info = {"name": "text", "version": "1.0"}
+    
+    items = []
+    for i in range(3):
+        key = cache.get_cache_key(f"批量内容{i}".encode('utf-8'), "text", "1.0")
+        items.append((key, {"content": f"批量内容{i}", "doc_type": "txt"}, parser_info))
+    
+    count = cache.cache_parse_results_bulk(items)
+    print(f"批量写入条目数: {count}")
+    
+    assert count == 3, "应该写入全部3条结果"
+    for key, parse_result, _ in items:
+        cached = cache.get_cached_result(key)
+        assert cached is not None, "批量写入的结果应该可以读取"
+        assert cached["content"] == parse_result["content"], "缓存内容应该一致"
+
+
+def test_cache_long_content_roundtrip():
+    """测试较长内容（可能被压缩存储）的缓存读写"""
+    print("\n🗜️ 测试长内容缓存读写...")
+    
+    cache = get_parsed_cache()
+    long_content = "# 标题\n\n" + "这是一段需要压缩存储的较长内容。\n" * 200
+    key = cache.get_cache_key(long_content.encode('utf-8'), "text", "1.0")
+    
+    assert cache.cache_parse_result(key, {"content": long_content, "doc_type": "markdown"},
+                                    {"name": "text", "version": "1.0"})
+    
+    # 先从一级缓存读取，再写入磁盘并清空一级缓存后从磁盘缓存读取
+    for from_disk in (False, True):
+        if from_disk:
+            cache.flush()
+            cache._l1_clear()
+        cached = cache.get_cached_result(key)
+        assert cached is not None, "长内容应该可以从缓存读取"
+        assert cached["content"] == long_content, "读取的内容应该与写入一致"
+        assert cached["content_length"] == len(long_content), "内容长度应该是原始长度"
+        assert "_compressed" not in cached, "返回结果不应包含压缩标记"
+    
+    assert key in cache._l1, "磁盘缓存命中后应该回填一级缓存"
+
+
+def test_cache_large_value_file_roundtrip():
+    """测试超过文件存储阈值的缓存值整块写入文件后的读写"""
+    print("\n📦 测试大缓存值文件存储...")
+    
+    cache = get_parsed_cache()
+    large_content = os.urandom(64 * 1024).hex()
+    key = cache.get_cache_key(large_content.encode('utf-8'), "text", "1.0")
+    
+    assert cache.cache_parse_result(key, {"content": large_content, "doc_type": "text"},
+                                    {"name": "text", "version": "1.0"})
+    cache.flush()
+    cache._l1_clear()
+    
+    cached = cache.get_cached_result(key)
+    assert cached is not None, "大缓存值应该可以从磁盘缓存读取"
+    assert cached["content"] == large_content, "读取的内容应该与写入一致"
+
+
+def test_cache_write_buffer_flush():
+    """测试写缓冲在刷新前可读、刷新后写入磁盘"""
+    print("\n🧺 测试写缓冲...")
+    
+    cache = get_parsed_cache()
+    cache.flush()
+    key = cache.get_cache_key(b"write buffer test content", "text", "1.0")
+    cache.cache_mgr.delete(cache.namespace, key)
+    cache._l1_clear()
+    
+    assert cache.cache_parse_result(key, {"content": "buffered"}, {"name": "text"})
+    if cache._flush_threshold > 0:
+        assert not cache.cache_mgr.exists(cache.namespace, key), "刷新前不应写入磁盘"
+    
+    cache._l1_clear()
+    cached = cache.get_cached_result(key)
+    assert cached is not None and cached["content"] == "buffered", "写缓冲中的数据应该可读"
+    
+    cache.flush()
+    assert cache.cache_mgr.exists(cache.namespace, key), "刷新后应该写入磁盘"
+
+
+def test_cache_readable_while_flushing():
+    """测试写缓冲刷新期间，正在写入的数据仍然可读"""
+    print("\n🚿 测试刷新期间读取...")
+    
+    cache = get_parsed_cache()
+    cache.flush()
+    key = cache.get_cache_key(b"flush window test content", "text", "1.0")
+    cache.cache_mgr.delete(cache.namespace, key)
+    cache._pending[key] = cache._build_cache_data(key, {"content": "flushing"}, {"name": "text"})
+    cache._l1_clear()
+    
+    seen = []
+    set_many = cache.cache_mgr.set_many
+    
+    def reading_set_many(*args, **kwargs):
+        # 数据已移出写缓冲但尚未写入磁盘时读取
+        seen.append(cache.get_cached_result(key))
+        return set_many(*args, **kwargs)
+    
+    with patch.object(cache.cache_mgr, "set_many", side_effect=reading_set_many):
+        cache.flush()
+    
+    assert seen[0] is not None and seen[0]["content"] == "flushing", "刷新期间的数据应该可读"
+    assert key not in cache._flushing, "写入完成后应移出刷新中的批次"
+
+
+def test_clear_parser_cache():
+    """测试只清理指定解析器的缓存"""
+    print("\n🧹 测试按解析器清理缓存...")
+    
+    cache = get_parsed_cache()
+    content = b"clear parser cache test content"
+    keep_key = cache.get_cache_key(content, "keep_parser", "1.0")
+    drop_key = cache.get_cache_key(content, "drop_parser", "1.0")
+    
+    assert cache.cache_parse_result(keep_key, {"content": "keep"}, {"name": "keep_parser"})
+    assert cache.cache_parse_result(drop_key, {"content": "drop"}, {"name": "drop_parser"})
+    
+    cache.clear_parser_cache("drop_parser")
+    
+    assert cache.get_cached_result(drop_key) is None, "指定解析器的缓存应该被清理"
+    assert cache.get_cached_result(keep_key) is not None, "其他解析器的缓存应该保留"
+    assert "drop_parser" not in cache.get_cache_stats()["parser_stats"]
+
+
+def test_aggregates_track_overwrite_and_removal():
+    """测试覆盖写入与被移除的条目不会重复计入统计"""
+    print("\n🧮 测试统计聚合数据的扣减与校正...")
+    
+    cache = get_parsed_cache()
+    parser_info = {"name": "stats_cycle_parser", "version": "1.0"}
+    key = cache.get_cache_key(b"stats cycle test content", "stats_cycle_parser", "1.0")
+    
+    # 覆盖写入同一键时只计一次，大小取最新值
+    for content in ("first", "second!"):
+        assert cache.cache_parse_result(key, {"content": content, "doc_type": "txt"}, parser_info)
+        cache.flush()
+    assert cache.get_cache_stats()["parser_stats"]["stats_cycle_parser"] == {"count": 1, "total_size": 7}
+    
+    # 模拟LRU淘汰/过期：条目从磁盘缓存消失后，统计随之校正，重复写入也不会累加
+    for _ in range(3):
+        assert cache.cache_parse_result(key, {"content": "abc", "doc_type": "txt"}, parser_info)
+        cache.flush()
+        cache.cache_mgr.delete(cache.namespace, key)
+        cache._l1_clear()
+    assert "stats_cycle_parser" not in cache.get_cache_stats()["parser_stats"], "已移除的条目不应计入统计"
+    
+    assert cache.cache_parse_result(key, {"content": "abc", "doc_type": "txt"}, parser_info)
+    assert cache.get_cache_stats()["parser_stats"]["stats_cycle_parser"] == {"count": 1, "total_size": 3}
+    cache.clear_parser_cache("stats_cycle_parser")
+
+
+def test_cache_admission_when_full():
+    """测试缓存接近容量上限时的准入过滤"""
+    print("\n🚪 测试缓存准入过滤...")
+    
+    cache = get_parsed_cache()
+    key = cache.get_cache_key(b"admission test content", "text", "1.0")
+    cache.cache_mgr.delete(cache.namespace, key)
+    cache._l1_clear()
+    
+    original_limit = cache.cache_mgr.size_limit
+    cache.cache_mgr.size_limit = 0
+    try:
+        # 首次出现的新条目在缓存已满时不被接纳
+        assert cache.get_cached_result(key) is None
+        assert not cache.cache_parse_result(key, {"content": "x"}, {"name": "text"}), \
+            "低频新条目在缓存已满时不应写入"
+        
+        # 多次访问后频率达到阈值即可写入
+        for _ in range(cache.admission_threshold):
+            cache.get_cached_result(key)
+        assert cache.cache_parse_result(key, {"content": "x"}, {"name": "text"}), \
+            "高频条目应该可以写入"
+    finally:
+        cache.cache_mgr.size_limit = original_limit
+
+
+def test_l1_byte_limit():
+    """测试一级缓存按内容长度限制容量"""
+    print("\n📏 测试一级缓存容量上限...")
+    
+    cache = get_parsed_cache()
+    cache._l1_clear()
+    original_limit = cache._l1_max_bytes
+    cache._l1_max_bytes = 10
+    try:
+        cache._l1_put("k1", {"content": "a" * 6})
+        cache._l1_put("k2", {"content": "b" * 6})
+        assert "k1" not in cache._l1 and "k2" in cache._l1, "超出容量时应淘汰最久未使用的条目"
+        
+        cache._l1_put("k3", {"content": "c" * 11})
+        assert "k3" not in cache._l1, "超过容量上限的单个条目不应进入一级缓存"
+        assert cache._l1_bytes == 6
+    finally:
+        cache._l1_max_bytes = original_limit
+        cache._l1_clear()
+
+
 def test_cache_stats():
     """测试缓存统计功能"""
     print("\n📊 测试缓存统计功能...")
     
     cache = get_parsed_cache()
+    key = cache.get_cache_key(b"cache stats test content", "text", "1.0")
+    assert cache.cache_parse_result(key, {"content": "stats", "doc_type": "txt"}, {"name": "text"})
     stats = cache.get_cache_stats()
     
     print("缓存统计信息:")
@@ -134,6 +364,11 @@ def test_cache_stats():
     assert isinstance(stats, dict), "缓存统计应该返回字典"
     assert 'cache_hits' in stats, "统计应该包含缓存命中数"
     assert 'cache_misses' in stats, "统计应该包含缓存未命中数"
+    assert stats['cache_errors'] == 0, "获取统计不应该出错"
+    assert stats['total_items'] > 0, "写入后缓存项数应该大于0"
+    assert stats['total_content_size'] > 0, "写入后缓存占用应该大于0"
+    assert isinstance(stats.get('parser_stats'), dict), "统计应该包含按解析器的聚合数据"
+    assert isinstance(stats.get('doc_type_stats'), dict), "统计应该包含按文档类型的聚合数据"
 
 
 def main():
@@ -147,7 +382,17 @@ def main():
     tests = [
         ("文本解析器缓存", test_text_parser_cache),
         ("缓存键生成", test_cache_key_generation),
+        ("内容哈希复用", test_cache_key_content_hash),
         ("配置参数缓存", test_cache_with_config),
+        ("批量缓存", test_cache_parse_results_bulk),
+        ("长内容缓存", test_cache_long_content_roundtrip),
+        ("大缓存值", test_cache_large_value_file_roundtrip),
+        ("一级缓存容量", test_l1_byte_limit),
+        ("写缓冲", test_cache_write_buffer_flush),
+        ("刷新期间读取", test_cache_readable_while_flushing),
+        ("按解析器清理", test_clear_parser_cache),
+        ("统计扣减与校正", test_aggregates_track_overwrite_and_removal),
+        ("缓存准入过滤", test_cache_admission_when_full),
         ("缓存统计", test_cache_stats),
     ]
     
@@ -58,6 +58,26 @@ class TestTextParser:
         assert result.success is True
         assert "GBK编码" in result.content
     
+    def test_parse_utf16_text(self):
+        """测试UTF-8和GBK都无法解码时检测为UTF-16"""
+        parser = TextParser()
+        utf16_content = "UTF-16 encoded text".encode('utf-16')
+        result = parser.parse(utf16_content, '.txt')
+        
+        assert result.success is True
+        assert result.content == "UTF-16 encoded text"
+        assert result.metadata["encoding"] == "utf-16"
+    
+    def test_parse_bom_json(self):
+        """测试带UTF-8 BOM的JSON按BOM解码并去除BOM"""
+        parser = TextParser()
+        result = parser.parse('\ufeff{"name": "测试"}'.encode('utf-8'), '.json')
+
+        assert result.success is True
+        assert not result.content.startswith('\ufeff')
+        assert result.metadata["encoding"] == "utf-8-sig"
+        assert result.metadata["is_valid_json"] is True
+
     def test_parse_latin1_text(self):
         """测试解析Latin-1编码文本"""
         parser = TextParser()
@@ -180,7 +200,10 @@ class TestPDFParser:
         parser = PDFParser()
         
         # Mock pymupdf4llm.to_markdown to return empty data
-        with patch('file_reader.parsers.pdf_parser.pymupdf4llm.to_markdown') as mock_to_markdown:
+        # 文档从内存打开，截断的PDF内容需要同时Mock pymupdf.open
+        with patch('file_reader.parsers.pdf_parser.pymupdf.open') as mock_open, \
+             patch('file_reader.parsers.pdf_parser.pymupdf4llm.to_markdown') as mock_to_markdown:
+            mock_open.return_value.page_count = 1
             mock_to_markdown.return_value = []  # 空文档
             
             pdf_content = b'%PDF-1.4'
@@ -194,7 +217,10 @@ class TestPDFParser:
         parser = PDFParser()
         
         # Mock pymupdf4llm.to_markdown to raise exception
-        with patch('file_reader.parsers.pdf_parser.pymupdf4llm.to_markdown') as mock_to_markdown:
+        # 文档从内存打开，截断的PDF内容需要同时Mock pymupdf.open
+        with patch('file_reader.parsers.pdf_parser.pymupdf.open') as mock_open, \
+             patch('file_reader.parsers.pdf_parser.pymupdf4llm.to_markdown') as mock_to_markdown:
+            mock_open.return_value.page_count = 1
             mock_to_markdown.side_effect = Exception("解析失败")
             
             pdf_content = b'%PDF-1.4'
@@ -216,6 +242,121 @@ class TestPDFParser:
             
             # 应该有警告日志，但解析仍会继续
             assert result.success is False
+    
+    def test_parse_pdf_from_memory(self):
+        """测试直接从内存字节解析真实PDF（不经过临时文件）"""
+        pymupdf = pytest.importorskip("pymupdf")
+        
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "In-memory PDF content")
+        pdf_content = doc.tobytes()
+        doc.close()
+        
+        parser = PDFParser()
+        with patch('file_reader.parsers.pdf_parser.tempfile.NamedTemporaryFile') as mock_temp_file:
+            result = parser._parse_content(pdf_content, '.pdf')
+            mock_temp_file.assert_not_called()
+        
+        assert result.success is True, result.error
+        assert "In-memory PDF content" in result.content
+        assert result.metadata["total_pages"] == 1
+
+    def test_parse_pdf_without_images(self):
+        """测试关闭图片提取时不创建临时图片目录"""
+        pymupdf = pytest.importorskip("pymupdf")
+
+        doc = pymupdf.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "PDF content without image extraction")
+        pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 400, 300), False)
+        pixmap.clear_with(128)
+        page.insert_image(pymupdf.Rect(72, 100, 272, 250), pixmap=pixmap)
+        pdf_content = doc.tobytes()
+        doc.close()
+
+        parser = PDFParser()
+        parser.extract_images = False
+        with patch('file_reader.parsers.pdf_parser.tempfile.mkdtemp') as mock_mkdtemp:
+            result = parser._parse_content(pdf_content, '.pdf')
+            mock_mkdtemp.assert_not_called()
+
+        assert result.success is True, result.error
+        assert "PDF content without image extraction" in result.content
+        assert "![" not in result.content
+
+    def test_choose_image_dpi(self):
+        """测试按内嵌图片宽度自动选择图片提取分辨率"""
+        pymupdf = pytest.importorskip("pymupdf")
+        
+        doc = pymupdf.open()
+        page = doc.new_page()
+        pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 400, 300), False)
+        pixmap.clear_with(255)
+        page.insert_image(pymupdf.Rect(72, 72, 272, 222), pixmap=pixmap)
+        
+        parser = PDFParser()
+        parser.auto_image_dpi = False
+        assert parser._choose_image_dpi(doc) == 150
+        parser.auto_image_dpi = True
+        assert parser._choose_image_dpi(doc) == 100
+        assert parser._choose_image_dpi(pymupdf.open()) == 150
+        doc.close()
+
+    def test_classify_pdf(self):
+        """测试按抽样页文本量判断PDF类型，文本型PDF不做OCR判断"""
+        pymupdf = pytest.importorskip("pymupdf")
+        
+        doc = pymupdf.open()
+        for page_number in range(3):
+            page = doc.new_page()
+            if page_number != 1:
+                page.insert_text((72, 72), f"Text layer on page {page_number}, long enough to count as text")
+        
+        parser = PDFParser()
+        assert parser._classify_pdf(doc) == "mixed"
+        doc[1].insert_text((72, 72), "Middle page now has a text layer that is long enough")
+        assert parser._classify_pdf(doc) == "text"
+        assert parser._classify_pdf(pymupdf.open()) == "mixed"
+        
+        blank = pymupdf.open()
+        blank.new_page()
+        assert parser._classify_pdf(blank) == "image"
+        
+        with patch('file_reader.parsers.pdf_parser.pymupdf4llm.to_markdown', return_value=[]) as mock_to_markdown:
+            parser._parse_content(doc.tobytes(), '.pdf')
+            assert mock_to_markdown.call_args.kwargs["use_ocr"] is False
+            parser._parse_content(blank.tobytes(), '.pdf')
+            assert "use_ocr" not in mock_to_markdown.call_args.kwargs
+        doc.close()
+        blank.close()
+
+    def test_parse_pdf_page_shards(self):
+        """测试按页分片解析与串行解析结果一致"""
+        pymupdf = pytest.importorskip("pymupdf")
+        from concurrent.futures import ThreadPoolExecutor
+        
+        doc = pymupdf.open()
+        for page_number in range(5):
+            doc.new_page().insert_text((72, 72), f"Shard page {page_number}")
+        pdf_content = doc.tobytes()
+        doc.close()
+        
+        serial = PDFParser()
+        serial.parse_workers = 1
+        expected = serial._parse_content(pdf_content, '.pdf')
+        
+        parser = PDFParser()
+        parser.parse_workers = 3
+        parser.parallel_min_pages = 2
+        # 用线程池代替进程池，在测试进程内执行各分片
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                patch('file_reader.parsers.pdf_parser._get_shard_executor', return_value=executor) as mock_executor:
+            result = parser._parse_content(pdf_content, '.pdf')
+            mock_executor.assert_called_once_with(3)
+        
+        assert result.success is True, result.error
+        assert result.content == expected.content
+        assert result.metadata["total_pages"] == 5
 
 
 class TestOfficeParser:
@@ -277,6 +418,46 @@ class TestOfficeParser:
         assert result.success is False
         assert "不支持的Office文档类型" in result.error
     
+    def test_parse_ods_stream(self):
+        """测试流式解析ODS，结果与odfpy一致"""
+        pytest.importorskip("odf")
+        import io
+        from odf.opendocument import OpenDocumentSpreadsheet
+        from odf.table import Table, TableRow, TableCell
+        from odf.text import P, S
+
+        doc = OpenDocumentSpreadsheet()
+        table = Table(name="Data")
+        for values in (["Name", "Value"], ["a", "1"]):
+            row = TableRow()
+            for value in values:
+                cell = TableCell()
+                paragraph = P(text=value)
+                paragraph.addElement(S(c=2))
+                paragraph.addText("x")
+                cell.addElement(paragraph)
+                row.addElement(cell)
+            row.addElement(TableCell(numbercolumnsrepeated=100))
+            table.addElement(row)
+        doc.spreadsheet.addElement(table)
+        buffer = io.BytesIO()
+        doc.write(buffer)
+
+        parser = OfficeParser()
+        result = parser._parse_ods_legacy(buffer.getvalue(), '.ods')
+
+        assert result.success is True
+        assert result.metadata["parser"] == "odf_stream+markdown"
+        assert "## Data" in result.content
+        assert "| Name  x | Value  x |" in result.content
+        assert "| a  x | 1  x |" in result.content
+
+        # 流式读取失败时回退到odfpy
+        with patch('file_reader.parsers.office_parser.OdfStreamReader.iter_ods_tables', side_effect=ValueError("bad")):
+            fallback = parser._parse_ods_legacy(buffer.getvalue(), '.ods')
+        assert fallback.metadata["parser"] == "odfpy+markdown"
+        assert fallback.content == result.content
+
     def test_parse_office_exception(self):
         """测试Office解析异常处理"""
         parser = OfficeParser()
@@ -321,6 +502,72 @@ class TestOfficeParser:
             assert result.success is False
             assert "内容为空" in result.error
 
+    def test_save_temp_file_memory_fallback(self, tmp_path):
+        """测试内存临时目录不可用时临时文件写入系统临时目录"""
+        from file_reader.parsers.utils.file_utils import FileManager
+
+        file_manager = FileManager()
+        file_manager.memory_temp_dir = str(tmp_path)
+        temp_file = file_manager.save_temp_file(b'memory', '.docx')
+        assert temp_file.parent == tmp_path
+        assert temp_file.suffix == '.docx'
+        assert temp_file.read_bytes() == b'memory'
+        assert temp_file.stat().st_mode & 0o777 == 0o600
+        file_manager.cleanup_temp_file(temp_file)
+
+        file_manager.memory_temp_dir = str(tmp_path / "missing")
+        temp_file = file_manager.save_temp_file(b'disk', '.docx')
+        assert temp_file.parent == Path(tempfile.gettempdir())
+        assert temp_file.read_bytes() == b'disk'
+        file_manager.cleanup_temp_file(temp_file)
+
+    def test_save_temp_file_from_stream(self, tmp_path):
+        """测试从文件对象当前位置复制内容到临时文件"""
+        import io
+        from file_reader.parsers.utils.file_utils import FileManager
+
+        file_manager = FileManager()
+        file_manager.memory_temp_dir = str(tmp_path)
+        stream = io.BytesIO(b'header' + b'x' * (3 * 1024 * 1024))
+        stream.seek(6)
+        temp_file = file_manager.save_temp_file(stream, '.docx')
+        assert temp_file.parent == tmp_path
+        assert temp_file.read_bytes() == b'x' * (3 * 1024 * 1024)
+        file_manager.cleanup_temp_file(temp_file)
+
+
+class TestImageMarkdownPostProcess:
+    """测试图像OCR结果的Markdown后处理"""
+    
+    def test_splits_glued_headings_and_tables(self):
+        """测试拆分连在一起的标题和表格"""
+        from file_reader.parsers.image_parser import ImageParser
+        
+        result = ImageParser()._post_process_markdown("# A ## B | x | y |")
+        assert result == "# A\n\n## B\n\n| x | y |\n"
+    
+    def test_keeps_tables_and_paragraphs_intact(self):
+        """测试表格行保持连续、段落之间的空行保留"""
+        from file_reader.parsers.image_parser import ImageParser
+        
+        content = "# T\npara1\n\n\n\npara2  with   spaces\n| a | b |\n|---|---|\n| 1 |  |\n-   item"
+        result = ImageParser()._post_process_markdown(content)
+        assert result == (
+            "# T\n\npara1\n\npara2 with spaces\n\n"
+            "| a | b |\n|---|---|\n| 1 |  |\n\n- item\n"
+        )
+    
+    def test_keeps_rows_with_empty_cells_intact(self):
+        """测试含空单元格的表头和数据行不会被拆开，连在一起的整张表仍按行拆分"""
+        from file_reader.parsers.image_parser import ImageParser
+        
+        content = "| a | | c |\n|---|---|---|\n| 1 | | 3 |\n|  | 5 | |"
+        result = ImageParser()._post_process_markdown(content)
+        assert result == "# 图像内容识别\n\n" + content + "\n"
+        
+        result = ImageParser()._post_process_markdown("| a | b | | --- | --- | | 1 | 2 |")
+        assert result == "# 图像内容识别\n\n| a | b |\n| --- | --- |\n| 1 | 2 |\n"
+
 
 class TestParserIntegration:
     """测试解析器集成功能"""
@@ -348,6 +595,34 @@ class TestParserIntegration:
             assert isinstance(result.success, bool)
 
 
+class TestLazyParserLoader:
+    """测试解析器懒加载管理器的扩展名识别"""
+    
+    def test_get_file_extension(self):
+        """测试扩展名提取（含双扩展名和点开头文件名）"""
+        from file_reader.parser_loader import parser_loader
+        
+        assert parser_loader._get_file_extension("docs/report.PDF") == ".pdf"
+        assert parser_loader._get_file_extension("backup.tar.gz") == ".tar.gz"
+        assert parser_loader._get_file_extension("v1.2.txt") == ".txt"
+        assert parser_loader._get_file_extension("project/.gitignore") == ""
+        assert parser_loader._get_file_extension("noext") == ""
+        assert parser_loader._get_file_extension(Path("data/Archive.TAR.GZ")) == ".tar.gz"
+    
+    def test_is_supported_matches_extension_lookup(self):
+        """测试 is_supported 与扩展名查找结果一致"""
+        from file_reader.parser_loader import parser_loader
+        
+        paths = [
+            "a.txt", "A.TXT", "x/y.tar.gz", "dir/.env", ".gitignore", "a.gitignore",
+            "foo.xhtml", "b.html", "a..gz", "noext", "dir.pdf/file", "a.",
+        ]
+        for path in paths:
+            expected = parser_loader._get_file_extension(path) in parser_loader._supported_exts
+            assert parser_loader.is_supported(path) == expected, path
+            assert parser_loader.is_supported(Path(path)) == expected, path
+
+
 class TestRealFilesParsing:
     """测试解析器对实际文件的解析功能"""
     